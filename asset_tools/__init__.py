@@ -0,0 +1,4 @@
+"""
+Cyber Strike - Asset Pipeline Tools
+Shared build helpers used by generate_topdown_assets.py and Assets/generate_assets.py
+"""
@@ -0,0 +1,222 @@
+"""
+Cyber Strike - Texture Atlas Packer
+Bin-packs generated sprites into atlas sheets per scale with a JSON frame index
+"""
+
+from PIL import Image
+import argparse
+import json
+import os
+
+from .dedupe import find_aliases
+from .trim import extrude, trim
+
+# Largest sheet edge; every iOS device running the game supports 2048 textures
+MAX_SHEET_SIZE = 2048
+
+# Transparent gap between packed frames so filtering never bleeds neighbours
+PADDING = 2
+
+class MaxRectsBin:
+    """MaxRects bin packer using the best-short-side-fit heuristic"""
+    
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.free = [(0, 0, width, height)]
+        self.used_w = 0
+        self.used_h = 0
+    
+    def insert(self, w, h):
+        """Place a w x h rect, returning its (x, y) or None if it does not fit"""
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                score = (min(fw - w, fh - h), max(fw - w, fh - h))
+                if best_score is None or score < best_score:
+                    best, best_score = (fx, fy), score
+        if best is None:
+            return None
+            
+        placed = (best[0], best[1], w, h)
+        self._split(placed)
+        self.used_w = max(self.used_w, best[0] + w)
+        self.used_h = max(self.used_h, best[1] + h)
+        return best
+    
+    def _split(self, placed):
+        """Split every free rect overlapping the placed rect, then drop contained rects"""
+        px, py, pw, ph = placed
+        new_free = []
+        for fx, fy, fw, fh in self.free:
+            if px >= fx + fw or px + pw <= fx or py >= fy + fh or py + ph <= fy:
+                new_free.append((fx, fy, fw, fh))
+                continue
+            if px > fx:
+                new_free.append((fx, fy, px - fx, fh))
+            if px + pw < fx + fw:
+                new_free.append((px + pw, fy, fx + fw - px - pw, fh))
+            if py > fy:
+                new_free.append((fx, fy, fw, py - fy))
+            if py + ph < fy + fh:
+                new_free.append((fx, py + ph, fw, fy + fh - py - ph))
+                
+        self.free = [
+            a for i, a in enumerate(new_free)
+            if not any(
+                i != j and a[0] >= b[0] and a[1] >= b[1]
+                and a[0] + a[2] <= b[0] + b[2] and a[1] + a[3] <= b[1] + b[3]
+                and (a != b or j < i)
+                for j, b in enumerate(new_free)
+            )
+        ]
+
+def pack_atlas(sprites, max_size=MAX_SHEET_SIZE, padding=PADDING, extrude_pixels=0):
+    """
+    Pack {name: RGBA image} into as many sheets as needed
+    Returns (sheets, frames) where frames maps each name to its sheet index,
+    packed rect, trim offset and original size. With extrude_pixels, each
+    frame's edge pixels are repeated that far into the gap around it, so
+    filtering at the frame's edge never fades to transparent
+    """
+    trimmed = {name: trim(img) for name, img in sprites.items()}
+    border = 2 * extrude_pixels
+    # Largest first packs tighter; names break ties so output is stable
+    order = sorted(trimmed, key=lambda n: (-max(trimmed[n][0].size), -min(trimmed[n][0].size), n))
+    
+    bins = []
+    placements = {}
+    for name in order:
+        w, h = trimmed[name][0].size
+        w, h = w + border + padding, h + border + padding
+        if w > max_size or h > max_size:
+            raise ValueError(f"Sprite {name} ({w}x{h} packed) does not fit in a {max_size} atlas sheet")
+        for index, sheet_bin in enumerate(bins):
+            pos = sheet_bin.insert(w, h)
+            if pos is not None:
+                break
+        else:
+            bins.append(MaxRectsBin(max_size, max_size))
+            index, pos = len(bins) - 1, bins[-1].insert(w, h)
+        placements[name] = (index, pos)
+        
+    sheets = [Image.new('RGBA', (b.used_w, b.used_h), (0, 0, 0, 0)) for b in bins]
+    frames = {}
+    for name in sorted(placements):
+        index, (x, y) = placements[name]
+        img, (ox, oy) = trimmed[name]
+        sheets[index].paste(extrude(img, extrude_pixels), (x, y))
+        x, y = x + extrude_pixels, y + extrude_pixels
+        src_w, src_h = sprites[name].size
+        frames[name] = {
+            'sheet': index,
+            'frame': {'x': x, 'y': y, 'w': img.width, 'h': img.height},
+            'rotated': False,
+            'trimmed': img.size != (src_w, src_h),
+            'spriteSourceSize': {'x': ox, 'y': oy, 'w': img.width, 'h': img.height},
+            'sourceSize': {'w': src_w, 'h': src_h},
+            'pivot': {'x': 0.5, 'y': 0.5},
+        }
+    return sheets, frames
+
+def write_atlas(sprites, out_dir, name='atlas', suffix='', scale=1, aliases=None, **pack_args):
+    """
+    Pack sprites and write <name>_<n><suffix>.png sheets plus a <name><suffix>.json index
+    Byte-identical sprites are packed once; their other names (and any extra
+    {alias: name} passed in) get frames pointing at the same rect and are
+    listed under meta.aliases
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    aliases = dict(aliases or {})
+    aliases.update(find_aliases({n: img for n, img in sprites.items() if n not in aliases}))
+    for alias, canonical in aliases.items():
+        while canonical in aliases:
+            canonical = aliases[canonical]
+        aliases[alias] = canonical
+    # A partial build may not have drawn an alias's canonical sprite yet
+    aliases = {alias: canonical for alias, canonical in aliases.items() if canonical in sprites}
+    sheets, frames = pack_atlas({n: img for n, img in sprites.items() if n not in aliases}, **pack_args)
+    for alias, canonical in aliases.items():
+        frames[alias] = dict(frames[canonical])
+        
+    sheet_files = []
+    for index, sheet in enumerate(sheets):
+        filename = f"{name}_{index}{suffix}.png"
+        sheet.save(os.path.join(out_dir, filename))
+        sheet_files.append(filename)
+        
+    for frame in frames.values():
+        frame['sheet'] = sheet_files[frame['sheet']]
+        
+    index = {
+        'frames': frames,
+        'meta': {
+            'app': 'Cyber Strike asset pipeline',
+            'scale': scale,
+            'sheets': [{'image': f, 'size': {'w': s.width, 'h': s.height}}
+                       for f, s in zip(sheet_files, sheets)],
+            'aliases': aliases,
+        },
+    }
+    with open(os.path.join(out_dir, f"{name}{suffix}.json"), 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    return sheet_files
+
+def load_sprites(sprite_dir, suffix, suffixes, exclude=()):
+    """
+    Load every loose sprite PNG for one scale suffix under sprite_dir
+    Sprites are keyed by their path relative to sprite_dir without suffix or extension
+    """
+    other = [s for s in suffixes if s and s != suffix]
+    sprites = {}
+    for root, dirs, files in os.walk(sprite_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.')
+                         and os.path.join(root, d) not in exclude)
+        for filename in sorted(files):
+            if not filename.endswith('.png'):
+                continue
+            stem = filename[:-4]
+            if suffix:
+                if not stem.endswith(suffix):
+                    continue
+                stem = stem[:-len(suffix)]
+            elif any(stem.endswith(s) for s in other):
+                continue
+            rel = os.path.relpath(os.path.join(root, stem), sprite_dir).replace(os.sep, '/')
+            with Image.open(os.path.join(root, filename)) as img:
+                sprites[rel] = img.convert('RGBA')
+    return sprites
+
+def build_atlases(sprite_dir, out_dir, scales, name='atlas', aliases=None, exclude=(), **pack_args):
+    """
+    Pack the loose sprites under sprite_dir into one atlas per scale
+    aliases maps extra sprite names to the sprite they share pixels with;
+    folders listed in exclude (absolute paths) are skipped
+    """
+    written = []
+    exclude = (os.path.abspath(out_dir), *exclude)
+    for suffix, scale in scales.items():
+        sprites = load_sprites(sprite_dir, suffix, scales, exclude=exclude)
+        written += write_atlas(sprites, out_dir, name, suffix, scale, aliases, **pack_args)
+    return written
+
+def main(argv=None):
+    """Pack an existing tree of loose @1x/@2x/@3x sprites into atlases"""
+    parser = argparse.ArgumentParser(description="Pack loose sprites into texture atlases")
+    parser.add_argument('sprite_dir', help="directory of loose sprite PNGs")
+    parser.add_argument('out_dir', help="directory for atlas sheets and frame indexes")
+    parser.add_argument('--name', default='atlas', help="atlas file name prefix")
+    parser.add_argument('--max-size', type=int, default=MAX_SHEET_SIZE, help="largest sheet edge in pixels")
+    parser.add_argument('--padding', type=int, default=PADDING, help="gap between frames in pixels")
+    parser.add_argument('--extrude', type=int, default=0,
+                        help="repeat each frame's edge pixels this far outward (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    scales = {'': 1, '@2x': 2, '@3x': 3}
+    written = build_atlases(os.path.abspath(args.sprite_dir), os.path.abspath(args.out_dir), scales,
+                            args.name, max_size=args.max_size, padding=args.padding, extrude_pixels=args.extrude)
+    print(f"✓ Wrote {len(written)} atlas sheets to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Cyber Strike - Generator Benchmarks
+Times every top-down draw_* sprite at each scale and every create_* function
+from Assets/generate_assets.py, records peak RSS and encoded bytes, and
+compares against a saved baseline
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+import fnmatch
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import PIL
+import numpy as np
+
+from .manifest import load_manifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Timed runs per benchmark, after one untimed warm-up run
+REPEAT = 5
+
+# Allowed slowdown before a benchmark counts as a regression (0.2 = 20%)
+THRESHOLD = 0.2
+
+# Slowdowns smaller than this many milliseconds are treated as noise
+NOISE_MS = 0.5
+
+_generators = None
+
+def load_generators():
+    """Import generate_topdown_assets and Assets/generate_assets as modules"""
+    global _generators
+    if _generators is None:
+        if ROOT not in sys.path:
+            sys.path.insert(0, ROOT)
+        import generate_topdown_assets as topdown
+        spec = importlib.util.spec_from_file_location(
+            'generate_assets', os.path.join(ROOT, 'Assets', 'generate_assets.py'))
+        assets = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(assets)
+        _generators = (topdown, assets)
+    return _generators
+
+def sprite_jobs():
+    """{sprite name: (draw function, args)} for every unique top-down sprite"""
+    topdown, _ = load_generators()
+    jobs, _ = topdown.dedupe_jobs(topdown.build_jobs(''))
+    return {path.lstrip('/'): (draw_fn, args) for path, draw_fn, args in jobs}
+
+def generator_plan():
+    """{create_* name: (function, output folder, scales, keyword arguments)} for every Assets generator"""
+    _, assets = load_generators()
+    plan = assets.build_plan(load_manifest(assets.MANIFEST))
+    return {step[0].__name__: step for step in plan}
+
+def _peak_rss_kb():
+    # ru_maxrss is reported in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _timed(fn, repeat):
+    """Run fn once to warm up, then repeat times with the GC paused; returns (timings in ms, last result)"""
+    result = fn()
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+    return timings, result
+
+def bench_sprite(name, suffix, scale, repeat):
+    """Benchmark drawing and PNG-encoding one top-down sprite at one scale"""
+    draw_fn, args = sprite_jobs()[name]
+    draw_ms, img = _timed(lambda: draw_fn(*args, scale=scale), repeat)
+    
+    def encode():
+        buf = io.BytesIO()
+        img.save(buf, 'PNG')
+        return buf.tell()
+    encode_ms, size = _timed(encode, repeat)
+    
+    return f"topdown/{name}{suffix}", {
+        'wall_ms': min(draw_ms) + min(encode_ms),
+        'draw_ms': min(draw_ms),
+        'draw_median_ms': statistics.median(draw_ms),
+        'encode_ms': min(encode_ms),
+        'bytes': size,
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+def bench_generator(name, repeat):
+    """Benchmark one create_* function, writing into a scratch directory"""
+    _, assets = load_generators()
+    create_fn, output, scales, params = generator_plan()[name]
+    
+    def run():
+        assets.SAVED_FILES.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_fn(output, scales, **params)
+        return list(assets.SAVED_FILES)
+        
+    with tempfile.TemporaryDirectory() as scratch:
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            timings, files = _timed(run, repeat)
+            by_scale = {}
+            for path in files:
+                stem = path[:-4]
+                suffix = next((s for s in scales if s and stem.endswith(s)), '')
+                key = f"{scales[suffix]}x"
+                by_scale[key] = by_scale.get(key, 0) + os.path.getsize(path)
+        finally:
+            os.chdir(cwd)
+            
+    return f"assets/{name}", {
+        'wall_ms': min(timings),
+        'wall_median_ms': statistics.median(timings),
+        'bytes': sum(by_scale.values()),
+        'bytes_by_scale': by_scale,
+        'files': len(files),
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+def _run_task(task):
+    kind, *args = task
+    return bench_sprite(*args) if kind == 'sprite' else bench_generator(*args)
+
+def collect_tasks(pattern='*', repeat=REPEAT):
+    """Every benchmark task whose result name matches pattern"""
+    topdown, _ = load_generators()
+    tasks = []
+    for name in sprite_jobs():
+        for suffix, scale in topdown.SCALES.items():
+            if fnmatch.fnmatch(f"topdown/{name}{suffix}", pattern):
+                tasks.append(('sprite', name, suffix, scale, repeat))
+    for name in generator_plan():
+        if fnmatch.fnmatch(f"assets/{name}", pattern):
+            tasks.append(('generator', name, repeat))
+    return tasks
+
+def run_benchmarks(tasks):
+    """
+    Run each task in a fresh single-use worker process, so peak RSS is
+    attributable to one benchmark and no state leaks between them
+    """
+    load_generators()
+    results = {}
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for name, result in pool.map(_run_task, tasks):
+            results[name] = result
+    return results
+
+def compare(results, baseline, threshold=THRESHOLD, noise_ms=NOISE_MS):
+    """Return [(name, baseline ms, current ms)] for benchmarks that got slower than allowed"""
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        before, after = base['wall_ms'], result['wall_ms']
+        if after > before * (1 + threshold) and after - before > noise_ms:
+            regressions.append((name, before, after))
+    return regressions
+
+def main(argv=None):
+    """Run the generator benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmark the Cyber Strike asset generators")
+    parser.add_argument('-o', '--output', default='benchmark.json', help="results JSON file")
+    parser.add_argument('-k', '--filter', default='*',
+                        help="glob over result names, e.g. 'topdown/Effects/*@3x' or 'assets/*'")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="timed runs per benchmark")
+    parser.add_argument('--baseline', help="earlier results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="allowed slowdown as a fraction (default: %(default)s)")
+    parser.add_argument('--noise-ms', type=float, default=NOISE_MS,
+                        help="ignore slowdowns below this many ms (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=10, help="slowest benchmarks to list")
+    args = parser.parse_args(argv)
+    
+    tasks = collect_tasks(args.filter, args.repeat)
+    print(f"Running {len(tasks)} benchmarks ({args.repeat} timed runs each)...")
+    results = run_benchmarks(tasks)
+    
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+        
+    print(f"\nSlowest {args.top}:")
+    for name, result in sorted(results.items(), key=lambda item: -item[1]['wall_ms'])[:args.top]:
+        print(f"  {result['wall_ms']:9.2f} ms  {result['bytes']:8d} B  {result['peak_rss_kb']:7d} KiB  {name}")
+    total = sum(r['wall_ms'] for r in results.values())
+    print(f"✓ {len(results)} benchmarks, {total:.1f} ms total, results in {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, args.noise_ms)
+        for name, before, after in regressions:
+            print(f"  REGRESSION {name}: {before:.2f} -> {after:.2f} ms (+{100 * (after / before - 1):.0f}%)")
+        if regressions:
+            print(f"✗ {len(regressions)} benchmarks slower than baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"✓ No regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
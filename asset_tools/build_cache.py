@@ -0,0 +1,190 @@
+"""
+Cyber Strike - Incremental Build Cache
+Skips sprites whose draw code, arguments, palette entries and Pillow version are unchanged
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import re
+import shutil
+import sys
+import types
+
+import PIL
+
+from .display_list import DisplayList
+
+# Bump to invalidate every cached sprite after a change to the cache layout
+CACHE_VERSION = 2
+
+# Palette lookups such as COLORS['cyan'] inside a draw function
+COLOR_KEY_RE = re.compile(r"COLORS\[['\"](\w+)['\"]\]")
+
+def _code_names(code):
+    """Yield every global name referenced by a code object and its nested code"""
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_names(const)
+
+def _package_module(obj):
+    """The asset_tools submodule obj is (or was defined in), else None"""
+    name = obj.__name__ if inspect.ismodule(obj) else getattr(obj, '__module__', None)
+    if isinstance(name, str) and name.startswith(f"{__package__}."):
+        return sys.modules[name]
+    return None
+
+def function_deps(*fns):
+    """
+    Collect the given functions plus every module-level function they call, transitively
+    Helpers from the asset_tools package are tracked as whole modules, along
+    with the package modules those import
+    """
+    seen = {}
+    stack = list(fns)
+    while stack:
+        item = stack.pop()
+        if inspect.ismodule(item):
+            if item.__name__ in seen:
+                continue
+            seen[item.__name__] = item
+            stack.extend(m for m in map(_package_module, vars(item).values()) if m is not None)
+            continue
+        fn = item
+        qualified = f"{fn.__module__}.{fn.__qualname__}"
+        if qualified in seen:
+            continue
+        seen[qualified] = fn
+        for name in _code_names(fn.__code__):
+            obj = fn.__globals__.get(name)
+            if inspect.isfunction(obj) and obj.__module__ == fn.__module__:
+                stack.append(obj)
+            elif obj is not None and _package_module(obj) is not None:
+                stack.append(_package_module(obj))
+    return [seen[name] for name in sorted(seen)]
+
+def sprite_key(fns, args, palette):
+    """
+    Hash everything that can change a sprite's pixels: the source of the draw
+    function and its helpers, the call arguments, the palette entries the
+    source reads and the Pillow version
+    """
+    h = hashlib.sha256()
+    h.update(f"cache-v{CACHE_VERSION} pillow-{PIL.__version__}\n".encode())
+    for fn in function_deps(*fns):
+        source = inspect.getsource(fn)
+        h.update(source.encode())
+        for color in sorted(set(COLOR_KEY_RE.findall(source))):
+            h.update(f"{color}={palette.get(color)!r}\n".encode())
+    h.update(repr(args).encode())
+    return h.hexdigest()
+
+def file_digest(path):
+    """SHA-256 of a file's bytes"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class BuildCache:
+    """
+    Persistent sprite cache
+    index.json maps a job id to its last key and output files; a copy of the
+    outputs is kept under objects/<key>/ so deleted outputs can be restored
+    without redrawing. Jobs may also keep their recorded display list under
+    lists/<key>.json, keyed separately, so a sprite whose pixels are out of
+    date can be re-rasterised without running its draw code. Files derived
+    from outputs (optimised PNGs, compressed textures) are recorded with the
+    bytes and options they were made from, so later runs redo only stale ones
+    """
+    
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.entries = {}
+        self.lists = {}
+        self.derived = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if index.get("version") == CACHE_VERSION:
+                self.entries = index["entries"]
+                self.lists = index["lists"]
+                self.derived = index.get("derived", {})
+    
+    def _object_dir(self, key):
+        return os.path.join(self.cache_dir, "objects", key)
+    
+    def _list_path(self, key):
+        return os.path.join(self.cache_dir, "lists", f"{key}.json")
+    
+    def lookup(self, job_id, key):
+        """
+        Return True if the job is up to date; missing outputs are restored
+        from the object store first
+        """
+        entry = self.entries.get(job_id)
+        if entry is None or entry["key"] != key:
+            return False
+        object_dir = self._object_dir(key)
+        for path in entry["outputs"]:
+            if os.path.exists(path):
+                continue
+            cached = os.path.join(object_dir, os.path.basename(path))
+            if not os.path.exists(cached):
+                return False
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            shutil.copyfile(cached, path)
+        return True
+    
+    def store(self, job_id, key, outputs):
+        """Record a freshly built job and keep a copy of its outputs"""
+        object_dir = self._object_dir(key)
+        os.makedirs(object_dir, exist_ok=True)
+        for path in outputs:
+            shutil.copyfile(path, os.path.join(object_dir, os.path.basename(path)))
+        self.entries[job_id] = {"key": key, "outputs": list(outputs)}
+    
+    def load_list(self, job_id, key):
+        """The job's cached DisplayList if it was recorded under key, else None"""
+        path = self._list_path(key)
+        if self.lists.get(job_id) != key or not os.path.exists(path):
+            return None
+        return DisplayList.load(path)
+    
+    def store_list(self, job_id, key, display_list):
+        """Keep a freshly recorded DisplayList for the job"""
+        os.makedirs(os.path.dirname(self._list_path(key)), exist_ok=True)
+        display_list.save(self._list_path(key))
+        self.lists[job_id] = key
+    
+    def _derived_key(self, source, options):
+        return f"{file_digest(source)} {options}"
+    
+    def is_derived(self, path, source, options=''):
+        """True if path exists and mark_derived recorded it from source's current bytes with the same options"""
+        return os.path.exists(path) and self.derived.get(path) == self._derived_key(source, options)
+    
+    def mark_derived(self, path, source, options=''):
+        """Record that path was just made from source with options (path may be source itself, rewritten in place)"""
+        self.derived[path] = self._derived_key(source, options)
+    
+    def save(self):
+        """Write the index and drop objects no job refers to any more"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.derived = {path: key for path, key in self.derived.items() if os.path.exists(path)}
+        with open(self.index_path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries, "lists": self.lists,
+                       "derived": self.derived}, f, indent=1, sort_keys=True)
+        objects_root = os.path.join(self.cache_dir, "objects")
+        live = {entry["key"] for entry in self.entries.values()}
+        if os.path.isdir(objects_root):
+            for key in os.listdir(objects_root):
+                if key not in live:
+                    shutil.rmtree(os.path.join(objects_root, key))
+        lists_root = os.path.join(self.cache_dir, "lists")
+        live = {f"{key}.json" for key in self.lists.values()}
+        if os.path.isdir(lists_root):
+            for name in os.listdir(lists_root):
+                if name not in live:
+                    os.remove(os.path.join(lists_root, name))
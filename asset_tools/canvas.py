@@ -0,0 +1,250 @@
+"""
+Cyber Strike - Drawing Canvas
+Resolution-independent drawing context: sprites are drawn in logical (1x)
+coordinates and rasterised natively at each output scale
+"""
+
+from PIL import Image, ImageDraw
+import contextlib
+import contextvars
+import math
+
+from . import glow
+from .compositor import Compositor
+from .gradients import linear_gradient
+
+# Set while a draw function is being recorded; per thread and per task, so recordings never leak
+_recording = contextvars.ContextVar('canvas_recording', default=False)
+
+@contextlib.contextmanager
+def recording():
+    """Within the block, Canvas(...) builds a recording DisplayList instead of an image"""
+    token = _recording.set(True)
+    try:
+        yield
+    finally:
+        _recording.reset(token)
+
+def _flatten(xy):
+    """Accept [(x, y), ...] or [x, y, ...] and return [(x, y), ...]"""
+    if xy and isinstance(xy[0], (tuple, list)):
+        return [tuple(p) for p in xy]
+    return list(zip(xy[0::2], xy[1::2]))
+
+class Canvas:
+    """
+    ImageDraw-style drawing context at one scale factor
+    Coordinates are logical pixels: logical pixel (x, y) covers the
+    scale x scale block at (x * scale, y * scale) in the output image.
+    Boxes (ellipse, rectangle) keep Pillow's inclusive corners, points
+    (polygon, line) land on the centre of their block, and widths and
+    radii scale linearly.
+    A heading (0 included) makes this a heading frame: the image grows to
+    twice the sprite's longer side, with the sprite centred in it, and
+    everything drawn is turned clockwise by that many degrees about the
+    centre. That covers the turned corners (the diagonal) and the rotors
+    and barrels that reach past the sprite's box, so no heading clips
+    them. The geometry itself is transformed before rasterising: points
+    are rotated, boxes become polygons and ellipses rotated polygons
+    (circles just move), so rotated sprites are as sharp as unrotated ones.
+    Gradient fills are not rotated. Sheets trim the added margin away.
+    Inside recording(), constructing a Canvas returns an
+    asset_tools.display_list.DisplayList taking the same arguments
+    """
+    
+    def __new__(cls, *args, **kwargs):
+        if _recording.get():
+            from .display_list import DisplayList
+            return DisplayList(*args, **kwargs)
+        return super().__new__(cls)
+    
+    def __init__(self, size, scale=1, bg_color=None, heading=None):
+        self.size = tuple(size)
+        self.scale = scale
+        self.heading = heading
+        w, h = self.size
+        # Whole logical pixels on each side, so blocks stay aligned and the centre stays put
+        reach = max(w, h) if heading is not None else 0
+        self.offset = (max(0, math.ceil(reach - w / 2)), max(0, math.ceil(reach - h / 2)))
+        ox, oy = self.offset
+        self.image = Image.new('RGBA', ((w + 2 * ox) * scale, (h + 2 * oy) * scale),
+                               bg_color if bg_color is not None else (0, 0, 0, 0))
+        self._draw = ImageDraw.Draw(self.image)
+        self._layers = Compositor(self.image)
+        theta = math.radians(heading or 0)
+        self._cos, self._sin = math.cos(theta), math.sin(theta)
+        self._pivot = ((self.image.width - 1) / 2, (self.image.height - 1) / 2)
+    
+    def copy(self):
+        """Independent canvas with the same pixels, for drawing sprite variants"""
+        other = Canvas(self.size, self.scale, heading=self.heading)
+        other.image.paste(self.image)
+        return other
+        
+    # ---- coordinate mapping ----
+    
+    def _rotate(self, points):
+        """Output points turned clockwise by the heading about the image centre"""
+        px, py = self._pivot
+        c, s = self._cos, self._sin
+        return [(px + (x - px) * c - (y - py) * s, py + (x - px) * s + (y - py) * c) for x, y in points]
+    
+    def _pt(self, x, y):
+        """Logical point -> centre of its pixel block"""
+        s = self.scale
+        x, y = x + self.offset[0], y + self.offset[1]
+        pt = (x * s + (s - 1) / 2, y * s + (s - 1) / 2)
+        return self._rotate([pt])[0] if self.heading else pt
+    
+    def _points(self, xy):
+        return [self._pt(x, y) for x, y in _flatten(xy)]
+    
+    def _box(self, xy):
+        """Inclusive logical box -> inclusive output box covering the same blocks"""
+        (x0, y0), (x1, y1) = _flatten(xy)
+        ox, oy = self.offset
+        x0, y0, x1, y1 = x0 + ox, y0 + oy, x1 + ox, y1 + oy
+        s = self.scale
+        return [x0 * s, y0 * s, x1 * s + s - 1, y1 * s + s - 1]
+    
+    def _width(self, width):
+        return width * self.scale
+    
+    def _rect_outline(self, box, radius=0):
+        """Rotated outline of an output box, with corner arcs of the given radius"""
+        x0, y0, x1, y1 = box
+        r = min(radius, (x1 - x0) / 2, (y1 - y0) / 2)
+        if r <= 0:
+            return self._rotate([(x0, y0), (x1, y0), (x1, y1), (x0, y1)])
+        steps = max(2, math.ceil(r / 2))
+        points = []
+        for cx, cy, start in ((x1 - r, y0 + r, -90), (x1 - r, y1 - r, 0), (x0 + r, y1 - r, 90), (x0 + r, y0 + r, 180)):
+            for i in range(steps + 1):
+                a = math.radians(start + 90 * i / steps)
+                points.append((cx + r * math.cos(a), cy + r * math.sin(a)))
+        return self._rotate(points)
+    
+    def _ellipse_outline(self, box):
+        """Rotated outline of the ellipse inscribed in an output box, about two pixels per edge"""
+        x0, y0, x1, y1 = box
+        cx, cy, rx, ry = (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2, (y1 - y0) / 2
+        steps = max(16, math.ceil(math.pi * (rx + ry) / 2))
+        return self._rotate([(cx + rx * math.cos(2 * math.pi * i / steps), cy + ry * math.sin(2 * math.pi * i / steps))
+                             for i in range(steps)])
+    
+    def _moved_box(self, box):
+        """Output box translated so its centre follows the heading (for circles)"""
+        x0, y0, x1, y1 = box
+        (cx, cy), = self._rotate([((x0 + x1) / 2, (y0 + y1) / 2)])
+        dx, dy = cx - (x0 + x1) / 2, cy - (y0 + y1) / 2
+        return [x0 + dx, y0 + dy, x1 + dx, y1 + dy]
+        
+    # ---- opaque shapes (pixels are replaced, as with ImageDraw) ----
+    
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        box = self._box(xy)
+        if not self.heading:
+            self._draw.ellipse(box, fill=fill, outline=outline, width=self._width(width))
+        elif box[2] - box[0] == box[3] - box[1]:
+            self._draw.ellipse(self._moved_box(box), fill=fill, outline=outline, width=self._width(width))
+        else:
+            self._draw.polygon(self._ellipse_outline(box), fill=fill, outline=outline, width=self._width(width))
+    
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        if self.heading:
+            self._draw.polygon(self._rect_outline(self._box(xy)), fill=fill, outline=outline, width=self._width(width))
+        else:
+            self._draw.rectangle(self._box(xy), fill=fill, outline=outline, width=self._width(width))
+    
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1):
+        if self.heading:
+            self._draw.polygon(self._rect_outline(self._box(xy), radius * self.scale),
+                               fill=fill, outline=outline, width=self._width(width))
+        else:
+            self._draw.rounded_rectangle(self._box(xy), radius=radius * self.scale,
+                                         fill=fill, outline=outline, width=self._width(width))
+    
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self._draw.polygon(self._points(xy), fill=fill, outline=outline, width=self._width(width))
+    
+    def line(self, xy, fill=None, width=0, joint=None):
+        # Width 0 is Pillow's hairline, one logical pixel wide
+        self._draw.line(self._points(xy), fill=fill, width=self._width(max(width, 1)), joint=joint)
+        
+    # ---- translucent shapes (source-over blended) ----
+    
+    def blend_ellipse(self, xy, fill=None, outline=None, width=1):
+        box = self._box(xy)
+        if not self.heading:
+            self._layers.ellipse(box, fill=fill, outline=outline, width=self._width(width))
+        elif box[2] - box[0] == box[3] - box[1]:
+            self._layers.ellipse(self._moved_box(box), fill=fill, outline=outline, width=self._width(width))
+        else:
+            self._layers.polygon(self._ellipse_outline(box), fill=fill, outline=outline, width=self._width(width))
+    
+    def blend_rectangle(self, xy, fill=None, outline=None, width=1):
+        if self.heading:
+            self._layers.polygon(self._rect_outline(self._box(xy)), fill=fill, outline=outline, width=self._width(width))
+        else:
+            self._layers.rectangle(self._box(xy), fill=fill, outline=outline, width=self._width(width))
+            
+    # ---- glow (see asset_tools.glow; radii are continuous lengths) ----
+    
+    def glow_circle(self, center, radius, color, glow_radius, **kwargs):
+        s = self.scale
+        glow.glow_circle(self.image, self._pt(*center), radius * s, color, glow_radius * s, **kwargs)
+    
+    def glow_ellipse(self, center, radii, color, glow_radius, **kwargs):
+        s = self.scale
+        glow.glow_ellipse(self.image, self._pt(*center), (radii[0] * s, radii[1] * s),
+                          color, glow_radius * s, angle=self.heading, **kwargs)
+    
+    def glow_capsule(self, start, end, radius, color, glow_radius, **kwargs):
+        s = self.scale
+        glow.glow_capsule(self.image, self._pt(*start), self._pt(*end), radius * s,
+                          color, glow_radius * s, **kwargs)
+    
+    def glow_polyline(self, points, radius, color, glow_radius, **kwargs):
+        s = self.scale
+        glow.glow_polyline(self.image, self._points(points), radius * s, color, glow_radius * s, **kwargs)
+        
+    # ---- fills ----
+    
+    def linear_gradient(self, stops, start=None, end=None, dither=False):
+        """Replace the canvas with a gradient; start/end are logical edge coordinates"""
+        s = self.scale
+        ox, oy = self.offset
+        start = ((start[0] + ox) * s, (start[1] + oy) * s) if start is not None else None
+        end = ((end[0] + ox) * s, (end[1] + oy) * s) if end is not None else None
+        self.image.paste(linear_gradient(self.image.size, stops, start, end, dither))
+
+class CanvasSet:
+    """
+    One Canvas per output scale; every drawing call is replayed on each,
+    so a sprite drawn once is rasterised natively at every scale
+    """
+    
+    def __init__(self, size, scales, bg_color=None, heading=None):
+        self.size = tuple(size)
+        self.canvases = {suffix: Canvas(size, scale, bg_color, heading) for suffix, scale in scales.items()}
+    
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        methods = [getattr(canvas, name) for canvas in self.canvases.values()]
+        
+        def draw_all(*args, **kwargs):
+            for method in methods:
+                method(*args, **kwargs)
+        return draw_all
+    
+    def copy(self):
+        other = object.__new__(CanvasSet)
+        other.size = self.size
+        other.canvases = {suffix: canvas.copy() for suffix, canvas in self.canvases.items()}
+        return other
+    
+    @property
+    def images(self):
+        """{scale suffix: rendered image}"""
+        return {suffix: canvas.image for suffix, canvas in self.canvases.items()}
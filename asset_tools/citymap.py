@@ -0,0 +1,204 @@
+"""
+Cyber Strike - Procedural City Maps
+Lays out road networks, rivers with bridges, zoned city blocks and rooftop
+clutter on large tile grids from a seed, using the top-down environment tiles
+"""
+
+import argparse
+import time
+
+import numpy as np
+from PIL import Image
+
+from .mapfile import write_map
+
+# Tile IDs stored in the map layers (low 12 bits of each uint16)
+GROUND = 0
+ROAD = 1
+INTERSECTION = 2
+BRIDGE = 3
+BUILDING_SMALL = 4
+BUILDING_TALL = 5
+BUILDING_CORP = 6
+BUILDING_SLUM = 7
+AC_UNIT = 8
+ANTENNA = 9
+WATER = 10
+
+TILE_MASK = 0x0FFF
+
+# Quarter-turn flag: road and bridge sprites run vertically, rotated tiles run horizontally
+ROTATE_90 = 1 << 12
+
+# Sprite drawn for each tile ID (names as in manifests/topdown.json); None is drawn by the game itself
+TILE_SPRITES = {
+    GROUND: None,
+    ROAD: 'Environment/Roads/road_straight',
+    INTERSECTION: 'Environment/Roads/road_intersection',
+    BRIDGE: 'Environment/Bridges/bridge_section',
+    BUILDING_SMALL: 'Environment/Buildings/building_small',
+    BUILDING_TALL: 'Environment/Buildings/building_tall',
+    BUILDING_CORP: 'Environment/Buildings/building_corp',
+    BUILDING_SLUM: 'Environment/Buildings/building_slum',
+    AC_UNIT: 'Environment/Rooftops/ac_unit',
+    ANTENNA: 'Environment/Rooftops/antenna',
+    WATER: None,
+}
+
+# Map layers, bottom to top
+LAYERS = ['ground', 'rooftop']
+
+# Preview colours per tile ID
+PREVIEW_COLORS = {
+    GROUND: (20, 20, 30),
+    ROAD: (70, 70, 85),
+    INTERSECTION: (255, 220, 0),
+    BRIDGE: (200, 200, 210),
+    BUILDING_SMALL: (40, 90, 120),
+    BUILDING_TALL: (0, 180, 200),
+    BUILDING_CORP: (180, 0, 255),
+    BUILDING_SLUM: (120, 60, 40),
+    WATER: (10, 40, 110),
+}
+
+def value_noise(rng, shape, cell):
+    """Smooth noise in [0, 1): random lattice values every cell tiles, bilinearly blended"""
+    h, w = shape
+    lattice = rng.random((h // cell + 2, w // cell + 2), dtype=np.float32)
+    y = np.arange(h, dtype=np.float32) / cell
+    x = np.arange(w, dtype=np.float32) / cell
+    y0, x0 = y.astype(np.intp), x.astype(np.intp)
+    fy, fx = y - y0, x - x0
+    fy, fx = fy * fy * (3 - 2 * fy), fx * fx * (3 - 2 * fx)
+    top = lattice[y0][:, x0] * (1 - fx) + lattice[y0][:, x0 + 1] * fx
+    bottom = lattice[y0 + 1][:, x0] * (1 - fx) + lattice[y0 + 1][:, x0 + 1] * fx
+    return top * (1 - fy)[:, None] + bottom * fy[:, None]
+
+def road_lines(rng, length, min_block, max_block):
+    """Sorted positions of parallel roads across an axis, min_block..max_block tiles apart"""
+    gaps = rng.integers(min_block + 1, max_block + 2, size=length // (min_block + 1) + 2)
+    positions = np.cumsum(gaps) - rng.integers(1, min_block + 1)
+    return positions[(positions >= 0) & (positions < length)]
+
+def road_masks(rng, shape, min_block=6, max_block=14, arterial_every=4, drop=0.2):
+    """
+    Horizontal and vertical road masks
+    Roads are split into segments between crossing roads; a fraction drop of
+    segments is removed to merge blocks, except on every arterial_every-th
+    road, which always runs the full length of the map
+    """
+    h, w = shape
+    rows = road_lines(rng, h, min_block, max_block)
+    cols = road_lines(rng, w, min_block, max_block)
+    
+    # Segment index of every tile along a road, between consecutive crossing roads
+    col_segment = np.searchsorted(cols, np.arange(w), side='right')
+    row_segment = np.searchsorted(rows, np.arange(h), side='right')
+    keep_h = rng.random((len(rows), len(cols) + 1)) >= drop
+    keep_v = rng.random((len(cols), len(rows) + 1)) >= drop
+    keep_h[::arterial_every] = True
+    keep_v[::arterial_every] = True
+    
+    horizontal = np.zeros(shape, dtype=bool)
+    vertical = np.zeros(shape, dtype=bool)
+    horizontal[rows] = keep_h[:, col_segment]
+    vertical[:, cols] = keep_v[:, row_segment].T
+    return horizontal, vertical
+
+def river_mask(rng, shape, min_width=3, max_width=6):
+    """A meandering river crossing the map; returns (mask, True if it runs top to bottom)"""
+    h, w = shape
+    vertical = bool(rng.random() < 0.5)
+    length, across = (h, w) if vertical else (w, h)
+    drift = np.cumsum(rng.normal(0, 0.6, length))
+    # Smooth the random walk into long bends; the kernel is capped at the
+    # river's length so 'same' keeps one sample per row on small maps
+    kernel = np.hanning(min(41, length)) if length > 2 else np.ones(length)
+    drift = np.convolve(drift, kernel / kernel.sum(), mode='same')
+    center = across * rng.uniform(0.3, 0.7) + drift - drift.mean()
+    width = rng.uniform(min_width, max_width) / 2
+    offsets = np.arange(across)[None, :] - center[:, None]
+    mask = np.abs(offsets) <= width
+    return (mask if vertical else mask.T), vertical
+
+def zone_buildings(rng, shape, vacancy=0.08):
+    """
+    Building tile per cell from a density field: a downtown peak around a
+    random centre plus value noise, so corporate towers cluster and slums
+    fill the fringes
+    """
+    h, w = shape
+    cy, cx = rng.uniform(0.25, 0.75) * h, rng.uniform(0.25, 0.75) * w
+    y = np.arange(h, dtype=np.float32)[:, None]
+    x = np.arange(w, dtype=np.float32)[None, :]
+    radial = 1 - np.minimum(np.hypot(y - cy, x - cx) / (0.6 * max(h, w)), 1)
+    density = 0.55 * radial + 0.3 * value_noise(rng, shape, 48) + 0.15 * value_noise(rng, shape, 8)
+    
+    tiles = np.full(shape, BUILDING_SLUM, dtype=np.uint16)
+    tiles[density > 0.3] = BUILDING_SMALL
+    tiles[density > 0.52] = BUILDING_TALL
+    tiles[density > 0.68] = BUILDING_CORP
+    tiles[rng.random(shape, dtype=np.float32) < vacancy] = GROUND
+    return tiles
+
+def generate_city(width=1000, height=1000, seed=0, clutter=0.25):
+    """
+    Lay out a city and return {layer name: (height, width) uint16 tile IDs}
+    The same seed and size always produce the same map
+    """
+    rng = np.random.default_rng(seed)
+    shape = (height, width)
+    
+    ground = zone_buildings(rng, shape)
+    water, river_vertical = river_mask(rng, shape)
+    horizontal, vertical = road_masks(rng, shape)
+    ground[water] = WATER
+    
+    # Roads, with crossings at junctions; rotated tiles run horizontally
+    ground[vertical] = ROAD
+    ground[horizontal] = ROAD | ROTATE_90
+    ground[horizontal & vertical] = INTERSECTION
+    
+    # Roads crossing the river become bridges; roads running along it are washed out
+    across = horizontal if river_vertical else vertical
+    ground[water & (horizontal | vertical)] = WATER
+    ground[water & across] = BRIDGE | (ROTATE_90 if river_vertical else 0)
+    
+    # Rooftop clutter on some buildings; antennas favour the taller ones
+    kind = ground & TILE_MASK
+    buildings = (kind >= BUILDING_SMALL) & (kind <= BUILDING_SLUM)
+    roll = rng.random(shape, dtype=np.float32)
+    tall = (kind == BUILDING_TALL) | (kind == BUILDING_CORP)
+    rooftop = np.zeros(shape, dtype=np.uint16)
+    rooftop[buildings & (roll < clutter)] = AC_UNIT
+    rooftop[buildings & (roll < clutter * np.where(tall, 0.5, 0.15))] = ANTENNA
+    return {'ground': ground, 'rooftop': rooftop}
+
+def preview(layers):
+    """One pixel per tile RGB image of the ground layer"""
+    lut = np.zeros((TILE_MASK + 1, 3), dtype=np.uint8)
+    for tile, color in PREVIEW_COLORS.items():
+        lut[tile] = color
+    return Image.fromarray(lut[layers['ground'] & TILE_MASK], 'RGB')
+
+def main(argv=None):
+    """Generate a city map file"""
+    parser = argparse.ArgumentParser(description="Generate a procedural Cyber Strike city map")
+    parser.add_argument('output', help="map file to write (e.g. city.ctm)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument('--size', type=int, nargs=2, default=(1000, 1000), metavar=('W', 'H'),
+                        help="map size in tiles (default: 1000 1000)")
+    parser.add_argument('--preview', metavar='PNG', help="also write a one-pixel-per-tile preview image")
+    args = parser.parse_args(argv)
+    
+    start = time.perf_counter()
+    layers = generate_city(*args.size, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    size = write_map(args.output, layers, {'seed': args.seed, 'tiles': TILE_SPRITES})
+    if args.preview:
+        preview(layers).save(args.preview)
+    print(f"✓ {args.size[0]}x{args.size[1]} city (seed {args.seed}) generated in {elapsed:.2f}s, "
+          f"{size} bytes written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Cyber Strike - Layered Compositor
+Blends translucent shapes into one canvas, touching only each shape's bounding box
+"""
+
+from PIL import Image, ImageDraw
+import math
+
+class Compositor:
+    """
+    Drop-in replacement for drawing each translucent shape on a full-canvas
+    overlay and calling Image.alpha_composite once per shape
+    Each shape is rasterised on a layer the size of its bounds and
+    source-over blended into img (which must be RGBA) in place
+    """
+    
+    def __init__(self, img):
+        self.canvas = img
+    
+    def _layer_box(self, xy, width=0):
+        """Integer pixel box covering a shape's bounds (plus stroke), clipped to the canvas"""
+        w, h = self.canvas.size
+        x0 = max(0, math.floor(min(xy[0], xy[2])) - width)
+        y0 = max(0, math.floor(min(xy[1], xy[3])) - width)
+        x1 = min(w, math.ceil(max(xy[0], xy[2])) + width + 1)
+        y1 = min(h, math.ceil(max(xy[1], xy[3])) + width + 1)
+        return x0, y0, x1, y1
+    
+    def _shape(self, method, xy, **kwargs):
+        """Rasterise one shape with Pillow into a bbox-sized layer and blend it in"""
+        x0, y0, x1, y1 = self._layer_box(xy, kwargs.get('width', 0))
+        if x1 <= x0 or y1 <= y0:
+            return
+        layer = Image.new('RGBA', (x1 - x0, y1 - y0), (0, 0, 0, 0))
+        shifted = [xy[0] - x0, xy[1] - y0, xy[2] - x0, xy[3] - y0]
+        getattr(ImageDraw.Draw(layer), method)(shifted, **kwargs)
+        self.blend(layer, (x0, y0))
+    
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        """Composite a translucent ellipse"""
+        self._shape('ellipse', xy, fill=fill, outline=outline, width=width)
+    
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        """Composite a translucent rectangle"""
+        self._shape('rectangle', xy, fill=fill, outline=outline, width=width)
+    
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        """Composite a translucent polygon through the points xy"""
+        xs = [x for x, _ in xy]
+        ys = [y for _, y in xy]
+        x0, y0, x1, y1 = self._layer_box((min(xs), min(ys), max(xs), max(ys)), width)
+        if x1 <= x0 or y1 <= y0:
+            return
+        layer = Image.new('RGBA', (x1 - x0, y1 - y0), (0, 0, 0, 0))
+        ImageDraw.Draw(layer).polygon([(x - x0, y - y0) for x, y in xy], fill=fill, outline=outline, width=width)
+        self.blend(layer, (x0, y0))
+    
+    def blend(self, layer, dest=(0, 0)):
+        """Source-over blend an RGBA layer into the canvas at dest"""
+        self.canvas.alpha_composite(layer, dest)
+    
+    def image(self):
+        """The composited RGBA image"""
+        return self.canvas
@@ -0,0 +1,38 @@
+"""
+Cyber Strike - Sprite Deduplication
+Content-addresses sprite images so byte-identical frames are stored once and
+referenced by alias
+"""
+
+import hashlib
+import json
+import os
+
+def image_digest(img):
+    """Hash of an image's mode, size and raw pixels"""
+    h = hashlib.sha256()
+    h.update(f"{img.mode} {img.width}x{img.height}\n".encode())
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+def find_aliases(images):
+    """
+    Group {name: image} by pixel content
+    Returns {alias: canonical name}; the canonical name of each group of
+    identical images is the first in sorted order
+    """
+    canonical = {}
+    aliases = {}
+    for name in sorted(images):
+        digest = image_digest(images[name])
+        if digest in canonical:
+            aliases[name] = canonical[digest]
+        else:
+            canonical[digest] = name
+    return aliases
+
+def write_aliases(aliases, path):
+    """Write an {alias: canonical name} manifest"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'aliases': aliases}, f, indent=1, sort_keys=True)
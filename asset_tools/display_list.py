@@ -0,0 +1,175 @@
+"""
+Cyber Strike - Display Lists
+Records the Canvas calls a draw_* function makes into a scale-independent
+list of primitives that can be hashed, saved as JSON and replayed onto any
+canvas at any scale, without running the draw code again
+"""
+
+from collections import Counter
+import argparse
+import hashlib
+import inspect
+import json
+
+from .canvas import Canvas, CanvasSet, recording
+
+# Bump when the serialised layout changes
+FORMAT_VERSION = 1
+
+# Canvas methods captured as primitives, in logical coordinates
+PRIMITIVES = [
+    'ellipse', 'rectangle', 'rounded_rectangle', 'polygon', 'line',
+    'blend_ellipse', 'blend_rectangle',
+    'glow_circle', 'glow_ellipse', 'glow_capsule', 'glow_polyline',
+    'linear_gradient',
+]
+
+_SIGNATURES = {name: inspect.signature(getattr(Canvas, name)) for name in PRIMITIVES}
+
+def _canon(value):
+    """Tuples all the way down and plain Python numbers, so equal calls record (and hash) equal"""
+    if isinstance(value, (tuple, list)):
+        return tuple(_canon(v) for v in value)
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+def _params(name, args, kwargs):
+    """{parameter: value} of one call with default-valued parameters left out"""
+    bound = _SIGNATURES[name].bind(None, *args, **kwargs)
+    params = {}
+    for key, value in list(bound.arguments.items())[1:]:
+        param = _SIGNATURES[name].parameters[key]
+        if param.kind is param.VAR_KEYWORD:
+            params.update({k: _canon(v) for k, v in value.items()})
+        elif not (type(value) is type(param.default) and value == param.default):
+            params[key] = _canon(value)
+    return params
+
+class DisplayList:
+    """
+    Canvas stand-in that records instead of drawing
+    Takes Canvas's constructor arguments (scale is accepted and ignored:
+    the list is in logical coordinates) and its drawing methods, each
+    stored as (method, {parameter: value}). image is the list itself, so a
+    draw function's `return canvas.image` hands back the recording
+    """
+    
+    def __init__(self, size, scale=1, bg_color=None, heading=None):
+        self.size = tuple(size)
+        self.bg_color = _canon(bg_color)
+        self.heading = heading
+        self.ops = []
+    
+    def __getattr__(self, name):
+        if name not in PRIMITIVES:
+            raise AttributeError(name)
+        
+        def record(*args, **kwargs):
+            self.ops.append((name, _params(name, args, kwargs)))
+        return record
+    
+    def __len__(self):
+        return len(self.ops)
+    
+    def __eq__(self, other):
+        return isinstance(other, DisplayList) and self.to_dict() == other.to_dict()
+    
+    @property
+    def image(self):
+        return self
+    
+    def copy(self):
+        other = DisplayList(self.size, bg_color=self.bg_color, heading=self.heading)
+        other.ops = list(self.ops)
+        return other
+        
+    # ---- replay ----
+    
+    def play(self, target):
+        """Issue every recorded call on target: a Canvas, CanvasSet or another DisplayList"""
+        for name, params in self.ops:
+            getattr(target, name)(**params)
+        return target
+    
+    def render(self, scale=1):
+        """Rasterise at one scale; identical to running the draw function with that scale"""
+        return self.play(Canvas(self.size, scale, self.bg_color, self.heading)).image
+    
+    def render_set(self, scales):
+        """{suffix: image} rasterised natively at each of {suffix: scale}"""
+        return self.play(CanvasSet(self.size, scales, self.bg_color, self.heading)).images
+        
+    # ---- serialisation ----
+    
+    def to_dict(self):
+        return {'format': FORMAT_VERSION, 'size': list(self.size), 'bg_color': self.bg_color,
+                'heading': self.heading, 'ops': [[name, params] for name, params in self.ops]}
+    
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Display list format {data.get('format')} is not {FORMAT_VERSION}")
+        display_list = cls(data['size'], bg_color=data['bg_color'], heading=data['heading'])
+        display_list.ops = [(name, {k: _canon(v) for k, v in params.items()}) for name, params in data['ops']]
+        return display_list
+    
+    def dumps(self):
+        """Compact, canonical JSON bytes (equal lists give equal bytes)"""
+        return json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':')).encode()
+    
+    @classmethod
+    def loads(cls, data):
+        return cls.from_dict(json.loads(data))
+    
+    def digest(self):
+        """SHA-256 of the canonical bytes: a content key for the pixels the list draws"""
+        return hashlib.sha256(self.dumps()).hexdigest()
+    
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.dumps())
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+def record(draw_fn, *args, **kwargs):
+    """
+    Run a draw_* function in Canvas's recording mode, returning its DisplayList
+    Every Canvas the function constructs, however it reaches the class, is a
+    DisplayList for the duration of the call. The mode is a context variable,
+    so recordings nest and run safely in parallel threads
+    """
+    with recording():
+        result = draw_fn(*args, **kwargs)
+    if not isinstance(result, DisplayList):
+        raise TypeError(f"{draw_fn.__name__} did not return its canvas.image, so it cannot be recorded")
+    return result
+
+def main(argv=None):
+    """Inspect or rasterise a saved display list"""
+    parser = argparse.ArgumentParser(description="Inspect or rasterise a Cyber Strike display list")
+    sub = parser.add_subparsers(dest='command', required=True)
+    info = sub.add_parser('info', help="print size, digest and primitive counts")
+    info.add_argument('path')
+    render = sub.add_parser('render', help="rasterise to a PNG at one scale")
+    render.add_argument('path')
+    render.add_argument('png')
+    render.add_argument('--scale', type=int, default=1, help="output scale factor (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    display_list = DisplayList.load(args.path)
+    if args.command == 'info':
+        w, h = display_list.size
+        print(f"{args.path}: {w}x{h}, heading {display_list.heading}, {len(display_list)} primitives")
+        print(f"  digest {display_list.digest()}")
+        for name, count in Counter(name for name, _ in display_list.ops).most_common():
+            print(f"  {name}: {count}")
+    else:
+        display_list.render(args.scale).save(args.png)
+        print(f"✓ Rendered {args.path} at {args.scale}x to {args.png}")
+
+if __name__ == "__main__":
+    main()
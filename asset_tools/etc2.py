@@ -0,0 +1,404 @@
+"""
+Cyber Strike - ETC2 Texture Encoder
+Vectorised NumPy encoder and decoder for ETC2 RGBA8 (ETC2 colour plus EAC
+alpha, 16 bytes per 4x4 block), written as .pkm files next to the PNGs so
+the GPU samples the compressed blocks directly instead of inflated RGBA
+"""
+
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import math
+import os
+import struct
+
+import numpy as np
+
+# ETC1/ETC2 intensity tables, one row per table codeword, columns by pixel
+# index: +small, +large, -small, -large
+ETC_MODIFIERS = np.array([
+    [2, 8, -2, -8], [5, 17, -5, -17], [9, 29, -9, -29], [13, 42, -13, -42],
+    [18, 60, -18, -60], [24, 80, -24, -80], [33, 106, -33, -106], [47, 183, -47, -183],
+], dtype=np.float32)
+
+# EAC alpha modifier tables, one row per table index, columns by pixel index
+EAC_MODIFIERS = np.array([
+    [-3, -6, -9, -15, 2, 5, 8, 14], [-3, -7, -10, -13, 2, 6, 9, 12],
+    [-2, -5, -8, -13, 1, 4, 7, 12], [-2, -4, -6, -13, 1, 3, 5, 12],
+    [-3, -6, -8, -12, 2, 5, 7, 11], [-3, -7, -9, -11, 2, 6, 8, 10],
+    [-4, -7, -8, -11, 3, 6, 7, 10], [-3, -5, -8, -11, 2, 4, 7, 10],
+    [-2, -6, -8, -10, 1, 5, 7, 9], [-2, -5, -8, -10, 1, 4, 7, 9],
+    [-2, -4, -8, -10, 1, 3, 7, 9], [-2, -5, -7, -10, 1, 4, 6, 9],
+    [-3, -4, -7, -10, 2, 3, 6, 9], [-1, -2, -3, -10, 0, 1, 2, 9],
+    [-4, -6, -8, -9, 3, 5, 7, 8], [-3, -5, -7, -9, 2, 4, 6, 8],
+], dtype=np.float32)
+
+# Speed/quality presets: planar mode on or off, passes re-fitting base
+# colours to the chosen modifiers, and how far the alpha search strays
+# from the estimated multiplier and base
+PRESETS = {
+    'fast': {'planar': False, 'refine': 0, 'alpha_mults': 0, 'alpha_bases': 0},
+    'normal': {'planar': True, 'refine': 1, 'alpha_mults': 1, 'alpha_bases': 0},
+    'high': {'planar': True, 'refine': 3, 'alpha_mults': 2, 'alpha_bases': 2},
+}
+
+# Blocks encoded per vectorised batch, bounding peak memory
+CHUNK = 2048
+
+# PKM 2.0 header: magic, version, format, padded width/height, original width/height
+PKM_HEADER = struct.Struct('>4s2sHHHHH')
+PKM_ETC2_RGBA8 = 3
+
+# Block pixels are numbered down each column (i = x * 4 + y); pixel indices of
+# the two subblocks for flip 0 (2x4 side by side) and flip 1 (4x2 stacked)
+_PIXELS = np.arange(16)
+SUBBLOCKS = [(_PIXELS[_PIXELS < 8], _PIXELS[_PIXELS >= 8]),
+             (_PIXELS[_PIXELS % 4 < 2], _PIXELS[_PIXELS % 4 >= 2])]
+_X, _Y = (_PIXELS // 4).astype(np.float32), (_PIXELS % 4).astype(np.float32)
+
+def to_blocks(img):
+    """(n, 16, 4) float32 pixels of the 4x4 blocks of an RGBA image, edge-padded to whole blocks, in raster order"""
+    arr = np.asarray(img.convert('RGBA'))
+    h, w = arr.shape[:2]
+    arr = np.pad(arr, ((0, -h % 4), (0, -w % 4), (0, 0)), mode='edge')
+    bh, bw = arr.shape[0] // 4, arr.shape[1] // 4
+    return arr.reshape(bh, 4, bw, 4, 4).transpose(0, 2, 3, 1, 4).reshape(-1, 16, 4).astype(np.float32)
+
+def from_blocks(blocks, size):
+    """RGBA image of size from (n, 16, 4) block pixels"""
+    w, h = size
+    bw, bh = -(-w // 4), -(-h // 4)
+    arr = blocks.reshape(bh, bw, 4, 4, 4).transpose(0, 3, 1, 2, 4).reshape(bh * 4, bw * 4, 4)
+    return Image.fromarray(np.ascontiguousarray(arr[:h, :w]).astype(np.uint8), 'RGBA')
+
+def _pack_indices(indices, shift, bits):
+    """OR together per-pixel index fields: pixel i at shift(i), bits wide"""
+    word = np.zeros(len(indices), dtype=np.uint64)
+    for i in range(16):
+        word |= (indices[:, i].astype(np.uint64) & np.uint64((1 << bits) - 1)) << np.uint64(shift(i))
+    return word
+
+# ---- EAC alpha ----
+
+def _encode_alpha(alpha, preset):
+    """64-bit EAC words for (n, 16) alpha values"""
+    n = len(alpha)
+    lo, hi = alpha.min(axis=1), alpha.max(axis=1)
+    best_err = np.full(n, np.inf, dtype=np.float32)
+    best = np.zeros((n, 3), dtype=np.int64)
+    best_idx = np.zeros((n, 16), dtype=np.int64)
+    steps = np.arange(-preset['alpha_mults'], preset['alpha_mults'] + 1)
+    nudges = np.arange(-preset['alpha_bases'], preset['alpha_bases'] + 1)
+    for table, mods in enumerate(EAC_MODIFIERS):
+        span = mods.max() - mods.min()
+        mult = np.clip(np.round((hi - lo) / span)[:, None] + steps, 1, 15)
+        base = np.round((lo + hi)[:, None] / 2 - mult * (mods.max() + mods.min()) / 2)
+        base = np.clip(base[:, :, None] + nudges, 0, 255).reshape(n, -1)
+        mult = np.repeat(mult, len(nudges), axis=1)
+        values = np.clip(base[:, :, None] + mult[:, :, None] * mods, 0, 255)
+        err = np.abs(alpha[:, None, :, None] - values[:, :, None, :])
+        idx = err.argmin(axis=3)
+        total = (np.take_along_axis(err, idx[..., None], 3)[..., 0] ** 2).sum(axis=2)
+        pick = total.argmin(axis=1)
+        rows = np.arange(n)
+        better = total[rows, pick] < best_err
+        best_err[better] = total[rows, pick][better]
+        best[better] = np.stack([base[rows, pick], mult[rows, pick], np.full(n, table)], axis=1)[better]
+        best_idx[better] = idx[rows, pick][better]
+    word = (best[:, 0].astype(np.uint64) << np.uint64(56)) | (best[:, 1].astype(np.uint64) << np.uint64(52))
+    word |= best[:, 2].astype(np.uint64) << np.uint64(48)
+    return word | _pack_indices(best_idx, lambda i: 45 - 3 * i, 3)
+
+def _constant_alpha(alpha):
+    """EAC words for blocks of one alpha value: base, multiplier 1, table 13 whose index 4 adds 0"""
+    word = (alpha.astype(np.uint64) << np.uint64(56)) | (np.uint64(1) << np.uint64(52)) | (np.uint64(13) << np.uint64(48))
+    return word | np.uint64(sum(4 << (45 - 3 * i) for i in range(16)))
+
+def _decode_alpha(words):
+    base = ((words >> np.uint64(56)) & np.uint64(255)).astype(np.float32)
+    mult = ((words >> np.uint64(52)) & np.uint64(15)).astype(np.float32)
+    table = ((words >> np.uint64(48)) & np.uint64(15)).astype(np.int64)
+    idx = np.stack([((words >> np.uint64(45 - 3 * i)) & np.uint64(7)).astype(np.int64) for i in range(16)], axis=1)
+    return np.clip(base[:, None] + EAC_MODIFIERS[table[:, None], idx] * mult[:, None], 0, 255)
+
+# ---- ETC2 colour ----
+
+def _fit_subblock(pixels, weights, base):
+    """Best table and pixel indices for one subblock around 8-bit base colours; returns (error, table, indices)"""
+    values = np.clip(base[:, None, None, :] + ETC_MODIFIERS[None, :, :, None], 0, 255)
+    err = ((pixels[:, :, None, None, :] - values[:, None]) ** 2).sum(axis=4)
+    idx = err.argmin(axis=3)
+    total = (np.take_along_axis(err, idx[..., None], 3)[..., 0] * weights[:, :, None]).sum(axis=1)
+    table = total.argmin(axis=1)
+    rows = np.arange(len(pixels))
+    return total[rows, table], table, idx[rows, :, table]
+
+def _quantise(avg0, avg1, differential):
+    """Base colours for a subblock pair: (codes 1, codes 2 or deltas, expanded 8-bit colours 1 and 2)"""
+    if differential:
+        q0 = np.clip(np.round(avg0 * 31 / 255), 0, 31)
+        delta = np.clip(np.clip(np.round(avg1 * 31 / 255), 0, 31) - q0, -4, 3)
+        q1 = q0 + delta
+        return q0, delta, q0 * 8 + q0 // 4, q1 * 8 + q1 // 4
+    q0 = np.clip(np.round(avg0 * 15 / 255), 0, 15)
+    q1 = np.clip(np.round(avg1 * 15 / 255), 0, 15)
+    return q0, q1, q0 * 17, q1 * 17
+
+def _encode_split(rgb, weights, flip, differential, refine):
+    """Individual or differential mode words for one flip; returns (error, word)"""
+    sub = SUBBLOCKS[flip]
+    px = [rgb[:, s] for s in sub]
+    wt = [weights[:, s] for s in sub]
+    avg = [(p * w[..., None]).sum(axis=1) / w.sum(axis=1)[:, None] for p, w in zip(px, wt)]
+    best = None
+    for _ in range(refine + 1):
+        c0, c1, e0, e1 = _quantise(avg[0], avg[1], differential)
+        fits = [_fit_subblock(px[k], wt[k], e) for k, e in enumerate((e0, e1))]
+        err = fits[0][0] + fits[1][0]
+        if best is None:
+            best = [err, c0, c1, fits]
+        else:
+            better = err < best[0]
+            best[0] = np.where(better, err, best[0])
+            best[1] = np.where(better[:, None], c0, best[1])
+            best[2] = np.where(better[:, None], c1, best[2])
+            best[3] = [tuple(np.where(better.reshape(-1, *([1] * (new.ndim - 1))), new, old)
+                             for new, old in zip(fit, old_fit)) for fit, old_fit in zip(fits, best[3])]
+        # Re-centre each base on what its chosen modifiers leave over
+        avg = [(((p - ETC_MODIFIERS[f[1][:, None], f[2]][..., None]) * w[..., None]).sum(axis=1)
+                / w.sum(axis=1)[:, None]) for p, w, f in zip(px, wt, fits)]
+    err, c0, c1, fits = best
+    c0, c1 = c0.astype(np.int64), c1.astype(np.int64)
+    word = np.zeros(len(rgb), dtype=np.uint64)
+    for channel, shift in enumerate((56, 48, 40)):
+        if differential:
+            word |= (c0[:, channel].astype(np.uint64) << np.uint64(shift + 3))
+            word |= ((c1[:, channel] & 7).astype(np.uint64) << np.uint64(shift))
+        else:
+            word |= (c0[:, channel].astype(np.uint64) << np.uint64(shift + 4))
+            word |= (c1[:, channel].astype(np.uint64) << np.uint64(shift))
+    word |= (fits[0][1].astype(np.uint64) << np.uint64(37)) | (fits[1][1].astype(np.uint64) << np.uint64(34))
+    word |= np.uint64(int(differential) << 33 | flip << 32)
+    indices = np.zeros((len(rgb), 16), dtype=np.int64)
+    indices[:, sub[0]] = fits[0][2]
+    indices[:, sub[1]] = fits[1][2]
+    word |= _pack_indices(indices & 1, lambda i: i, 1) | _pack_indices(indices >> 1, lambda i: i + 16, 1)
+    return err, word
+
+def _planar_colors(o, h, v):
+    """(n, 16, 3) pixels of planar blocks from 8-bit origin, horizontal and vertical colours"""
+    return np.clip(np.floor((_X[None, :, None] * (h - o)[:, None] + _Y[None, :, None] * (v - o)[:, None]
+                             + 4 * o[:, None] + 2) / 4), 0, 255)
+
+def _expand(values, bits):
+    return values * 2 ** (8 - bits) + values // 2 ** (2 * bits - 8)
+
+def _encode_planar(rgb, weights):
+    """Planar mode words: a least-squares colour gradient over the block; returns (error, word)"""
+    # Fit c = a + b x + d y per channel; O = a, H = a + 4b, V = a + 4d
+    design = np.stack([np.ones(16, dtype=np.float32), _X, _Y], axis=1)
+    coef = np.einsum('kp,npc->nkc', np.linalg.pinv(design), rgb)
+    corners = [coef[:, 0], coef[:, 0] + 4 * coef[:, 1], coef[:, 0] + 4 * coef[:, 2]]
+    bits = np.array([6, 7, 6])
+    codes = [np.clip(np.round(c * (2 ** bits - 1) / 255), 0, 2 ** bits - 1) for c in corners]
+    colors = _planar_colors(*[_expand(c, bits) for c in codes])
+    err = (((rgb - colors) ** 2).sum(axis=2) * weights).sum(axis=1)
+    (ro, go, bo), (rh, gh, bh), (rv, gv, bv) = [c.astype(np.int64).T.astype(np.uint64) for c in codes]
+    u = lambda v: np.uint64(v)
+    word = (ro << u(57)) | ((go >> u(6)) << u(56)) | ((go & u(63)) << u(49)) | ((bo >> u(5)) << u(48))
+    word |= (((bo >> u(3)) & u(3)) << u(43)) | ((bo & u(7)) << u(39)) | ((rh >> u(1)) << u(34)) | ((rh & u(1)) << u(32))
+    word |= (gh << u(25)) | (bh << u(19)) | (rv << u(13)) | (gv << u(6)) | bv | u(1 << 33)
+    # Free bits steer the differential reading: red and green in range, blue overflowing
+    red = ((word >> u(59)) & u(31)).astype(np.int64) + _signed3(word >> u(56))
+    word |= np.where((red < 0) | (red > 31), u(1 << 63), u(0))
+    green = ((word >> u(51)) & u(31)).astype(np.int64) + _signed3(word >> u(48))
+    word |= np.where((green < 0) | (green > 31), u(1 << 55), u(0))
+    blue = ((word >> u(43)) & u(3)) + ((word >> u(40)) & u(3))
+    word |= np.where(blue <= 3, u(1 << 42), u(7 << 45))
+    return err, word
+
+def _signed3(values):
+    v = (values & np.uint64(7)).astype(np.int64)
+    return v - 8 * (v >= 4)
+
+def _encode_color(rgb, weights, preset):
+    """64-bit ETC2 colour words for (n, 16, 3) pixels, keeping the lowest-error mode per block"""
+    candidates = [_encode_split(rgb, weights, flip, differential, preset['refine'])
+                  for flip in (0, 1) for differential in (False, True)]
+    if preset['planar']:
+        candidates.append(_encode_planar(rgb, weights))
+    errs = np.stack([err for err, _ in candidates], axis=1)
+    words = np.stack([word for _, word in candidates], axis=1)
+    return words[np.arange(len(rgb)), errs.argmin(axis=1)]
+
+def _decode_color(words):
+    u = lambda v: np.uint64(v)
+    n = len(words)
+    out = np.zeros((n, 16, 3), dtype=np.float32)
+    diff = ((words >> u(33)) & u(1)).astype(bool)
+    flip = ((words >> u(32)) & u(1)).astype(np.int64)
+    base = np.stack([((words >> u(s + 3)) & u(31)).astype(np.int64) for s in (56, 48, 40)], axis=1)
+    second = base + np.stack([_signed3(words >> u(s)) for s in (56, 48, 40)], axis=1)
+    overflow = (second < 0) | (second > 31)
+    if (diff & (overflow[:, 0] | overflow[:, 1])).any():
+        raise ValueError("ETC2 T and H mode blocks are not supported by this decoder")
+    planar = diff & overflow[:, 2]
+    split = ~planar
+    
+    # Individual and differential blocks
+    individual = np.stack([((words >> u(s + 4)) & u(15)).astype(np.int64) for s in (56, 48, 40)], axis=1)
+    individual2 = np.stack([((words >> u(s)) & u(15)).astype(np.int64) for s in (56, 48, 40)], axis=1)
+    c0 = np.where(diff[:, None], base * 8 + base // 4, individual * 17)
+    c1 = np.where(diff[:, None], second * 8 + second // 4, individual2 * 17)
+    tables = [((words >> u(37)) & u(7)).astype(np.int64), ((words >> u(34)) & u(7)).astype(np.int64)]
+    indices = np.stack([(((words >> u(i)) & u(1)) | (((words >> u(i + 16)) & u(1)) << u(1))).astype(np.int64)
+                        for i in range(16)], axis=1)
+    in_second = np.where(flip[:, None] == 0, _PIXELS[None] >= 8, _PIXELS[None] % 4 >= 2)
+    color = np.where(in_second[..., None], c1[:, None], c0[:, None])
+    table = np.where(in_second, tables[1][:, None], tables[0][:, None])
+    values = np.clip(color + ETC_MODIFIERS[table, indices][..., None], 0, 255)
+    out[split] = values[split]
+    
+    # Planar blocks
+    w = words[planar]
+    fields = lambda *parts: sum((((w >> u(shift)) & u((1 << bits) - 1)) << u(offset) for shift, bits, offset in parts),
+                                u(0))
+    ro, go, bo = fields((57, 6, 0)), fields((56, 1, 6), (49, 6, 0)), fields((48, 1, 5), (43, 2, 3), (39, 3, 0))
+    rh, gh, bh = fields((34, 5, 1), (32, 1, 0)), fields((25, 7, 0)), fields((19, 6, 0))
+    rv, gv, bv = fields((13, 6, 0)), fields((6, 7, 0)), fields((0, 6, 0))
+    bits = np.array([6, 7, 6])
+    corners = [_expand(np.stack(c, axis=1).astype(np.float32), bits)
+               for c in ((ro, go, bo), (rh, gh, bh), (rv, gv, bv))]
+    out[planar] = _planar_colors(*corners)
+    return out
+
+# ---- images and files ----
+
+def encode(img, preset='normal'):
+    """
+    ETC2 RGBA8 blocks for an image: 16 bytes per 4x4 block in raster order,
+    each an EAC alpha word then an ETC2 colour word, big-endian
+    Blocks of one alpha value skip the alpha search, and fully transparent
+    blocks keep an all-zero colour word since their colour is never seen
+    """
+    settings = PRESETS[preset]
+    blocks = to_blocks(img)
+    lo, hi = blocks[..., 3].min(axis=1), blocks[..., 3].max(axis=1)
+    alpha = _constant_alpha(lo)
+    color = np.zeros(len(blocks), dtype=np.uint64)
+    # Error is weighted by coverage, so faint pixels cannot pull colours away from solid ones
+    weights = (blocks[..., 3] + 1) / 256
+    varying = np.flatnonzero(lo != hi)
+    for start in range(0, len(varying), CHUNK):
+        rows = varying[start:start + CHUNK]
+        alpha[rows] = _encode_alpha(blocks[rows, :, 3], settings)
+    visible = np.flatnonzero(hi > 0)
+    for start in range(0, len(visible), CHUNK):
+        rows = visible[start:start + CHUNK]
+        color[rows] = _encode_color(blocks[rows, :, :3], weights[rows], settings)
+    return np.stack([alpha, color], axis=1).astype('>u8').tobytes()
+
+def decode(data, size):
+    """RGBA image of size from ETC2 RGBA8 blocks"""
+    words = np.frombuffer(data, dtype='>u8').astype(np.uint64).reshape(-1, 2)
+    blocks = np.concatenate([_decode_color(words[:, 1]), _decode_alpha(words[:, 0])[..., None]], axis=2)
+    return from_blocks(blocks, size)
+
+def psnr(a, b):
+    """PSNR in dB between two RGBA images, compared in premultiplied alpha so hidden colour does not count"""
+    def premultiplied(img):
+        arr = np.asarray(img.convert('RGBA'), dtype=np.float64)
+        return np.concatenate([arr[..., :3] * arr[..., 3:] / 255, arr[..., 3:]], axis=2)
+    mse = ((premultiplied(a) - premultiplied(b)) ** 2).mean()
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+def write_pkm(path, data, size):
+    """Write ETC2 RGBA8 blocks as a PKM 2.0 file"""
+    w, h = size
+    with open(path, 'wb') as f:
+        f.write(PKM_HEADER.pack(b'PKM ', b'20', PKM_ETC2_RGBA8, -(-w // 4) * 4, -(-h // 4) * 4, w, h))
+        f.write(data)
+
+def read_pkm(path):
+    """(block bytes, (width, height)) of a PKM 2.0 ETC2 RGBA8 file"""
+    with open(path, 'rb') as f:
+        header = f.read(PKM_HEADER.size)
+        data = f.read()
+    magic, version, fmt, pw, ph, w, h = PKM_HEADER.unpack(header)
+    if magic != b'PKM ' or version != b'20' or fmt != PKM_ETC2_RGBA8:
+        raise ValueError(f"{path} is not an ETC2 RGBA8 PKM file")
+    if len(data) != pw * ph:
+        raise ValueError(f"{path} holds {len(data)} bytes of blocks, expected {pw * ph}")
+    return data, (w, h)
+
+def encode_file(path, preset='normal'):
+    """
+    Write <name>.pkm next to a PNG
+    Returns (path, PSNR of the decoded blocks against the PNG, PKM bytes)
+    """
+    with Image.open(path) as img:
+        original = img.convert('RGBA')
+    data = encode(original, preset)
+    pkm_path = os.path.splitext(path)[0] + '.pkm'
+    write_pkm(pkm_path, data, original.size)
+    return path, psnr(original, decode(data, original.size)), os.path.getsize(pkm_path)
+
+def encode_files(paths, preset='normal', workers=None):
+    """Encode PNGs across a process pool; workers=1 runs in-process"""
+    paths = sorted(set(paths))
+    if workers == 1 or len(paths) <= 1:
+        return [encode_file(path, preset) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(encode_file, paths, [preset] * len(paths)))
+
+def is_current(path, preset, cache=None):
+    """
+    True if the PNG's .pkm was made from its current bytes at preset, as the
+    build cache recorded; without a cache, if the .pkm is newer than the PNG
+    """
+    pkm_path = os.path.splitext(path)[0] + '.pkm'
+    if cache is not None:
+        return cache.is_derived(pkm_path, path, f"etc2 {preset}")
+    return os.path.exists(pkm_path) and os.path.getmtime(pkm_path) >= os.path.getmtime(path)
+
+def encode_stale(paths, preset='normal', cache=None, workers=None):
+    """Encode the PNGs whose .pkm is missing or out of date (see is_current) and record them in the cache"""
+    results = encode_files([p for p in paths if not is_current(p, preset, cache)], preset, workers)
+    if cache is not None:
+        for path, _, _ in results:
+            cache.mark_derived(os.path.splitext(path)[0] + '.pkm', path, f"etc2 {preset}")
+    return results
+
+def print_report(results, root=None):
+    """Print PSNR and size per texture plus the worst and total"""
+    for path, quality, size in results:
+        name = os.path.relpath(path, root) if root else path
+        print(f"  {name}: {quality:.1f} dB, {size} bytes")
+    if results:
+        worst = min(quality for _, quality, _ in results)
+        total = sum(size for _, _, size in results)
+        print(f"✓ Encoded {len(results)} ETC2 textures: {total} bytes, lowest PSNR {worst:.1f} dB")
+
+def main(argv=None):
+    """Encode every RGBA PNG under a directory to ETC2"""
+    parser = argparse.ArgumentParser(description="Encode PNG textures as ETC2 RGBA8 .pkm files")
+    parser.add_argument('root', help="directory to scan for PNGs")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='normal',
+                        help="speed/quality trade-off (default: %(default)s)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: CPU count, 1 = serial)")
+    args = parser.parse_args(argv)
+    
+    paths = []
+    for dirpath, _, files in os.walk(args.root):
+        for filename in files:
+            if filename.endswith('.png'):
+                # Indexed sheets hold palette indices, not colours, and must stay lossless
+                with Image.open(os.path.join(dirpath, filename)) as img:
+                    if img.mode == 'L':
+                        continue
+                paths.append(os.path.join(dirpath, filename))
+    print_report(encode_files(paths, args.preset, max(1, args.workers)), args.root)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Cyber Strike - Glow Renderer
+Neon glow drawn from signed distance fields instead of stacked ellipses
+"""
+
+from PIL import Image
+import numpy as np
+
+# Falloff curves: map normalised distance t in [0, 1] from the shape edge to glow strength
+FALLOFFS = {
+    'linear': lambda t: 1 - t,
+    'quadratic': lambda t: (1 - t) ** 2,
+    'smooth': lambda t: 1 - t * t * (3 - 2 * t),
+}
+
+def ellipse_distance(x, y, center, radii, angle=0):
+    """
+    Signed distance to an ellipse turned clockwise by angle degrees (negative inside)
+    Uses the first-order approximation, which is within a fraction of a
+    pixel at sprite sizes; x and y are row/column vectors so, unrotated,
+    every term but the last combine stays 1-D
+    """
+    cx, cy = center
+    rx, ry = radii
+    dx, dy = x - cx, y - cy
+    if angle:
+        # Into the ellipse's own frame
+        c, s = np.float32(np.cos(np.radians(angle))), np.float32(np.sin(np.radians(angle)))
+        dx, dy = dx * c + dy * s, dy * c - dx * s
+    k0 = np.sqrt((dx / rx) ** 2 + (dy / ry) ** 2)
+    k1 = np.sqrt((dx / (rx * rx)) ** 2 + (dy / (ry * ry)) ** 2)
+    # At the exact center k1 is 0 and the distance is the short semi-axis
+    np.maximum(k1, 1e-6 / max(rx, ry) ** 2, out=k1)
+    k1 = k0 * (k0 - 1) / k1
+    return np.maximum(k1, -min(rx, ry), out=k1)
+
+def capsule_distance(x, y, start, end, radius):
+    """Signed distance to a segment from start to end swept by radius (round caps)"""
+    ax, ay = start
+    bx, by = end
+    px, py = x - ax, y - ay
+    vx, vy = bx - ax, by - ay
+    length_sq = vx * vx + vy * vy
+    h = np.clip((px * vx + py * vy) / length_sq, 0, 1) if length_sq else 0
+    return np.hypot(px - vx * h, py - vy * h) - radius
+
+def polyline_distance(x, y, points, radius):
+    """Signed distance to a connected run of capsules through points"""
+    if len(points) == 1:
+        return capsule_distance(x, y, points[0], points[0], radius)
+    dist = None
+    for start, end in zip(points, points[1:]):
+        seg = capsule_distance(x, y, start, end, radius)
+        dist = seg if dist is None else np.minimum(dist, seg)
+    return dist
+
+def glow_shape(img, bounds, distance, color, glow_radius, glow_alpha=64, core_alpha=None, falloff='linear'):
+    """
+    Composite a glowing shape into img in place
+    bounds is the shape's (x0, y0, x1, y1) extent and distance a function
+    giving the signed distance at pixel coordinates (x, y). Pixels inside
+    the shape get core_alpha (default: the colour's own alpha), the glow
+    fades from glow_alpha at the edge to nothing glow_radius pixels out
+    """
+    w, h = img.size
+    pad = glow_radius + 1
+    x0, y0 = max(0, int(np.floor(bounds[0] - pad))), max(0, int(np.floor(bounds[1] - pad)))
+    x1, y1 = min(w, int(np.ceil(bounds[2] + pad)) + 1), min(h, int(np.ceil(bounds[3] + pad)) + 1)
+    if x1 <= x0 or y1 <= y0:
+        return
+        
+    x = np.arange(x0, x1, dtype=np.float32)[None, :]
+    y = np.arange(y0, y1, dtype=np.float32)[:, None]
+    dist = np.broadcast_to(distance(x, y), (y1 - y0, x1 - x0)).astype(np.float32)
+    
+    curve = FALLOFFS[falloff] if isinstance(falloff, str) else falloff
+    if glow_radius > 0:
+        t = dist * np.float32(1 / glow_radius)
+    else:
+        t = (dist > 0).astype(np.float32)
+    np.clip(t, 0, 1, out=t)
+    alpha = curve(t)
+    alpha *= glow_alpha
+    if core_alpha is None:
+        core_alpha = color[3] if len(color) > 3 else 255
+    if core_alpha:
+        # Anti-aliased core edge: pixel coverage from the distance across its center
+        coverage = np.float32(0.5) - dist
+        np.clip(coverage, 0, 1, out=coverage)
+        alpha += (core_alpha - alpha) * coverage
+        
+    layer = np.empty(alpha.shape + (4,), dtype=np.uint8)
+    layer[..., :3] = color[:3]
+    alpha += 0.5
+    layer[..., 3] = np.minimum(alpha, 255)
+    img.alpha_composite(Image.fromarray(layer, 'RGBA'), (x0, y0))
+
+def glow_circle(img, center, radius, color, glow_radius, **kwargs):
+    """Composite a glowing circle into img (radius 0 gives a point glow)"""
+    glow_polyline(img, [center], radius, color, glow_radius, **kwargs)
+
+def glow_ellipse(img, center, radii, color, glow_radius, angle=0, **kwargs):
+    """Composite a glowing ellipse, turned clockwise by angle degrees, into img"""
+    cx, cy = center
+    rx, ry = radii
+    if angle:
+        c, s = abs(np.cos(np.radians(angle))), abs(np.sin(np.radians(angle)))
+        rx, ry = np.hypot(rx * c, ry * s), np.hypot(rx * s, ry * c)
+    glow_shape(img, (cx - rx, cy - ry, cx + rx, cy + ry),
+               lambda x, y: ellipse_distance(x, y, center, radii, angle),
+               color, glow_radius, **kwargs)
+
+def glow_capsule(img, start, end, radius, color, glow_radius, **kwargs):
+    """Composite a glowing round-capped line segment into img"""
+    glow_polyline(img, [start, end], radius, color, glow_radius, **kwargs)
+
+def glow_polyline(img, points, radius, color, glow_radius, **kwargs):
+    """Composite a glowing round-capped polyline into img"""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    glow_shape(img, (min(xs) - radius, min(ys) - radius, max(xs) + radius, max(ys) + radius),
+               lambda x, y: polyline_distance(x, y, points, radius),
+               color, glow_radius, **kwargs)
@@ -0,0 +1,84 @@
+"""
+Cyber Strike - Gradient Renderer
+Multi-stop linear and radial gradients built as whole-image NumPy operations
+"""
+
+from PIL import Image
+import numpy as np
+
+# 8x8 ordered-dither (Bayer) matrix, normalised to thresholds in (0, 1)
+BAYER_8 = (np.array([
+    [0, 32, 8, 40, 2, 34, 10, 42],
+    [48, 16, 56, 24, 50, 18, 58, 26],
+    [12, 44, 4, 36, 14, 46, 6, 38],
+    [60, 28, 52, 20, 62, 30, 54, 22],
+    [3, 35, 11, 43, 1, 33, 9, 41],
+    [51, 19, 59, 27, 49, 17, 57, 25],
+    [15, 47, 7, 39, 13, 45, 5, 37],
+    [63, 31, 55, 23, 61, 29, 53, 21],
+]) + 0.5) / 64
+
+def _parse_stops(stops):
+    """Split [(position, color), ...] into sorted position and RGBA float arrays"""
+    stops = sorted(stops, key=lambda stop: stop[0])
+    positions = np.array([pos for pos, _ in stops], dtype=np.float64)
+    colors = np.array([tuple(color) + (255,) * (4 - len(color)) for _, color in stops], dtype=np.float64)
+    return positions, colors
+
+def _shade(t, stops, size, dither):
+    """
+    Map the gradient parameter t through the colour stops into an RGBA image
+    t may be any array broadcastable to (height, width); one channel is
+    evaluated at a time to keep peak memory low on large backgrounds
+    """
+    w, h = size
+    positions, colors = _parse_stops(stops)
+    t = np.clip(t, positions[0], positions[-1])
+    threshold = None
+    if dither:
+        reps = (-(-h // 8), -(-w // 8))
+        threshold = np.tile(BAYER_8.astype(np.float32), reps)[:h, :w]
+        
+    out = np.empty(np.broadcast_shapes(t.shape, (h, w) if dither else t.shape) + (4,), dtype=np.uint8)
+    for c in range(4):
+        channel = np.interp(t, positions, colors[:, c])
+        if threshold is not None:
+            channel = channel.astype(np.float32) + threshold
+        out[..., c] = np.clip(np.floor(channel), 0, 255)
+    return Image.fromarray(np.ascontiguousarray(np.broadcast_to(out, (h, w, 4))), 'RGBA')
+
+def linear_gradient(size, stops, start=None, end=None, dither=False):
+    """
+    Render a multi-stop linear gradient
+    stops is a list of (position, color) pairs with positions along start -> end
+    (default: top edge to bottom edge); pixels are sampled at integer coordinates
+    """
+    w, h = size
+    x0, y0 = start if start is not None else (0, 0)
+    x1, y1 = end if end is not None else (0, h)
+    dx, dy = x1 - x0, y1 - y0
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        raise ValueError("Linear gradient needs distinct start and end points")
+        
+    # Axis-aligned gradients stay 1-D until the final broadcast
+    t = np.zeros((1, 1))
+    if dx:
+        t = t + (np.arange(w, dtype=np.float64)[None, :] - x0) * dx
+    if dy:
+        t = t + (np.arange(h, dtype=np.float64)[:, None] - y0) * dy
+    return _shade(t / length_sq, stops, size, dither)
+
+def radial_gradient(size, stops, center=None, radius=None, dither=False):
+    """
+    Render a multi-stop radial gradient
+    stops run from the center (0) to radius (1); radius defaults to the
+    distance from the center to the farthest corner
+    """
+    w, h = size
+    cx, cy = center if center is not None else (w / 2, h / 2)
+    if radius is None:
+        radius = max(np.hypot(px - cx, py - cy) for px in (0, w) for py in (0, h))
+    dx = np.arange(w, dtype=np.float64)[None, :] - cx
+    dy = np.arange(h, dtype=np.float64)[:, None] - cy
+    return _shade(np.sqrt(dx * dx + dy * dy) / radius, stops, size, dither)
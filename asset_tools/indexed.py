@@ -0,0 +1,154 @@
+"""
+Cyber Strike - Indexed Sprites
+Renders colour variants of one geometry as a single 8-bit index image plus
+one small palette row per variant, so the client recolours sprites with a
+palette lookup instead of shipping a texture set per variant
+"""
+
+from PIL import Image
+import json
+import os
+
+import numpy as np
+
+from .trim import PADDING, crop_scaled, shared_bounds, trim_info
+
+# Palette entries per sprite; entry 0 is always fully transparent
+MAX_COLORS = 256
+
+def slot_weights(render, slots):
+    """
+    Decompose a sprite into how much each colour slot contributes per pixel
+    render(slot colours) returns {suffix: RGBA image}. Drawing and
+    compositing are linear in the fill colours once coverage is fixed, so
+    one render with every slot dark and one per slot with that slot light
+    give each slot's weight and the slot-independent colour. Probe colours
+    are distinct greys, since Pillow rasterises a shape whose fill and
+    outline match differently. Returns {suffix: (h, w, 4 + len(slots))
+    float32 array of alpha, constant RGB and slot weights}
+    """
+    dark = {slot: (i + 1,) * 3 for i, slot in enumerate(slots)}
+    light = {slot: (254 - i,) * 3 for i, slot in enumerate(slots)}
+    base = {s: np.asarray(img, dtype=np.float32) for s, img in render(dark).items()}
+    weights = {s: [] for s in base}
+    for slot in slots:
+        for s, img in render({**dark, slot: light[slot]}).items():
+            arr = np.asarray(img, dtype=np.float32)
+            if (arr[..., 3] != base[s][..., 3]).any():
+                raise ValueError(f"Colour slot {slot} changes the sprite's coverage, so it cannot be a palette slot")
+            diff = (arr[..., :3] - base[s][..., :3]).mean(axis=2, keepdims=True)
+            weights[s].append(diff / (light[slot][0] - dark[slot][0]))
+    features = {}
+    for s, arr in base.items():
+        constant = arr[..., :3] - sum(w * dark[slot][0] for w, slot in zip(weights[s], slots))
+        features[s] = np.concatenate([arr[..., 3:], constant, *weights[s]], axis=2)
+    return features
+
+def _median_cut(points, counts, n):
+    """Split unique feature points into at most n boxes; returns the box index of every point"""
+    boxes = [np.arange(len(points))]
+    while len(boxes) < n:
+        spans = [np.ptp(points[box], axis=0) if len(box) > 1 else np.zeros(points.shape[1]) for box in boxes]
+        widest = max(range(len(boxes)), key=lambda i: spans[i].max())
+        if spans[widest].max() == 0:
+            break
+        box = boxes[widest]
+        axis = spans[widest].argmax()
+        box = box[np.argsort(points[box, axis], kind='stable')]
+        # Split at the pixel-weighted median, keeping both halves non-empty
+        cumulative = np.cumsum(counts[box])
+        cut = int(np.clip(np.searchsorted(cumulative, cumulative[-1] / 2), 1, len(box) - 1))
+        boxes[widest:widest + 1] = [box[:cut], box[cut:]]
+    labels = np.empty(len(points), dtype=np.intp)
+    for i, box in enumerate(boxes):
+        labels[box] = i
+    return labels
+
+def build_index(features, max_colors=MAX_COLORS):
+    """
+    Quantise slot features from slot_weights (every scale shares one table)
+    Returns ({suffix: (h, w) uint8 index array}, (n, 4 + slots) float32
+    entries). Features are compared in 0-255 units; when there are more
+    distinct features than entries, they are merged by median cut
+    """
+    scale = None
+    flat = []
+    for arr in features.values():
+        if scale is None:
+            scale = np.ones(arr.shape[2], dtype=np.float32)
+            scale[4:] = 255
+        flat.append((arr * scale).reshape(-1, arr.shape[2]).round(1))
+    flat = np.concatenate(flat)
+    opaque = flat[:, 0] > 0
+    points, inverse, counts = np.unique(flat[opaque], axis=0, return_inverse=True, return_counts=True)
+    labels = _median_cut(points, counts, max_colors - 1)
+    groups = labels.max() + 1 if len(labels) else 0
+    entries = np.zeros((groups + 1, flat.shape[1]), dtype=np.float64)
+    np.add.at(entries[1:], labels, points * counts[:, None])
+    entries[1:] /= np.bincount(labels, weights=counts, minlength=groups)[:, None]
+    # Alpha stays an exact byte so index 0 is the only fully transparent entry
+    entries[1:, 0] = np.maximum(entries[1:, 0].round(), 1)
+    
+    index = np.zeros(len(flat), dtype=np.uint8)
+    index[opaque] = labels[inverse.reshape(-1)] + 1
+    images = {}
+    start = 0
+    for suffix, arr in features.items():
+        h, w = arr.shape[:2]
+        images[suffix] = index[start:start + h * w].reshape(h, w)
+        start += h * w
+    return images, (entries / scale).astype(np.float32)
+
+def palette_row(entries, colors):
+    """(n, 4) uint8 RGBA palette for slot colours given in slot order"""
+    colors = np.asarray([c[:3] for c in colors], dtype=np.float32).reshape(-1, 3)
+    rgb = entries[:, 1:4] + entries[:, 4:] @ colors
+    row = np.zeros((len(entries), 4), dtype=np.uint8)
+    row[:, :3] = np.clip(rgb + 0.5, 0, 255)
+    row[:, 3] = entries[:, 0]
+    return row
+
+def apply_palette(index, row):
+    """RGBA image of an index array drawn with one palette row"""
+    return Image.fromarray(row[index], 'RGBA')
+
+def write_indexed(out_dir, sprites, scales, padding=PADDING):
+    """
+    Write indexed sprites: <name><suffix>.png 8-bit index images, one
+    palettes.png texture (256 wide, one row per variant) and an
+    indexed.json index
+    sprites maps each name to {'index': {suffix: array}, 'entries': array,
+    'slots': [slot names], 'variants': {variant: [slot colours]}}. The JSON
+    keeps each entry's alpha, constant colour and slot weights, so the
+    client can build a palette for new slot colours itself. Index images
+    are trimmed to the sprite's bounds at every scale plus padding logical
+    pixels, with the offset in spriteSourceSize
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rows = []
+    index = {}
+    written = []
+    for name, sprite in sorted(sprites.items()):
+        entry = {'slots': sprite['slots'], 'colors': len(sprite['entries']), 'images': {}, 'variants': {},
+                 'entries': [[round(float(v), 4) for v in e] for e in sprite['entries']]}
+        images = {suffix: Image.fromarray(sprite['index'][suffix], 'L') for suffix in scales}
+        box = shared_bounds({scale: [images[suffix]] for suffix, scale in scales.items()}, padding)
+        entry.update(trim_info(box, images[''].size))
+        for suffix, scale in scales.items():
+            filename = f"{name}{suffix}.png"
+            crop_scaled(images[suffix], box, scale).save(os.path.join(out_dir, filename))
+            written.append(filename)
+            entry['images'][f"{scale}x"] = filename
+        for variant, colors in sorted(sprite['variants'].items()):
+            entry['variants'][variant] = len(rows)
+            rows.append(palette_row(sprite['entries'], colors))
+        index[name] = entry
+        
+    palettes = np.zeros((max(len(rows), 1), MAX_COLORS, 4), dtype=np.uint8)
+    for i, row in enumerate(rows):
+        palettes[i, :len(row)] = row
+    Image.fromarray(palettes, 'RGBA').save(os.path.join(out_dir, "palettes.png"))
+    written.append("palettes.png")
+    with open(os.path.join(out_dir, "indexed.json"), 'w') as f:
+        json.dump({'palettes': "palettes.png", 'sprites': index}, f, indent=1, sort_keys=True)
+    return written
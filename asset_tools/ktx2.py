@@ -0,0 +1,410 @@
+"""
+Cyber Strike - KTX2 Textures
+Writes sprite sheets as KTX2 files holding every mip level, as raw RGBA8
+or ETC2 blocks, with straight or premultiplied alpha, so the device maps
+the file and uploads it without decoding a PNG. A memory-mapped reader
+validates the layout and hands back zero-copy views of each level
+
+Layout (little-endian, per the Khronos KTX 2.0 specification):
+    0   12s  identifier '«KTX 20»\\r\\n\\x1a\\n'
+    12  u32  vkFormat, typeSize, pixelWidth, pixelHeight, pixelDepth (0),
+             layerCount (0), faceCount (1), levelCount, supercompression (0)
+    48  u32  dfdByteOffset, dfdByteLength, kvdByteOffset, kvdByteLength
+    64  u64  sgdByteOffset, sgdByteLength (0, no supercompression)
+    80       level index: levelCount x (u64 byteOffset, byteLength, uncompressedByteLength), level 0 first
+    dfd      data format descriptor: u32 total size and one basic descriptor block
+    kvd      key/value entries sorted by key: u32 length, key NUL value, padded to 4 bytes
+    levels   mip data, smallest level first, each aligned to lcm(block bytes, 4).
+             Levels are contiguous, so the whole chain is one byte range to map and upload
+"""
+
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import math
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from . import etc2
+from .lod import downsample
+
+IDENTIFIER = b'\xabKTX 20\xbb\r\n\x1a\n'
+HEADER = struct.Struct('<12s9I4I2Q')
+LEVEL = struct.Struct('<3Q')
+
+# Payload formats: Vulkan format (UNORM, SRGB), block size in pixels and bytes,
+# DFD colour model and samples as (bit offset, bit length, channel id)
+FORMATS = {
+    'rgba8': {'vk': (37, 43), 'block': (1, 1), 'bytes': 4, 'model': 1,
+              'samples': [(0, 8, 0), (8, 8, 1), (16, 8, 2), (24, 8, 15)]},
+    'etc2': {'vk': (151, 152), 'block': (4, 4), 'bytes': 16, 'model': 161,
+             'samples': [(0, 64, 15), (64, 64, 2)]},
+}
+
+# DFD constants: BT.709 primaries, linear and sRGB transfer, premultiplied flag,
+# the alpha channel id and the qualifier marking a sample linear in an sRGB format
+DF_PRIMARIES_BT709 = 1
+DF_TRANSFER_LINEAR, DF_TRANSFER_SRGB = 1, 2
+DF_FLAG_PREMULTIPLIED = 1
+DF_CHANNEL_ALPHA = 15
+DF_SAMPLE_LINEAR = 0x10
+
+WRITER = "Cyber Strike asset pipeline"
+
+def _align(value, alignment):
+    return value + -value % alignment
+
+def level_count(size):
+    """Levels in a full mip chain down to 1x1"""
+    return int(math.log2(max(size))) + 1
+
+def level_size(size, level):
+    return max(1, size[0] >> level), max(1, size[1] >> level)
+
+def level_bytes(fmt, size):
+    """Bytes of one level of a format at size"""
+    spec = FORMATS[fmt]
+    bw, bh = spec['block']
+    return -(-size[0] // bw) * -(-size[1] // bh) * spec['bytes']
+
+def mip_chain(img, levels=None, filter='lanczos'):
+    """[img, 1/2, 1/4, ...] down to 1x1 (or levels images), each filtered from img in premultiplied alpha"""
+    levels = levels or level_count(img.size)
+    return [img] + [downsample(img, level_size(img.size, k), filter) for k in range(1, levels)]
+
+def premultiply(img):
+    """RGBA image with colour scaled by alpha, rounded, as the GPU blends premultiplied textures"""
+    arr = np.asarray(img.convert('RGBA'), dtype=np.uint16)
+    rgb = (arr[..., :3] * arr[..., 3:] + 127) // 255
+    return Image.fromarray(np.concatenate([rgb, arr[..., 3:]], axis=2).astype(np.uint8), 'RGBA')
+
+def unpremultiply(img):
+    """Straight-alpha RGBA from a premultiplied image; colour under zero alpha is black"""
+    arr = np.asarray(img.convert('RGBA'), dtype=np.float32)
+    a = arr[..., 3:]
+    rgb = np.clip(arr[..., :3] * np.divide(255, a, out=np.zeros_like(a), where=a > 0), 0, 255)
+    return Image.fromarray(np.concatenate([rgb, a], axis=2).round().astype(np.uint8), 'RGBA')
+
+def encode_levels(images, fmt='rgba8', premultiplied=False, preset='normal'):
+    """Level payloads for a mip chain of straight-alpha RGBA images"""
+    payloads = []
+    for img in images:
+        img = premultiply(img) if premultiplied else img.convert('RGBA')
+        payloads.append(img.tobytes() if fmt == 'rgba8' else etc2.encode(img, preset))
+    return payloads
+
+def _dfd(fmt, premultiplied, srgb):
+    """Data format descriptor bytes: total size, then one basic descriptor block"""
+    spec = FORMATS[fmt]
+    samples = b''
+    for offset, length, channel in spec['samples']:
+        qualifier = DF_SAMPLE_LINEAR if srgb and channel == DF_CHANNEL_ALPHA else 0
+        upper = (1 << length) - 1 if length < 32 else 0xFFFFFFFF
+        samples += struct.pack('<HBB4BII', offset, length - 1, channel | qualifier, 0, 0, 0, 0, 0, upper)
+    bw, bh = spec['block']
+    block = struct.pack('<IHH4B4B8B', 0, 2, 24 + len(samples), spec['model'], DF_PRIMARIES_BT709,
+                        DF_TRANSFER_SRGB if srgb else DF_TRANSFER_LINEAR,
+                        DF_FLAG_PREMULTIPLIED if premultiplied else 0,
+                        bw - 1, bh - 1, 0, 0, spec['bytes'], 0, 0, 0, 0, 0, 0, 0) + samples
+    return struct.pack('<I', 4 + len(block)) + block
+
+def _kvd(meta):
+    """Key/value data bytes, entries sorted by key as the spec requires"""
+    data = b''
+    for key in sorted(meta, key=lambda k: k.encode()):
+        value = meta[key]
+        value = value if isinstance(value, bytes) else str(value).encode() + b'\0'
+        entry = key.encode() + b'\0' + value
+        data += struct.pack('<I', len(entry)) + entry
+        data += b'\0' * (-len(data) % 4)
+    return data
+
+def write_ktx2(path, size, payloads, fmt='rgba8', premultiplied=False, srgb=True, meta=None):
+    """
+    Write level payloads (level 0 first, as from encode_levels) of a size image as a KTX2 file
+    meta adds key/value entries (strings are stored NUL-terminated) next to
+    KTXorientation and KTXwriter; returns the file size
+    """
+    spec = FORMATS[fmt]
+    for k, payload in enumerate(payloads):
+        expected = level_bytes(fmt, level_size(size, k))
+        if len(payload) != expected:
+            raise ValueError(f"Level {k} of {path} is {len(payload)} bytes, expected {expected} for {fmt}")
+    dfd = _dfd(fmt, premultiplied, srgb)
+    kvd = _kvd({'KTXorientation': 'rd', 'KTXwriter': WRITER, **(meta or {})})
+    dfd_offset = HEADER.size + LEVEL.size * len(payloads)
+    kvd_offset = dfd_offset + len(dfd)
+    
+    # Smallest level first, so a streaming loader can show something before the rest arrives
+    alignment = math.lcm(spec['bytes'], 4)
+    offset = kvd_offset + len(kvd)
+    offsets = {}
+    for k in reversed(range(len(payloads))):
+        offset = _align(offset, alignment)
+        offsets[k] = offset
+        offset += len(payloads[k])
+        
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(IDENTIFIER, spec['vk'][srgb], 1, size[0], size[1], 0, 0, 1, len(payloads), 0,
+                            dfd_offset, len(dfd), kvd_offset, len(kvd), 0, 0))
+        for k, payload in enumerate(payloads):
+            f.write(LEVEL.pack(offsets[k], len(payload), len(payload)))
+        f.write(dfd)
+        f.write(kvd)
+        for k in reversed(range(len(payloads))):
+            f.write(b'\0' * (offsets[k] - f.tell()))
+            f.write(payloads[k])
+        return f.tell()
+
+class KTX2File:
+    """
+    A memory-mapped KTX2 file as written by write_ktx2
+    Opening validates the header, level index, descriptor and key/value
+    data against each other and the file size; level() returns zero-copy
+    views onto the mapping and data_range() the one byte range holding
+    every level, ready to upload as is
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+    
+    def _fail(self, message):
+        raise ValueError(f"{self.path}: {message}")
+    
+    def _parse(self):
+        if len(self._map) < HEADER.size:
+            self._fail("too short to be a KTX2 file")
+        (identifier, vk_format, _, width, height, depth, layers, faces, levels, scheme,
+         dfd_offset, dfd_len, kvd_offset, kvd_len, sgd_offset, sgd_len) = HEADER.unpack_from(self._map)
+        if identifier != IDENTIFIER:
+            self._fail("not a KTX2 file")
+        found = [(fmt, srgb) for fmt, spec in FORMATS.items() for srgb in (False, True) if spec['vk'][srgb] == vk_format]
+        if not found:
+            self._fail(f"unsupported vkFormat {vk_format}")
+        self.format, self.srgb = found[0]
+        if depth or layers or faces != 1 or scheme or sgd_len:
+            self._fail("only single 2D images without supercompression are supported")
+        self.size = (width, height)
+        if not 1 <= levels <= level_count(self.size):
+            self._fail(f"{levels} levels is not a valid mip chain for {width}x{height}")
+        if dfd_offset != HEADER.size + LEVEL.size * levels or kvd_offset != dfd_offset + dfd_len:
+            self._fail("descriptor and key/value data are not where the level index ends")
+            
+        # Levels must be aligned, sized for their dimensions and lie after the metadata without overlapping
+        spec = FORMATS[self.format]
+        alignment = math.lcm(spec['bytes'], 4)
+        self.levels = []
+        end = kvd_offset + kvd_len
+        for k in reversed(range(levels)):
+            offset, length, uncompressed = LEVEL.unpack_from(self._map, HEADER.size + LEVEL.size * k)
+            expected = level_bytes(self.format, level_size(self.size, k))
+            if length != expected or uncompressed != expected:
+                self._fail(f"level {k} is {length} bytes, expected {expected}")
+            if offset % alignment or offset < end or offset + length > len(self._map):
+                self._fail(f"level {k} at offset {offset} is misaligned, overlapping or past the end")
+            end = offset + length
+            self.levels.insert(0, (offset, length))
+            
+        self._parse_dfd(dfd_offset, dfd_len)
+        self.meta = self._parse_kvd(kvd_offset, kvd_len)
+    
+    def _parse_dfd(self, offset, length):
+        spec = FORMATS[self.format]
+        total, _, version, block_size = struct.unpack_from('<IIHH', self._map, offset)
+        if total != length or block_size + 4 != length or version != 2:
+            self._fail("malformed data format descriptor")
+        model, _, transfer, flags, bw, bh = struct.unpack_from('<6B', self._map, offset + 12)
+        plane = self._map[offset + 20]
+        if model != spec['model'] or (bw + 1, bh + 1) != spec['block'] or plane != spec['bytes']:
+            self._fail(f"data format descriptor does not describe {self.format}")
+        if transfer != (DF_TRANSFER_SRGB if self.srgb else DF_TRANSFER_LINEAR):
+            self._fail("data format descriptor transfer function does not match vkFormat")
+        self.premultiplied = bool(flags & DF_FLAG_PREMULTIPLIED)
+    
+    def _parse_kvd(self, offset, length):
+        meta = {}
+        pos, end = offset, offset + length
+        while pos < end:
+            (entry_len,) = struct.unpack_from('<I', self._map, pos)
+            entry = bytes(self._map[pos + 4:pos + 4 + entry_len])
+            if pos + 4 + entry_len > end or b'\0' not in entry:
+                self._fail("malformed key/value data")
+            key, value = entry.split(b'\0', 1)
+            key = key.decode()
+            if meta and key.encode() <= list(meta)[-1].encode():
+                self._fail("key/value entries are not sorted by key")
+            meta[key] = value[:-1].decode() if value.endswith(b'\0') else value
+            pos = _align(pos + 4 + entry_len, 4)
+        return meta
+    
+    def close(self):
+        """Release the file; views returned by level() must not be used afterwards"""
+        try:
+            self._map.close()
+        except BufferError:
+            # Views still reference the mapping; it is released with them
+            pass
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __len__(self):
+        return len(self.levels)
+    
+    def data_range(self):
+        """(offset, length) of the bytes holding every level, smallest level first"""
+        start = self.levels[-1][0]
+        return start, self.levels[0][0] + self.levels[0][1] - start
+    
+    def level(self, k):
+        """
+        One level as a uint8 view onto the file: (h, w, 4) pixels for rgba8,
+        (blocks, 16) for block-compressed formats
+        """
+        offset, length = self.levels[k]
+        data = np.frombuffer(self._map, dtype=np.uint8, count=length, offset=offset)
+        if self.format == 'rgba8':
+            w, h = level_size(self.size, k)
+            return data.reshape(h, w, 4)
+        return data.reshape(-1, FORMATS[self.format]['bytes'])
+    
+    def image(self, k=0):
+        """One level decoded to an RGBA image, straight alpha even if stored premultiplied"""
+        size = level_size(self.size, k)
+        if self.format == 'rgba8':
+            img = Image.fromarray(self.level(k).copy(), 'RGBA')
+        else:
+            img = etc2.decode(self.level(k).tobytes(), size)
+        return unpremultiply(img) if self.premultiplied else img
+
+def read_ktx2(path):
+    """Read a whole texture back as (meta, [straight-alpha RGBA image per level])"""
+    with KTX2File(path) as texture:
+        return texture.meta, [texture.image(k) for k in range(len(texture))]
+
+def write_texture(path, fmt='rgba8', premultiplied=False, preset='normal', filter='lanczos', srgb=True):
+    """
+    Write <name>.ktx2 with a full mip chain next to a PNG and validate it
+    The file is read back and each level's bytes compared with what was
+    encoded. Returns (path, PSNR of level 0 against the PNG, KTX2 bytes)
+    """
+    with Image.open(path) as img:
+        original = img.convert('RGBA')
+    payloads = encode_levels(mip_chain(original, filter=filter), fmt, premultiplied, preset)
+    ktx_path = os.path.splitext(path)[0] + '.ktx2'
+    write_ktx2(ktx_path, original.size, payloads, fmt, premultiplied, srgb,
+               {'CyberStrike.source': os.path.basename(path), 'CyberStrike.mipFilter': filter})
+    with KTX2File(ktx_path) as texture:
+        for k, payload in enumerate(payloads):
+            if texture.level(k).tobytes() != payload:
+                raise RuntimeError(f"Level {k} of {ktx_path} does not read back as written")
+        # Premultiplied round-trips lose colour under faint alpha, which psnr does not count
+        quality = etc2.psnr(original, texture.image(0))
+    return path, quality, os.path.getsize(ktx_path)
+
+def write_textures(paths, fmt='rgba8', premultiplied=False, preset='normal', workers=None):
+    """Write KTX2 textures across a process pool; workers=1 runs in-process"""
+    paths = sorted(set(paths))
+    args = [[fmt] * len(paths), [premultiplied] * len(paths), [preset] * len(paths)]
+    if workers == 1 or len(paths) <= 1:
+        return list(map(write_texture, paths, *args))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(write_texture, paths, *args))
+
+def _options(fmt, premultiplied, preset):
+    """Build cache options string for a texture; the ETC2 preset only matters for etc2 payloads"""
+    return f"ktx2 {fmt}{' premultiplied' if premultiplied else ''}{f' {preset}' if fmt == 'etc2' else ''}"
+
+def is_current(path, fmt='rgba8', premultiplied=False, preset='normal', cache=None):
+    """
+    True if the PNG's .ktx2 was made from its current bytes with these options,
+    as the build cache recorded; without a cache, if the .ktx2 is newer than the PNG
+    """
+    ktx_path = os.path.splitext(path)[0] + '.ktx2'
+    if cache is not None:
+        return cache.is_derived(ktx_path, path, _options(fmt, premultiplied, preset))
+    return os.path.exists(ktx_path) and os.path.getmtime(ktx_path) >= os.path.getmtime(path)
+
+def write_stale(paths, fmt='rgba8', premultiplied=False, preset='normal', cache=None, workers=None):
+    """Write the textures whose .ktx2 is missing or out of date (see is_current) and record them in the cache"""
+    stale = [p for p in paths if not is_current(p, fmt, premultiplied, preset, cache)]
+    results = write_textures(stale, fmt, premultiplied, preset, workers)
+    if cache is not None:
+        for path, _, _ in results:
+            cache.mark_derived(os.path.splitext(path)[0] + '.ktx2', path, _options(fmt, premultiplied, preset))
+    return results
+
+def print_report(results, root=None):
+    """Print PSNR and size per texture plus the total"""
+    for path, quality, size in results:
+        name = os.path.relpath(path, root) if root else path
+        print(f"  {name}: {quality:.1f} dB, {size} bytes")
+    if results:
+        total = sum(size for _, _, size in results)
+        print(f"✓ Wrote {len(results)} KTX2 textures: {total} bytes, lowest PSNR "
+              f"{min(quality for _, quality, _ in results):.1f} dB")
+
+def main(argv=None):
+    """Write, inspect or extract KTX2 textures"""
+    parser = argparse.ArgumentParser(description="Write, inspect or extract Cyber Strike KTX2 textures")
+    sub = parser.add_subparsers(dest='command', required=True)
+    write = sub.add_parser('write', help="write a .ktx2 with every mip level next to each RGBA PNG under a directory")
+    write.add_argument('root')
+    write.add_argument('--format', choices=sorted(FORMATS), default='rgba8', help="payload (default: %(default)s)")
+    write.add_argument('--premultiply', action='store_true', help="store premultiplied alpha")
+    write.add_argument('--preset', choices=sorted(etc2.PRESETS), default='normal',
+                       help="ETC2 speed/quality preset (default: %(default)s)")
+    write.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                       help="number of worker processes (default: CPU count, 1 = serial)")
+    info = sub.add_parser('info', help="validate a file and print its format, levels and metadata")
+    info.add_argument('path')
+    extract = sub.add_parser('extract', help="decode one level to a PNG")
+    extract.add_argument('path')
+    extract.add_argument('png')
+    extract.add_argument('--level', type=int, default=0, help="mip level (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    if args.command == 'write':
+        paths = []
+        for dirpath, _, files in os.walk(args.root):
+            for filename in files:
+                if filename.endswith('.png'):
+                    # Indexed sheets hold palette indices, which filtering and compression would corrupt
+                    with Image.open(os.path.join(dirpath, filename)) as img:
+                        if img.mode == 'L':
+                            continue
+                    paths.append(os.path.join(dirpath, filename))
+        results = write_textures(paths, args.format, args.premultiply, args.preset, max(1, args.workers))
+        print_report(results, args.root)
+        return
+        
+    with KTX2File(args.path) as texture:
+        if args.command == 'info':
+            w, h = texture.size
+            alpha = 'premultiplied' if texture.premultiplied else 'straight'
+            print(f"{args.path}: {w}x{h} {texture.format}{' sRGB' if texture.srgb else ''}, {alpha} alpha, "
+                  f"{len(texture)} levels")
+            offset, length = texture.data_range()
+            print(f"  level data: {length} bytes at offset {offset}")
+            for key, value in texture.meta.items():
+                print(f"  {key}: {value if isinstance(value, str) else value.hex()}")
+        else:
+            texture.image(args.level).save(args.png)
+            print(f"✓ Extracted level {args.level} of {args.path} to {args.png}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Cyber Strike - Level-of-Detail Chains
+Pre-filters every sprite at 1/2, 1/4, ... of its size in premultiplied
+alpha and packs each level into its own atlas, so a zoomed-out camera
+samples a texture near its on-screen size instead of the full @3x one
+"""
+
+from PIL import Image
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+from .atlas import load_sprites, write_atlas
+
+# Resampling kernels: weight of a source pixel at an offset in output pixels
+FILTERS = {
+    'box': lambda x: np.where(np.abs(x) < 0.5, 1.0, np.where(np.abs(x) == 0.5, 0.5, 0.0)),
+    'lanczos': lambda x: np.where(np.abs(x) < 3, np.sinc(x) * np.sinc(x / 3), 0.0),
+}
+
+# Levels written when none are asked for: 1/2 and 1/4 cover the camera's zoom range
+LEVELS = 2
+
+def _weights(n_in, n_out, kernel):
+    """(n_out, n_in) resampling matrix, the kernel stretched by the reduction ratio"""
+    ratio = n_in / n_out
+    centers = (np.arange(n_out) + 0.5) * ratio - 0.5
+    w = kernel((np.arange(n_in)[None, :] - centers[:, None]) / ratio).astype(np.float32)
+    return w / w.sum(axis=1, keepdims=True)
+
+def downsample(img, size, filter='lanczos'):
+    """
+    Resample an RGBA image to size in premultiplied alpha
+    Colour is weighted by coverage before filtering and divided back out
+    after, so bright edges fade out instead of darkening towards the
+    black of transparent pixels. Lanczos ringing is clamped
+    """
+    kernel = FILTERS[filter]
+    arr = np.asarray(img.convert('RGBA'), dtype=np.float32)
+    alpha = arr[..., 3:] / 255
+    arr = np.concatenate([arr[..., :3] * alpha, arr[..., 3:]], axis=2)
+    wy = _weights(arr.shape[0], size[1], kernel)
+    wx = _weights(arr.shape[1], size[0], kernel)
+    out = np.einsum('yi,ixc,vx->yvc', wy, arr, wx, optimize=True)
+    a = np.clip(out[..., 3:], 0, 255)
+    rgb = np.clip(out[..., :3], 0, a) * np.divide(255, a, out=np.zeros_like(a), where=a > 0)
+    return Image.fromarray(np.concatenate([rgb, a], axis=2).round().astype(np.uint8), 'RGBA')
+
+def lod_chain(img, levels=LEVELS, filter='lanczos'):
+    """[level 1, level 2, ...] images at 1/2, 1/4, ... of img, each filtered from img itself"""
+    return [downsample(img, (max(1, round(img.width / 2 ** k)), max(1, round(img.height / 2 ** k))), filter)
+            for k in range(1, levels + 1)]
+
+def level_zooms(levels=LEVELS):
+    """
+    Zoom range of each level: level k covers on-screen scales down to
+    2 ** -(k + 0.5), i.e. the level whose texels are nearest to one per pixel
+    """
+    return [{'level': k, 'factor': 1 / 2 ** k,
+             'minZoom': round(2 ** -(k + 0.5), 4) if k < levels else 0}
+            for k in range(levels + 1)]
+
+def lod_for_zoom(zoom, levels=LEVELS):
+    """Level to sample at an on-screen scale (1 = the sprite's point size)"""
+    return next(entry['level'] for entry in level_zooms(levels) if zoom >= entry['minZoom'])
+
+def build_lod_atlases(sprite_dir, out_dir, scales, levels=LEVELS, filter='lanczos', aliases=None, exclude=(),
+                      **pack_args):
+    """
+    Write out_dir/LOD<k>/ atlases of every loose sprite at 1/2 ** k for k in 1..levels
+    plus out_dir/lod.json
+    Each level is packed on its own, so padding keeps neighbours from bleeding
+    at every level; a sheet's meta.scale is the scale's factor times the
+    level's, so frames keep their point size. Returns the written sheets,
+    relative to out_dir. LOD<k> folders beyond levels, left by an earlier
+    build with more levels, are removed
+    """
+    written = []
+    sheets = {k: {} for k in range(1, levels + 1)}
+    exclude = (os.path.abspath(out_dir), *exclude)
+    for suffix, scale in scales.items():
+        sprites = load_sprites(sprite_dir, suffix, scales, exclude=exclude)
+        chains = {name: lod_chain(img, levels, filter) for name, img in sprites.items()}
+        for k in range(1, levels + 1):
+            level_dir = os.path.join(out_dir, f"LOD{k}")
+            files = write_atlas({name: chain[k - 1] for name, chain in chains.items()}, level_dir, 'atlas',
+                                suffix, scale / 2 ** k, aliases, **pack_args)
+            sheets[k][f"{scale}x"] = f"LOD{k}/atlas{suffix}.json"
+            written += [f"LOD{k}/{f}" for f in files]
+            
+    sheets[0] = {f"{scale}x": f"atlas{suffix}.json" for suffix, scale in scales.items()}
+    for name in os.listdir(out_dir):
+        match = re.fullmatch(r'LOD(\d+)', name)
+        if match and int(match.group(1)) > levels:
+            shutil.rmtree(os.path.join(out_dir, name))
+    index = {'filter': filter, 'levels': [{**entry, 'atlases': sheets[entry['level']]} for entry in level_zooms(levels)]}
+    with open(os.path.join(out_dir, "lod.json"), 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    return written
+
+def lod_index_matches(out_dir, levels, filter):
+    """True if out_dir/lod.json exists and was written for this level count and filter"""
+    path = os.path.join(out_dir, "lod.json")
+    if not os.path.exists(path):
+        return False
+    with open(path) as f:
+        index = json.load(f)
+    return index['filter'] == filter and len(index['levels']) == levels + 1
@@ -0,0 +1,162 @@
+"""
+Cyber Strike - Sprite Manifests
+Loads the JSON manifests that declare what each generator builds (generator,
+parameters, size, output path, scales) and selects subsets of them by glob
+or category, and derives the per-sprite random seeds
+"""
+
+import fnmatch
+import hashlib
+import inspect
+import json
+import os
+import random
+
+DEFAULT_SCALES = {'': 1, '@2x': 2, '@3x': 3}
+
+def scale_map(scales):
+    """{suffix: scale} from such a dict or from a list of scale factors (1 -> '', 2 -> '@2x', ...)"""
+    if isinstance(scales, dict):
+        return dict(scales)
+    return {('' if scale == 1 else f"@{scale}x"): scale for scale in scales}
+
+def _check(condition, path, message):
+    if not condition:
+        raise ValueError(f"Manifest {path}: {message}")
+
+def load_manifest(path, headings=None):
+    """
+    Read and validate a manifest
+    'sprites' entries name one sprite each; 'generators' entries name a
+    function that writes a group of sprites into one output folder.
+    Animations are expanded into one sprite entry per frame, with the
+    frame's normalised time passed as the 't' parameter, and rotations
+    into one entry per heading of the sprite they name (Rotations/<sprite>_<i>,
+    'heading' parameter in degrees clockwise; headings overrides every
+    rotation's heading count). 'indexed' entries name a sprite whose
+    colour slot parameters are swapped per palette variant. Every entry gets
+    a category (default: the first folder of its output path), and a
+    relative output_dir is resolved against the manifest's own folder.
+    'seed' (default 0) is the base of every sprite's random seed; a
+    generator entry may override it with its own
+    """
+    with open(path) as f:
+        manifest = json.load(f)
+    _check(isinstance(manifest, dict), path, "expected a JSON object")
+    manifest.setdefault('scales', dict(DEFAULT_SCALES))
+    _check('' in manifest['scales'], path, "scales must include the 1x suffix \"\"")
+    manifest.setdefault('seed', 0)
+    _check(isinstance(manifest['seed'], int), path, "seed must be an integer")
+    if 'output_dir' in manifest:
+        base = os.path.dirname(os.path.abspath(path))
+        manifest['output_dir'] = os.path.normpath(os.path.join(base, manifest['output_dir']))
+        
+    sprites = manifest.setdefault('sprites', [])
+    for name, anim in manifest.setdefault('animations', {}).items():
+        for key in ('folder', 'generator', 'size', 'frames'):
+            _check(key in anim, path, f"animation {name} has no '{key}'")
+        anim.setdefault('fps', 12)
+        anim['frame_names'] = [f"{anim['folder']}/{name}_{frame}" for frame in range(anim['frames'])]
+        for frame, frame_name in enumerate(anim['frame_names']):
+            sprites.append({
+                'name': frame_name,
+                'generator': anim['generator'],
+                'size': anim['size'],
+                'params': {**anim.get('params', {}), 't': frame / anim['frames']},
+                'category': anim.get('category', anim['folder'].split('/')[0]),
+            })
+            
+    by_name = {entry.get('name'): entry for entry in sprites}
+    for name, rot in manifest.setdefault('rotations', {}).items():
+        _check(rot.get('sprite') in by_name, path, f"rotation {name} names unknown sprite {rot.get('sprite')!r}")
+        base = by_name[rot['sprite']]
+        rot['headings'] = headings or rot.get('headings', 32)
+        _check(rot['headings'] >= 1, path, f"rotation {name} needs at least one heading")
+        rot['frame_names'] = [f"Rotations/{rot['sprite']}_{i}" for i in range(rot['headings'])]
+        for i, frame_name in enumerate(rot['frame_names']):
+            sprites.append({
+                'name': frame_name,
+                'generator': base['generator'],
+                'size': base['size'],
+                'params': {**base.get('params', {}), 'heading': 360 * i / rot['headings']},
+                'category': base.get('category', rot['sprite'].split('/')[0]),
+            })
+            
+    for name, spec in manifest.setdefault('indexed', {}).items():
+        _check(spec.get('sprite') in by_name, path, f"indexed sprite {name} names unknown sprite {spec.get('sprite')!r}")
+        for key in ('slots', 'variants'):
+            _check(spec.get(key), path, f"indexed sprite {name} has no '{key}'")
+            
+    for entry in sprites:
+        for key in ('name', 'generator', 'size'):
+            _check(key in entry, path, f"sprite entry {entry} has no '{key}'")
+        entry.setdefault('params', {})
+        entry.setdefault('category', entry['name'].split('/')[0])
+    for entry in manifest.setdefault('generators', []):
+        for key in ('generator', 'output'):
+            _check(key in entry, path, f"generator entry {entry} has no '{key}'")
+        entry.setdefault('sprites', [])
+        entry.setdefault('category', entry['output'].split('/')[0])
+        entry.setdefault('seed', manifest['seed'])
+        _check(isinstance(entry['seed'], int), path, f"generator entry {entry['generator']} has a non-integer seed")
+    return manifest
+
+def entry_names(entry):
+    """Sprite names an entry produces, relative to the output directory"""
+    if 'output' in entry:
+        return [f"{entry['output']}/{sprite}" for sprite in entry['sprites']] or [entry['output']]
+    return [entry['name']]
+
+def select(entries, patterns=None, categories=None):
+    """
+    Entries matching any of the glob patterns (over sprite names, e.g.
+    'Enemies/*') and any of the categories; None or empty means no filter
+    """
+    wanted = {c.lower() for c in categories or ()}
+    selected = []
+    for entry in entries:
+        if wanted and entry['category'].lower() not in wanted:
+            continue
+        if patterns and not any(fnmatch.fnmatch(name, pattern)
+                                for name in entry_names(entry) for pattern in patterns):
+            continue
+        selected.append(entry)
+    return selected
+
+def resolve_generator(namespace, name, prefix):
+    """Look up a generator function by name; only names starting with prefix are allowed"""
+    fn = namespace.get(name)
+    if not name.startswith(prefix) or not callable(fn):
+        raise ValueError(f"Unknown generator '{name}' (expected a {prefix}* function)")
+    return fn
+
+def sprite_seed(seed, name):
+    """
+    64-bit seed for one sprite from the manifest seed and the sprite name
+    Hashed rather than hash()ed, so it is the same in every process and on
+    every worker; feed it to random.Random or np.random.default_rng
+    """
+    digest = hashlib.sha256(f"{seed}:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+def sprite_rng(seed, name):
+    """random.Random private to one sprite (see sprite_seed)"""
+    return random.Random(sprite_seed(seed, name))
+
+def resolve_params(params, palette):
+    """Replace {"color": name} parameter values with the palette colour"""
+    resolved = {}
+    for key, value in params.items():
+        if isinstance(value, dict) and set(value) == {'color'}:
+            if value['color'] not in palette:
+                raise ValueError(f"Unknown palette colour '{value['color']}' for parameter {key}")
+            value = palette[value['color']]
+        resolved[key] = value
+    return resolved
+
+def bind_args(fn, size, params):
+    """Positional argument tuple for fn(size, **params), so equal calls compare equal"""
+    try:
+        return inspect.signature(fn).bind(tuple(size), **params).args
+    except TypeError as e:
+        raise ValueError(f"Bad parameters for {fn.__name__}: {e}") from None
@@ -0,0 +1,284 @@
+"""
+Cyber Strike - Map Files
+Chunked binary tile map format built for mmap: a fixed header, JSON
+metadata, a chunk index and fixed-size chunk records, so the game and the
+Python tools can map the file and use any chunk in place without copying
+
+Layout (little-endian):
+    0   4s   magic 'CSTM'
+    4   u16  version (2)
+    6   u16  chunk size in tiles (n)
+    8   u32  width in tiles
+    12  u32  height in tiles
+    16  u16  layer count (L)
+    18  u16  reserved
+    20  u32  metadata length
+    24  u64  index offset
+    32  u64  data offset (page aligned)
+    40       metadata, UTF-8 JSON ({"layers": [names], ...})
+    index    chunks_x * chunks_y u64 byte offsets in row-major chunk order;
+             0 marks an empty chunk (every tile 0) that takes no space
+    data     chunk records, each CHUNK_ALIGN aligned: L layers of n x n
+             uint16 tiles, row-major; tiles past the map edge are 0
+"""
+
+from PIL import Image
+import argparse
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'CSTM'
+VERSION = 2
+
+# Tiles per chunk edge: 20 x 64pt tiles match LevelGenerator.swift's 1280pt chunks
+CHUNK_TILES = 20
+
+HEADER = struct.Struct('<4sHHIIHHIQQ')
+
+# Chunk records start on cache-line boundaries and the data region on a page boundary
+CHUNK_ALIGN = 64
+PAGE_SIZE = 4096
+
+def _align(value, alignment):
+    return value + -value % alignment
+
+def _chunk_stride(layer_count, chunk):
+    return _align(layer_count * chunk * chunk * 2, CHUNK_ALIGN)
+
+def write_map(path, layers, meta=None, chunk=CHUNK_TILES):
+    """
+    Write {layer name: (height, width) uint16 array} as a chunked map file
+    meta is stored as JSON alongside the layer names; returns the file size
+    """
+    names = list(layers)
+    stack = np.stack([np.asarray(layers[n], dtype=np.uint16) for n in names])
+    _, h, w = stack.shape
+    cols, rows = -(-w // chunk), -(-h // chunk)
+    padded = np.zeros((len(names), rows * chunk, cols * chunk), dtype='<u2')
+    padded[:, :h, :w] = stack
+    # (layer, row, y, col, x) -> (row * col, layer * y * x): one record per chunk
+    chunks = padded.reshape(len(names), rows, chunk, cols, chunk).transpose(1, 3, 0, 2, 4)
+    chunks = chunks.reshape(rows * cols, -1)
+    filled = np.flatnonzero(chunks.any(axis=1))
+    
+    meta_bytes = json.dumps({'layers': names, **(meta or {})}, sort_keys=True).encode()
+    index_offset = _align(HEADER.size + len(meta_bytes), 8)
+    data_offset = _align(index_offset + rows * cols * 8, PAGE_SIZE)
+    stride = _chunk_stride(len(names), chunk)
+    index = np.zeros(rows * cols, dtype='<u8')
+    index[filled] = data_offset + np.arange(len(filled), dtype=np.uint64) * stride
+    records = np.zeros((len(filled), stride // 2), dtype='<u2')
+    records[:, :chunks.shape[1]] = chunks[filled]
+    
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, chunk, w, h, len(names), 0, len(meta_bytes),
+                            index_offset, data_offset))
+        f.write(meta_bytes)
+        f.seek(index_offset)
+        f.write(index.tobytes())
+        f.seek(data_offset)
+        f.write(records.tobytes())
+        f.truncate()
+        return f.tell()
+
+class MapFile:
+    """
+    A memory-mapped map file
+    chunk() returns NumPy views straight onto the mapping, so reading a
+    chunk costs no copy and only the pages touched are loaded. Opened
+    with writable=True, writes to those views go to the file; empty
+    chunks are given storage at the end of the file when first written
+    """
+    
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        self._file = open(path, 'r+b' if writable else 'rb')
+        self._maps = []
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a map file")
+        (magic, version, self.chunk_size, self.width, self.height, layer_count, _,
+         meta_len, self._index_offset, self._data_offset) = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Cyber Strike map file (magic {magic!r})")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported map file version {version}")
+        self.meta = json.loads(self._file.read(meta_len))
+        self.layers = self.meta['layers']
+        if len(self.layers) != layer_count:
+            raise ValueError(f"{path}: header lists {layer_count} layers, metadata {len(self.layers)}")
+        self.chunks_x = -(-self.width // self.chunk_size)
+        self.chunks_y = -(-self.height // self.chunk_size)
+        self._stride = _chunk_stride(layer_count, self.chunk_size)
+        self._empty = np.zeros((layer_count, self.chunk_size, self.chunk_size), dtype='<u2')
+        self._empty.flags.writeable = False
+        self._remap()
+    
+    def _remap(self):
+        # Earlier mappings stay open while views onto them may still be in use
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self._map = mmap.mmap(self._file.fileno(), 0, access=access)
+        self._maps.append(self._map)
+        self.index = np.frombuffer(self._map, dtype='<u8', count=self.chunks_x * self.chunks_y,
+                                   offset=self._index_offset).reshape(self.chunks_y, self.chunks_x)
+    
+    def close(self):
+        """Flush edits and release the file; views returned by chunk() must not be used afterwards"""
+        self.index = None
+        for m in self._maps:
+            if self.writable:
+                m.flush()
+            try:
+                m.close()
+            except BufferError:
+                # Views still reference this mapping; it is released with them
+                pass
+        self._maps = []
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _check_chunk(self, cx, cy):
+        if not (0 <= cx < self.chunks_x and 0 <= cy < self.chunks_y):
+            raise IndexError(f"Chunk ({cx}, {cy}) is outside the {self.chunks_x}x{self.chunks_y} chunk grid")
+    
+    def _allocate(self, cx, cy):
+        """Give an empty chunk a zeroed record at the end of the file"""
+        self._file.seek(0, os.SEEK_END)
+        offset = _align(self._file.tell(), CHUNK_ALIGN)
+        self._file.truncate(offset + self._stride)
+        self._map.flush()
+        self._remap()
+        self.index[cy, cx] = offset
+        return offset
+    
+    def chunk_array(self, cx, cy, create=False):
+        """
+        One chunk as a (layers, n, n) uint16 view onto the file
+        Empty chunks read as shared read-only zeros unless create is set on a
+        writable file, which allocates them
+        """
+        self._check_chunk(cx, cy)
+        offset = int(self.index[cy, cx])
+        if offset == 0:
+            if not (create and self.writable):
+                return self._empty
+            offset = self._allocate(cx, cy)
+        n = self.chunk_size
+        return np.frombuffer(self._map, dtype='<u2', count=len(self.layers) * n * n,
+                             offset=offset).reshape(len(self.layers), n, n)
+    
+    def chunk(self, cx, cy, create=False):
+        """One chunk as {layer name: (n, n) uint16 view}"""
+        return dict(zip(self.layers, self.chunk_array(cx, cy, create)))
+    
+    def filled_chunks(self):
+        """(cx, cy) of every chunk that has storage"""
+        cy, cx = np.nonzero(self.index)
+        return list(zip(cx.tolist(), cy.tolist()))
+    
+    def _locate(self, x, y):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Tile ({x}, {y}) is outside the {self.width}x{self.height} map")
+        n = self.chunk_size
+        return x // n, y // n, x % n, y % n
+    
+    def tile(self, x, y):
+        """{layer name: tile} at one map position"""
+        cx, cy, tx, ty = self._locate(x, y)
+        data = self.chunk_array(cx, cy)
+        return {name: int(data[i, ty, tx]) for i, name in enumerate(self.layers)}
+    
+    def set_tile(self, x, y, layer, value):
+        """Write one tile in place (file must be writable)"""
+        if not self.writable:
+            raise PermissionError(f"{self.path} was opened read-only")
+        cx, cy, tx, ty = self._locate(x, y)
+        if value == 0 and self.index[cy, cx] == 0:
+            return
+        self.chunk_array(cx, cy, create=True)[self.layers.index(layer), ty, tx] = value
+    
+    def region(self, x, y, w, h):
+        """Copy of the tiles in a rectangle as {layer name: (h, w) uint16 array}; only overlapping chunks are read"""
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        x, y = max(x, 0), max(y, 0)
+        out = np.zeros((len(self.layers), max(y1 - y, 0), max(x1 - x, 0)), dtype=np.uint16)
+        n = self.chunk_size
+        for cy in range(y // n, -(-y1 // n)):
+            for cx in range(x // n, -(-x1 // n)):
+                if self.index[cy, cx] == 0:
+                    continue
+                data = self.chunk_array(cx, cy)
+                sx0, sy0 = max(x, cx * n), max(y, cy * n)
+                sx1, sy1 = min(x1, (cx + 1) * n), min(y1, (cy + 1) * n)
+                out[:, sy0 - y:sy1 - y, sx0 - x:sx1 - x] = data[:, sy0 - cy * n:sy1 - cy * n,
+                                                                sx0 - cx * n:sx1 - cx * n]
+        return dict(zip(self.layers, out))
+    
+    def histogram(self):
+        """{layer name: {tile: count}}, read one row of chunks at a time"""
+        counts = np.zeros((len(self.layers), 1 << 16), dtype=np.int64)
+        for y in range(0, self.height, self.chunk_size):
+            rows = self.region(0, y, self.width, self.chunk_size)
+            for i, name in enumerate(self.layers):
+                counts[i] += np.bincount(rows[name].ravel(), minlength=1 << 16)
+        return {name: {int(t): int(c[t]) for t in np.flatnonzero(c)} for name, c in zip(self.layers, counts)}
+
+def read_map(path):
+    """Read a whole map back as (meta, {layer name: (height, width) uint16 array})"""
+    with MapFile(path) as level:
+        return level.meta, level.region(0, 0, level.width, level.height)
+
+def main(argv=None):
+    """Inspect or edit a map file in place"""
+    parser = argparse.ArgumentParser(description="Inspect or edit a Cyber Strike map file without loading it")
+    sub = parser.add_subparsers(dest='command', required=True)
+    info = sub.add_parser('info', help="print size, chunk layout and metadata")
+    info.add_argument('path')
+    info.add_argument('--histogram', action='store_true', help="also count tiles per layer")
+    get = sub.add_parser('get', help="print the tiles at X Y")
+    get.add_argument('path')
+    get.add_argument('x', type=int)
+    get.add_argument('y', type=int)
+    put = sub.add_parser('set', help="write TILE to LAYER at X Y")
+    put.add_argument('path')
+    put.add_argument('x', type=int)
+    put.add_argument('y', type=int)
+    put.add_argument('layer')
+    put.add_argument('tile', type=int)
+    crop = sub.add_parser('preview', help="write a region of the first layer as a grayscale PNG of tile IDs")
+    crop.add_argument('path')
+    crop.add_argument('png')
+    crop.add_argument('--region', type=int, nargs=4, metavar=('X', 'Y', 'W', 'H'))
+    args = parser.parse_args(argv)
+    
+    with MapFile(args.path, writable=args.command == 'set') as level:
+        if args.command == 'info':
+            print(f"{args.path}: {level.width}x{level.height} tiles, layers {', '.join(level.layers)}")
+            print(f"  {level.chunks_x}x{level.chunks_y} chunks of {level.chunk_size}x{level.chunk_size}, "
+                  f"{len(level.filled_chunks())} stored, {os.path.getsize(args.path)} bytes")
+            print(f"  meta: {json.dumps({k: v for k, v in level.meta.items() if k != 'layers'})[:200]}")
+            if args.histogram:
+                for name, counts in level.histogram().items():
+                    print(f"  {name}: {counts}")
+        elif args.command == 'get':
+            print(level.tile(args.x, args.y))
+        elif args.command == 'set':
+            level.set_tile(args.x, args.y, args.layer, args.tile)
+            print(f"✓ {args.layer} ({args.x}, {args.y}) = {args.tile}")
+        else:
+            x, y, w, h = args.region or (0, 0, level.width, level.height)
+            tiles = level.region(x, y, w, h)[level.layers[0]]
+            Image.fromarray((tiles & 0xFF).astype(np.uint8), 'L').save(args.png)
+
+if __name__ == "__main__":
+    main()
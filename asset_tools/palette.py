@@ -0,0 +1,162 @@
+"""
+Cyber Strike - Shared Palette
+The one colour table both generators draw from, and a NumPy checker that
+histograms rendered sprites and flags colours that drifted off it
+"""
+
+from PIL import Image
+import argparse
+import os
+import sys
+
+import numpy as np
+
+# Cyberpunk color palette
+PALETTE = {
+    'black': (0, 0, 0),           # Pure black
+    'bg': (15, 15, 25),           # Deep dark blue-black
+    'bg_light': (25, 25, 40),     # Slightly lighter bg
+    'cyan': (0, 255, 255),        # Neon cyan
+    'cyan_dark': (0, 180, 200),   # Darker cyan
+    'pink': (255, 0, 128),        # Hot pink
+    'pink_dark': (200, 0, 100),   # Darker pink
+    'purple': (180, 0, 255),      # Purple
+    'purple_dark': (120, 0, 180), # Dark purple
+    'green': (0, 255, 100),       # Neon green
+    'yellow': (255, 220, 0),      # Yellow
+    'orange': (255, 140, 0),      # Orange
+    'red': (255, 50, 50),         # Red
+    'red_dark': (180, 30, 30),    # Dark red
+    'white': (255, 255, 255),     # White
+    'gray': (120, 120, 130),      # Gray
+    'gray_dark': (60, 60, 70),    # Dark gray
+    'gray_light': (180, 180, 190),# Light gray
+    'building': (40, 45, 60),     # Building base
+    'building_dark': (25, 30, 45),# Dark building
+    'window': (100, 220, 255),    # Lit window
+    'window_dark': (40, 50, 70),  # Unlit window
+    'metal': (80, 85, 95),        # Metal
+    'metal_dark': (50, 55, 65),   # Dark metal
+    'glass': (150, 200, 255, 180),# Translucent canopy glass
+    'slum_wall': (40, 35, 30),    # Rundown brick
+    'sky_night_top': (5, 5, 20),
+    'sky_night_bottom': (20, 20, 45),
+    'sky_dusk_top': (40, 20, 60),
+    'sky_dusk_bottom': (120, 60, 80),
+    'sky_storm_top': (15, 20, 25),
+    'sky_storm_bottom': (40, 45, 55),
+}
+
+# Off-palette colours within this many levels (largest channel difference)
+# of a palette colour count as drift rather than shading or blending
+NEAR = 16
+
+# Pixels a drifted colour must cover in one image before it is reported
+MIN_PIXELS = 8
+
+# Colours within this many levels of a mix of two palette colours are
+# blends (anti-aliasing, glows, translucent overlays), not drift
+BLEND_TOLERANCE = 1.5
+
+def named(mapping):
+    """{local name: palette colour} for a generator that keeps its own colour names"""
+    missing = sorted(set(mapping.values()) - set(PALETTE))
+    if missing:
+        raise KeyError(f"Not in the shared palette: {', '.join(missing)}")
+    return {local: PALETTE[name] for local, name in mapping.items()}
+
+def _pack(rgb):
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+def _blend_distance(rgb, table):
+    """Distance from each colour to the nearest mix of two palette colours"""
+    i, j = np.triu_indices(len(table), 1)
+    start = table[i].astype(np.float32)
+    span = table[j].astype(np.float32) - start
+    offset = rgb[:, None, :].astype(np.float32) - start[None]
+    t = np.clip((offset * span).sum(axis=2) / (span * span).sum(axis=1), 0, 1)
+    return np.abs(offset - t[..., None] * span).max(axis=2).min(axis=1)
+
+def check_image(img, palette=PALETTE, near=NEAR, min_pixels=MIN_PIXELS):
+    """
+    Histogram one image's visible colours against the palette
+    Colours are compared unpremultiplied, so anti-aliased edges and glows
+    of a palette colour count as on palette. Returns {'pixels': visible
+    pixels, 'off_palette': visible pixels of no palette colour, 'drift':
+    [(rgb, pixels, nearest palette name, distance)]}. Drift lists the
+    off-palette colours that sit close to a palette colour, cover at
+    least min_pixels and are no blend of two palette colours - the
+    near-duplicates a hard-coded colour leaves - most common first
+    """
+    arr = np.asarray(img.convert('RGBA') if isinstance(img, Image.Image) else img)
+    visible = arr[arr[..., 3] > 0][:, :3]
+    colors, counts = np.unique(_pack(visible), return_counts=True)
+    names = list(palette)
+    table = np.array([palette[n][:3] for n in names], dtype=np.int16)
+    off = ~np.isin(colors, _pack(table))
+    report = {'pixels': len(visible), 'off_palette': int(counts[off].sum()), 'drift': []}
+    
+    candidates = off & (counts >= min_pixels)
+    rgb = np.stack([colors[candidates] >> 16, (colors[candidates] >> 8) & 255, colors[candidates] & 255],
+                   axis=1).astype(np.int16)
+    if not len(rgb):
+        return report
+    distance = np.abs(rgb[:, None, :] - table[None, :, :]).max(axis=2)
+    nearest = distance.argmin(axis=1)
+    nearest_distance = distance[np.arange(len(rgb)), nearest]
+    drifted = nearest_distance <= near
+    drifted[drifted] = _blend_distance(rgb[drifted], table) > BLEND_TOLERANCE
+    report['drift'] = sorted(((tuple(int(c) for c in rgb[i]), int(counts[candidates][i]), names[nearest[i]],
+                               int(nearest_distance[i])) for i in np.flatnonzero(drifted)),
+                             key=lambda d: -d[1])
+    return report
+
+def check_images(images, palette=PALETTE, near=NEAR, min_pixels=MIN_PIXELS):
+    """check_image over {name: image}, keeping only the names with drift"""
+    reports = {name: check_image(img, palette, near, min_pixels) for name, img in images.items()}
+    return {name: report for name, report in reports.items() if report['drift']}
+
+def check_files(paths, palette=PALETTE, near=NEAR, min_pixels=MIN_PIXELS):
+    """check_images over PNG files, keyed by path; greyscale index images are skipped"""
+    reports = {}
+    for path in paths:
+        with Image.open(path) as img:
+            if img.mode == 'L':
+                continue
+            report = check_image(img, palette, near, min_pixels)
+        if report['drift']:
+            reports[path] = report
+    return reports
+
+def print_report(reports, checked, root=None, limit=3):
+    """Print each drifting image's worst colours plus a total"""
+    for path, report in sorted(reports.items()):
+        name = os.path.relpath(path, root) if root else path
+        colors = ", ".join(f"{rgb} x{pixels} ~{nearest}" for rgb, pixels, nearest, _ in report['drift'][:limit])
+        more = len(report['drift']) - limit
+        print(f"  {name}: {colors}" + (f" (+{more} more)" if more > 0 else ""))
+    status = "⚠️" if reports else "✓"
+    print(f"{status} Palette check: {len(reports)} of {checked} images use near-duplicate colours")
+
+def main(argv=None):
+    """Check every PNG under a directory against the shared palette"""
+    parser = argparse.ArgumentParser(description="Flag near-duplicate colours that drifted off the shared palette")
+    parser.add_argument('root', help="directory to scan for PNGs")
+    parser.add_argument('--near', type=int, default=NEAR,
+                        help="largest channel difference still counted as drift (default: %(default)s)")
+    parser.add_argument('--min-pixels', type=int, default=MIN_PIXELS,
+                        help="pixels a colour must cover to be reported (default: %(default)s)")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 if any image drifts")
+    args = parser.parse_args(argv)
+    
+    paths = sorted(os.path.join(dirpath, f)
+                   for dirpath, _, files in os.walk(args.root)
+                   for f in files if f.endswith('.png'))
+    reports = check_files(paths, near=args.near, min_pixels=args.min_pixels)
+    print_report(reports, len(paths), args.root)
+    if args.strict and reports:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Cyber Strike - PNG Optimiser
+Losslessly re-encodes generated PNGs: exact palettes when the colour count
+allows, metadata stripped, and the smallest zlib strategy kept per image
+"""
+
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import io
+import os
+
+import numpy as np
+
+# zlib strategies accepted by Pillow's PNG encoder as compress_type
+ZLIB_STRATEGIES = {
+    'default': 0,
+    'filtered': 1,
+    'huffman': 2,
+    'rle': 3,
+    'fixed': 4,
+}
+
+def exact_palette(rgba):
+    """
+    Convert an RGBA image to an equivalent 'P' image if it has at most 256
+    distinct colours, else return None
+    No colour is merged, so the result decodes back to the same pixels
+    """
+    arr = np.ascontiguousarray(np.asarray(rgba))
+    packed = arr.view(np.uint32).reshape(-1)
+    # Packed little-endian, so colours sort by alpha first: translucent
+    # entries come first and the tRNS chunk can stop at the last of them
+    colors, indices = np.unique(packed, return_inverse=True)
+    if len(colors) > 256:
+        return None
+        
+    palette = colors.view(np.uint8).reshape(-1, 4)
+    img = Image.fromarray(indices.astype(np.uint8).reshape(arr.shape[:2]), 'P')
+    img.putpalette(palette[:, :3].tobytes())
+    translucent = np.flatnonzero(palette[:, 3] < 255)
+    if len(translucent):
+        img.info['transparency'] = palette[:translucent[-1] + 1, 3].tobytes()
+    return img
+
+def candidate_images(img):
+    """Lossless pixel layouts worth encoding: exact palette, RGB when fully opaque, RGBA"""
+    # Rebuilding from raw pixels drops text chunks, ICC profiles and other metadata
+    rgba = Image.frombytes('RGBA', img.size, img.convert('RGBA').tobytes())
+    candidates = [rgba]
+    if rgba.getchannel('A').getextrema()[0] == 255:
+        candidates.append(rgba.convert('RGB'))
+    palette = exact_palette(rgba)
+    if palette is not None:
+        candidates.append(palette)
+    return candidates
+
+def encode_smallest(img):
+    """
+    Encode the candidate layouts with each zlib strategy and return the smallest PNG bytes
+    Palette images are cheap to encode, so they get every strategy at levels 9
+    and 6 (lazy matching at 6 sometimes wins on flat sprites). Truecolour
+    encodes cost several times more and, once an exact palette exists,
+    only ever win with the default strategy, so that is all they get then
+    """
+    candidates = candidate_images(img)
+    has_palette = any(c.mode == 'P' for c in candidates)
+    best = None
+    for candidate in candidates:
+        if candidate.mode == 'P':
+            settings = [(level, s) for level in (9, 6) for s in ZLIB_STRATEGIES.values()]
+        elif has_palette:
+            settings = [(9, ZLIB_STRATEGIES['default'])]
+        else:
+            settings = [(9, s) for s in ZLIB_STRATEGIES.values()]
+        for level, strategy in settings:
+            buf = io.BytesIO()
+            candidate.save(buf, 'PNG', compress_level=level, compress_type=strategy)
+            if best is None or buf.tell() < len(best):
+                best = buf.getvalue()
+    return best
+
+def optimize_file(path):
+    """
+    Rewrite one PNG in place if a smaller lossless encoding exists
+    Returns (path, bytes before, bytes after)
+    """
+    before = os.path.getsize(path)
+    with Image.open(path) as img:
+        original = img.convert('RGBA')
+    data = encode_smallest(original)
+    if len(data) >= before:
+        return path, before, before
+        
+    with Image.open(io.BytesIO(data)) as check:
+        if check.convert('RGBA').tobytes() != original.tobytes():
+            raise RuntimeError(f"Optimised PNG for {path} does not decode to the same pixels")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path, before, len(data)
+
+def optimize_files(paths, workers=None):
+    """Optimise PNGs across a process pool; workers=1 runs in-process"""
+    paths = sorted(set(paths))
+    if workers == 1 or len(paths) <= 1:
+        return [optimize_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(optimize_file, paths))
+
+def optimize_stale(paths, cache=None, workers=None):
+    """
+    Optimise the PNGs a build cache has not recorded as optimised at their current bytes
+    Files rewritten since, or never optimised, are redone; without a cache every path is
+    """
+    paths = [p for p in paths if cache is None or not cache.is_derived(p, p, 'optimize')]
+    results = optimize_files(paths, workers)
+    if cache is not None:
+        for path, _, _ in results:
+            cache.mark_derived(path, path, 'optimize')
+    return results
+
+def print_report(results, root=None):
+    """Print bytes saved per asset plus a total"""
+    total_before = total_after = 0
+    for path, before, after in results:
+        total_before += before
+        total_after += after
+        name = os.path.relpath(path, root) if root else path
+        if after < before:
+            print(f"  {name}: {before} -> {after} bytes (-{100 * (before - after) / before:.1f}%)")
+    saved = total_before - total_after
+    percent = 100 * saved / total_before if total_before else 0
+    print(f"✓ Optimised {len(results)} PNGs: {total_before} -> {total_after} bytes, saved {saved} ({percent:.1f}%)")
+
+def main(argv=None):
+    """Optimise every PNG under a directory"""
+    parser = argparse.ArgumentParser(description="Losslessly shrink PNG files")
+    parser.add_argument('root', help="directory to scan for PNGs")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: CPU count, 1 = serial)")
+    args = parser.parse_args(argv)
+    
+    paths = [os.path.join(dirpath, f)
+             for dirpath, _, files in os.walk(args.root)
+             for f in files if f.endswith('.png')]
+    print_report(optimize_files(paths, max(1, args.workers)), args.root)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Cyber Strike - Drawing Profiler
+Opt-in per-primitive instrumentation: counts and times every Canvas drawing
+call, alpha composite, distance field and PNG encode, attributes it to the
+sprite being built, and reports collapsed stacks for flame graphs
+"""
+
+from PIL import Image
+from contextlib import contextmanager, nullcontext
+import functools
+import os
+import time
+
+from . import glow
+from .canvas import Canvas
+
+# Canvas methods timed as primitives
+CANVAS_PRIMITIVES = [
+    'ellipse', 'rectangle', 'rounded_rectangle', 'polygon', 'line',
+    'blend_ellipse', 'blend_rectangle',
+    'glow_circle', 'glow_ellipse', 'glow_capsule', 'glow_polyline',
+    'linear_gradient', 'copy',
+]
+
+# Lower-level calls timed inside the primitives: (owner, attribute, frame name)
+INNER_CALLS = [
+    (Image.Image, 'alpha_composite', 'alpha_composite'),
+    (Image.Image, 'save', 'png_encode'),
+    (glow, 'ellipse_distance', 'distance_field'),
+    (glow, 'polyline_distance', 'distance_field'),
+]
+
+# Frame name for time inside a sprite that no instrumented call accounts for
+UNTRACKED = '(python)'
+
+class Profiler:
+    """
+    Collects call counts and self time per call stack
+    Stacks are tuples (sprite, frame, ...). Time recorded while no sprite
+    is named is held back and attributed to the next claim()
+    """
+    
+    def __init__(self):
+        self.samples = {}
+        self._pending = {}
+        self._stack = []
+        self._child_time = []
+        self._tracked = 0.0
+    
+    def call(self, frame, func, args, kwargs):
+        """Run func(*args, **kwargs) as a frame on the current stack"""
+        self._stack.append(frame)
+        self._child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            sample = self._pending.setdefault(tuple(self._stack), [0, 0.0])
+            sample[0] += 1
+            sample[1] += elapsed - self._child_time.pop()
+            self._stack.pop()
+            if self._child_time:
+                self._child_time[-1] += elapsed
+            else:
+                self._tracked += elapsed
+    
+    def claim(self, sprite):
+        """Attribute everything recorded since the last claim to sprite"""
+        for stack, (calls, seconds) in self._pending.items():
+            self.add((sprite,) + stack, calls, seconds)
+        self._pending = {}
+    
+    def add(self, stack, calls, seconds):
+        sample = self.samples.setdefault(stack, [0, 0.0])
+        sample[0] += calls
+        sample[1] += seconds
+    
+    def merge(self, samples, root=None):
+        """
+        Fold in samples collected by another profiler (e.g. a worker process)
+        Sprite names that are absolute paths are made relative to root if given
+        """
+        for stack, (calls, seconds) in samples.items():
+            if root is not None and os.path.isabs(stack[0]):
+                stack = (os.path.relpath(stack[0], root),) + stack[1:]
+            self.add(stack, calls, seconds)
+    
+    @contextmanager
+    def sprite(self, name):
+        """Attribute work inside the block to sprite name, including untracked Python time"""
+        self.claim(name)
+        tracked = self._tracked
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.claim(name)
+            self.add((name, UNTRACKED), 1, max(0.0, elapsed - (self._tracked - tracked)))
+    
+    def sprite_totals(self):
+        """{sprite: seconds}"""
+        totals = {}
+        for stack, (_, seconds) in self.samples.items():
+            totals[stack[0]] = totals.get(stack[0], 0.0) + seconds
+        return totals
+    
+    def frame_stats(self, sprite):
+        """{frame: [calls, self seconds, total seconds]} for one sprite"""
+        stats = {}
+        for stack, (calls, seconds) in self.samples.items():
+            if stack[0] != sprite:
+                continue
+            for i, frame in enumerate(stack[1:], 1):
+                entry = stats.setdefault(frame, [0, 0.0, 0.0])
+                if frame not in stack[i + 1:]:
+                    entry[2] += seconds
+                if i == len(stack) - 1:
+                    entry[0] += calls
+                    entry[1] += seconds
+        return stats
+    
+    def write_collapsed(self, path):
+        """
+        Write 'sprite;frame;frame <microseconds>' lines (self time), the
+        collapsed-stack input of flamegraph.pl, speedscope and inferno
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as f:
+            for stack, (_, seconds) in sorted(self.samples.items()):
+                micros = round(seconds * 1e6)
+                if micros:
+                    f.write(f"{';'.join(stack)} {micros}\n")
+    
+    def top_table(self, top=5, sprites=None):
+        """Text table of the slowest sprites and the top primitives (by self time) within each"""
+        totals = sorted(self.sprite_totals().items(), key=lambda item: -item[1])
+        lines = [f"{'sprite / primitive':<48} {'calls':>7} {'self ms':>9} {'total ms':>9}"]
+        for sprite, seconds in totals[:sprites]:
+            lines.append(f"{sprite:<48} {'':>7} {'':>9} {seconds * 1000:9.2f}")
+            stats = sorted(self.frame_stats(sprite).items(), key=lambda item: -item[1][1])
+            for frame, (calls, self_s, total_s) in stats[:top]:
+                lines.append(f"  {frame:<46} {calls:7d} {self_s * 1000:9.2f} {total_s * 1000:9.2f}")
+        return "\n".join(lines)
+
+_active = None
+_originals = []
+
+def _instrument(owner, attr, frame):
+    func = getattr(owner, attr)
+    _originals.append((owner, attr, func))
+    
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        if _active is None:
+            return func(*args, **kwargs)
+        return _active.call(frame, func, args, kwargs)
+    setattr(owner, attr, timed)
+
+def enable():
+    """Install the instrumentation (idempotent) and return the active Profiler"""
+    global _active
+    if _active is None:
+        for name in CANVAS_PRIMITIVES:
+            _instrument(Canvas, name, name)
+        for owner, attr, frame in INNER_CALLS:
+            _instrument(owner, attr, frame)
+        _active = Profiler()
+    return _active
+
+def disable():
+    """Remove the instrumentation and return the Profiler that was active"""
+    global _active
+    profiler, _active = _active, None
+    while _originals:
+        owner, attr, func = _originals.pop()
+        setattr(owner, attr, func)
+    return profiler
+
+def active():
+    """The running Profiler, or None when profiling is off"""
+    return _active
+
+def sprite(name):
+    """Attribute the block's work to sprite name; a no-op when profiling is off"""
+    return _active.sprite(name) if _active is not None else nullcontext()
+
+def claim(name):
+    """Attribute work since the last claim to sprite name; a no-op when profiling is off"""
+    if _active is not None:
+        _active.claim(name)
+
+def write_profile(profiler, path, top=5, root=None):
+    """
+    Write collapsed stacks to path and the full per-sprite table next to it
+    (<stem>.top.txt, never path itself), print the table for the ten slowest
+    sprites, and return the table path
+    """
+    named = Profiler()
+    named.merge(profiler.samples, root)
+    named.write_collapsed(path)
+    table_path = f"{os.path.splitext(path)[0]}.top.txt"
+    with open(table_path, 'w') as f:
+        f.write(named.top_table(top) + "\n")
+    print(named.top_table(top, sprites=10))
+    print(f"✓ Profile written to {path} (flame graph input) and {table_path}")
+    return table_path
+
+def collect():
+    """Hand over and reset the samples gathered so far (for returning from workers)"""
+    if _active is None:
+        return {}
+    samples, _active.samples = _active.samples, {}
+    return samples
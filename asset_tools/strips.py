@@ -0,0 +1,97 @@
+"""
+Cyber Strike - Animation Strips
+Lays out pre-baked animation frames side by side in one sheet per scale,
+so the client plays frames by offsetting a texture rect
+"""
+
+from PIL import Image
+import json
+import math
+import os
+
+from .trim import PADDING, crop_scaled, shared_bounds, trim_info
+
+def build_strip(frames, columns=None):
+    """Join equally sized frame images left to right, wrapping after columns frames (default: one row)"""
+    w, h = frames[0].size
+    columns = columns or len(frames)
+    rows = -(-len(frames) // columns)
+    strip = Image.new('RGBA', (w * min(columns, len(frames)), h * rows), (0, 0, 0, 0))
+    for i, frame in enumerate(frames):
+        if frame.size != (w, h):
+            raise ValueError(f"Strip frame {i} is {frame.size[0]}x{frame.size[1]}, expected {w}x{h}")
+        strip.paste(frame, (i % columns * w, i // columns * h))
+    return strip
+
+def _load_frames(sprite_dir, frame_names, suffix):
+    frames = []
+    for frame_name in frame_names:
+        with Image.open(os.path.join(sprite_dir, f"{frame_name}{suffix}.png")) as img:
+            frames.append(img.convert('RGBA'))
+    return frames
+
+def _trimmed_frames(sprite_dir, frame_names, scales, padding):
+    """
+    Every scale's frames cropped to one shared logical box (see trim.shared_bounds)
+    Returns ({suffix: frames}, trim metadata for the sheet index)
+    """
+    frames = {suffix: _load_frames(sprite_dir, frame_names, suffix) for suffix in scales}
+    box = shared_bounds({scales[suffix]: images for suffix, images in frames.items()}, padding)
+    cropped = {suffix: [crop_scaled(img, box, scales[suffix]) for img in images] for suffix, images in frames.items()}
+    first = frames[''][0]
+    return cropped, trim_info(box, (first.width, first.height))
+
+def write_strips(sprite_dir, out_dir, animations, scales, fps=None, padding=PADDING):
+    """
+    Write <name><suffix>.png strips for every {name: [frame sprite names]}
+    animation plus an animations.json index of frame count, logical frame
+    size and playback rate; frames are read from the sprite PNGs under sprite_dir
+    Frames are trimmed to the alpha bounds of the whole animation plus padding
+    logical pixels; spriteSourceSize gives the trimmed frame's offset in the
+    sourceSize canvas, so anchors stay where the untrimmed frames had them
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    fps = fps or {}
+    index = {}
+    written = []
+    for name, frame_names in sorted(animations.items()):
+        frames, trimmed = _trimmed_frames(sprite_dir, frame_names, scales, padding)
+        entry = {'frames': len(frame_names), 'fps': fps.get(name, 12), 'images': {}, **trimmed}
+        for suffix, scale in scales.items():
+            filename = f"{name}{suffix}.png"
+            build_strip(frames[suffix]).save(os.path.join(out_dir, filename))
+            written.append(filename)
+            entry['images'][f"{scale}x"] = filename
+        index[name] = entry
+        
+    with open(os.path.join(out_dir, "animations.json"), 'w') as f:
+        json.dump({'animations': index}, f, indent=1, sort_keys=True)
+    return written
+
+def write_rotation_sheets(sprite_dir, out_dir, rotations, scales, padding=PADDING):
+    """
+    Write <name><suffix>.png heading sheets for every {name: [frame sprite
+    names]} rotation plus a rotations.json index
+    Frame i shows the sprite turned i * 360 / frames degrees clockwise and
+    sits at column i % columns, row i // columns; sheets are laid out near
+    square so even large sprites stay within texture size limits. Frames
+    are trimmed to the bounds of every heading, as with write_strips
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    index = {}
+    written = []
+    for name, frame_names in sorted(rotations.items()):
+        columns = math.ceil(math.sqrt(len(frame_names)))
+        frames, trimmed = _trimmed_frames(sprite_dir, frame_names, scales, padding)
+        entry = {'frames': len(frame_names), 'degreesPerFrame': 360 / len(frame_names),
+                 'columns': columns, 'rows': -(-len(frame_names) // columns), 'images': {}, **trimmed}
+        for suffix, scale in scales.items():
+            filename = f"{name}{suffix}.png"
+            build_strip(frames[suffix], columns).save(os.path.join(out_dir, filename))
+            written.append(filename)
+            entry['images'][f"{scale}x"] = filename
+        index[name] = entry
+        
+    with open(os.path.join(out_dir, "rotations.json"), 'w') as f:
+        json.dump({'rotations': index}, f, indent=1, sort_keys=True)
+    return written
@@ -0,0 +1,120 @@
+"""
+Cyber Strike - Alpha Trimming
+Finds the tight alpha bounds of sprites with NumPy and crops away the
+transparent margins, keeping each crop's offset and original size so the
+runtime can place trimmed frames exactly where the full canvas put them
+"""
+
+from PIL import Image
+import argparse
+import math
+import os
+
+import numpy as np
+
+# Transparent logical pixels kept around trimmed sheet frames, so filtering
+# at a frame's edge samples transparency rather than the neighbouring frame
+PADDING = 1
+
+def _visible(img):
+    """Boolean mask of visible pixels; for 8-bit index images every non-zero index is visible"""
+    arr = np.asarray(img)
+    return (arr[..., 3] if arr.ndim == 3 else arr) > 0
+
+def alpha_bounds(img):
+    """(x0, y0, x1, y1) box (end exclusive) around every visible pixel, or None if there are none"""
+    visible = _visible(img)
+    cols = np.flatnonzero(visible.any(axis=0))
+    if not len(cols):
+        return None
+    rows = np.flatnonzero(visible.any(axis=1))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+def union_bounds(boxes):
+    """Smallest box holding every box (None entries ignored), or None"""
+    boxes = [box for box in boxes if box is not None]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+def trim(img, padding=0):
+    """
+    Crop an image to its alpha bounds plus padding pixels (kept inside the image)
+    Returns (trimmed image, (x, y) offset in the original); a fully transparent
+    image keeps a single pixel so the frame stays addressable
+    """
+    box = alpha_bounds(img)
+    if box is None:
+        return img.crop((0, 0, 1, 1)), (0, 0)
+    w, h = img.size
+    box = (max(0, box[0] - padding), max(0, box[1] - padding), min(w, box[2] + padding), min(h, box[3] + padding))
+    return img.crop(box), box[:2]
+
+def extrude(img, pixels):
+    """Image grown by pixels on every side, repeating its edge pixels outward"""
+    if pixels <= 0:
+        return img
+    arr = np.asarray(img)
+    pad = ((pixels, pixels), (pixels, pixels)) + ((0, 0),) * (arr.ndim - 2)
+    return Image.fromarray(np.pad(arr, pad, mode='edge'), img.mode)
+
+def shared_bounds(frames, padding=PADDING):
+    """
+    One logical-pixel box that holds every visible pixel of every frame at every scale
+    frames maps each scale factor to that scale's equally sized frame images
+    (animation frames, headings, one sprite's scales). Cropping each scale to
+    the box times its factor keeps every scale and frame aligned, so a sheet
+    needs one offset. Returns (x0, y0, x1, y1) in logical pixels, grown by
+    padding and clamped to the frame; the whole frame if nothing is visible
+    """
+    box = None
+    for scale, images in frames.items():
+        b = union_bounds(alpha_bounds(img) for img in images)
+        if b is not None:
+            box = union_bounds([box, (b[0] // scale, b[1] // scale, math.ceil(b[2] / scale), math.ceil(b[3] / scale))])
+        w, h = images[0].size[0] // scale, images[0].size[1] // scale
+    if box is None:
+        return 0, 0, w, h
+    return max(0, box[0] - padding), max(0, box[1] - padding), min(w, box[2] + padding), min(h, box[3] + padding)
+
+def crop_scaled(img, box, scale):
+    """Crop a scale-factor image to a logical-pixel box"""
+    return img.crop(tuple(v * scale for v in box))
+
+def trim_info(box, source_size):
+    """Sheet metadata for a logical box: the trimmed frame size, its offset and the untrimmed size"""
+    x0, y0, x1, y1 = box
+    return {
+        'frameSize': {'w': x1 - x0, 'h': y1 - y0},
+        'spriteSourceSize': {'x': x0, 'y': y0, 'w': x1 - x0, 'h': y1 - y0},
+        'sourceSize': {'w': source_size[0], 'h': source_size[1]},
+    }
+
+def main(argv=None):
+    """Report how much transparent margin the PNGs under a directory carry"""
+    parser = argparse.ArgumentParser(description="Measure the transparent margins trimming would remove")
+    parser.add_argument('root', help="directory to scan for PNGs")
+    parser.add_argument('--top', type=int, default=10, help="largest wasters to list (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    waste = []
+    total = kept = 0
+    for dirpath, _, files in os.walk(args.root):
+        for filename in sorted(files):
+            if not filename.endswith('.png'):
+                continue
+            path = os.path.join(dirpath, filename)
+            with Image.open(path) as img:
+                box = alpha_bounds(img) if img.mode in ('RGBA', 'L') else (0, 0, *img.size)
+                area = img.width * img.height
+            used = (box[2] - box[0]) * (box[3] - box[1]) if box else 1
+            total += area
+            kept += used
+            waste.append((area - used, os.path.relpath(path, args.root), area))
+    for wasted, name, area in sorted(waste, reverse=True)[:args.top]:
+        print(f"  {name}: {wasted} of {area} pixels transparent margin ({100 * wasted / area:.0f}%)")
+    print(f"✓ Trimming keeps {kept} of {total} pixels ({100 * kept / max(total, 1):.0f}%) over {len(waste)} images")
+
+if __name__ == "__main__":
+    main()
@@ -4,75 +4,58 @@ Cyber Strike - Top-Down Asset Generator
 Generates TRUE top-down view assets (90 degree overhead) like Desert Strike/Jungle Strike
 """
 
-from PIL import Image, ImageDraw
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
 import math
 import os
 
-# Cyberpunk color palette
-COLORS = {
-    'bg': (15, 15, 25),           # Deep dark blue-black
-    'bg_light': (25, 25, 40),     # Slightly lighter bg
-    'cyan': (0, 255, 255),        # Neon cyan
-    'cyan_dark': (0, 180, 200),   # Darker cyan
-    'pink': (255, 0, 128),        # Hot pink
-    'pink_dark': (200, 0, 100),   # Darker pink
-    'purple': (180, 0, 255),      # Purple
-    'purple_dark': (120, 0, 180), # Dark purple
-    'green': (0, 255, 100),       # Neon green
-    'yellow': (255, 220, 0),      # Yellow
-    'orange': (255, 140, 0),      # Orange
-    'red': (255, 50, 50),         # Red
-    'red_dark': (180, 30, 30),    # Dark red
-    'white': (255, 255, 255),     # White
-    'gray': (120, 120, 130),      # Gray
-    'gray_dark': (60, 60, 70),    # Dark gray
-    'gray_light': (180, 180, 190),# Light gray
-    'building': (40, 45, 60),     # Building base
-    'building_dark': (25, 30, 45),# Dark building
-    'window': (100, 220, 255),    # Lit window
-    'window_dark': (40, 50, 70),  # Unlit window
-    'metal': (80, 85, 95),        # Metal
-    'metal_dark': (50, 55, 65),   # Dark metal
-}
-
-def create_image(size, bg_color=None):
-    """Create a new image with transparent background"""
-    if bg_color is None:
-        return Image.new('RGBA', size, (0, 0, 0, 0))
-    return Image.new('RGBA', size, bg_color)
-
-def draw_glow_circle(draw, center, radius, color, glow_radius):
+import numpy as np
+
+from asset_tools import etc2, ktx2, palette, profiling
+from asset_tools.atlas import build_atlases
+from asset_tools.build_cache import BuildCache, sprite_key
+from asset_tools.canvas import Canvas
+from asset_tools.dedupe import write_aliases
+from asset_tools.display_list import DisplayList, record
+from asset_tools.indexed import apply_palette, build_index, palette_row, slot_weights, write_indexed
+from asset_tools.lod import FILTERS, build_lod_atlases, lod_index_matches
+from asset_tools.manifest import bind_args, load_manifest, resolve_generator, resolve_params, scale_map, select
+from asset_tools.png_optimize import optimize_stale, print_report
+from asset_tools.strips import write_rotation_sheets, write_strips
+
+# Cyberpunk color palette, shared with Assets/generate_assets.py
+COLORS = palette.PALETTE
+
+# Output scale suffixes for iPhone displays
+SCALES = {'': 1, '@2x': 2, '@3x': 3}
+
+# Build cache location (per generator, kept out of the asset folders)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".build_cache", "topdown")
+
+# Sprite list: generator, parameters, size and output path of every sprite, plus animations
+MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "manifests", "topdown.json")
+
+def draw_glow_circle(canvas, center, radius, color, glow_radius):
     """Draw a circle with glow effect"""
-    cx, cy = center
-    # Glow layers
-    for i in range(glow_radius, 0, -2):
-        alpha = int(30 * (1 - i / glow_radius))
-        glow_color = (*color[:3], alpha)
-        draw.ellipse([cx-radius-i, cy-radius-i, cx+radius+i, cy+radius+i], fill=glow_color)
-    # Core
-    draw.ellipse([cx-radius, cy-radius, cx+radius, cy+radius], fill=color)
-
-def draw_rotor_disc(draw, center, radius, color):
+    canvas.glow_circle(center, radius, color, glow_radius, glow_alpha=30)
+
+def draw_rotor_disc(canvas, center, radius, color):
     """Draw a helicopter rotor disc from top-down view (oval/circle)"""
     cx, cy = center
     # Rotor disc is slightly oval when viewed from above due to perspective
-    # Main rotor disc
-    for i in range(8, 0, -1):
-        alpha = int(40 - i * 4)
-        glow_color = (*color[:3], alpha)
-        draw.ellipse([cx-radius-i, cy-radius//2-i, cx+radius+i, cy+radius//2+i], fill=glow_color)
-    # Core disc
-    draw.ellipse([cx-radius, cy-radius//2, cx+radius, cy+radius//2], fill=(*color[:3], 60))
+    # Main rotor disc with its blur glow
+    canvas.glow_ellipse(center, (radius, radius // 2), color, 9, glow_alpha=40, core_alpha=60)
     # Rotor hub
-    draw.ellipse([cx-4, cy-4, cx+4, cy+4], fill=COLORS['gray'])
+    canvas.ellipse([cx-4, cy-4, cx+4, cy+4], fill=COLORS['gray'])
 
-def draw_helicopter_topdown(size, base_color, accent_color, state='idle'):
+def draw_helicopter_topdown(size, base_color, accent_color, state='idle', heading=None, scale=1):
     """
     Draw a helicopter from TRUE top-down view (90 degree overhead)
     Like Desert Strike/Jungle Strike - you see the ROTOR DISC from above
+    heading draws a heading frame turned clockwise in degrees from nose-up
     """
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale, heading=heading)
     cx, cy = size[0] // 2, size[1] // 2
     
     # Banking tilt effect (slight rotation of visual elements)
@@ -84,7 +67,7 @@ def draw_helicopter_topdown(size, base_color, accent_color, state='idle'):
     
     # Main rotor disc (seen as oval/circle from above)
     rotor_color = accent_color
-    draw_rotor_disc(draw, (cx + tilt_x, cy - 8), 28, rotor_color)
+    draw_rotor_disc(canvas, (cx + tilt_x, cy - 8), 28, rotor_color)
     
     # Tail boom (extends backward from center)
     tail_points = [
@@ -93,11 +76,11 @@ def draw_helicopter_topdown(size, base_color, accent_color, state='idle'):
         (cx + 3 + tilt_x//2, cy + 35),
         (cx - 3 + tilt_x//2, cy + 35),
     ]
-    draw.polygon(tail_points, fill=base_color, outline=COLORS['gray_dark'])
+    canvas.polygon(tail_points, fill=base_color, outline=COLORS['gray_dark'])
     
     # Tail rotor (seen as small circle/oval from above)
-    draw.ellipse([cx-6+tilt_x//2, cy+32, cx+6+tilt_x//2, cy+40], fill=COLORS['gray'])
-    draw.ellipse([cx-3+tilt_x//2, cy+34, cx+3+tilt_x//2, cy+38], fill=COLORS['gray_light'])
+    canvas.ellipse([cx-6+tilt_x//2, cy+32, cx+6+tilt_x//2, cy+40], fill=COLORS['gray'])
+    canvas.ellipse([cx-3+tilt_x//2, cy+34, cx+3+tilt_x//2, cy+38], fill=COLORS['gray_light'])
     
     # Main fuselage (seen from above - elongated shape)
     body_points = [
@@ -108,135 +91,135 @@ def draw_helicopter_topdown(size, base_color, accent_color, state='idle'):
         (cx - 8 + tilt_x//2, cy + 20), # Tail connection left
         (cx - 14 + tilt_x, cy + 5),   # Mid left
     ]
-    draw.polygon(body_points, fill=base_color, outline=accent_color)
+    canvas.polygon(body_points, fill=base_color, outline=accent_color)
     
     # Cockpit (glass canopy seen from above)
-    draw.ellipse([cx-8+tilt_x, cy-12, cx+8+tilt_x, cy+2], fill=COLORS['cyan_dark'])
-    draw.ellipse([cx-6+tilt_x, cy-10, cx+6+tilt_x, cy], fill=COLORS['cyan'])
+    canvas.ellipse([cx-8+tilt_x, cy-12, cx+8+tilt_x, cy+2], fill=COLORS['cyan_dark'])
+    canvas.ellipse([cx-6+tilt_x, cy-10, cx+6+tilt_x, cy], fill=COLORS['cyan'])
     
     # Engine/exhaust area
-    draw.rectangle([cx-6+tilt_x, cy+5, cx+6+tilt_x, cy+12], fill=COLORS['metal_dark'])
+    canvas.rectangle([cx-6+tilt_x, cy+5, cx+6+tilt_x, cy+12], fill=COLORS['metal_dark'])
     # Engine glow
     if state != 'damaged':
-        draw_glow_circle(draw, (cx+tilt_x, cy+8), 3, accent_color, 6)
+        draw_glow_circle(canvas, (cx+tilt_x, cy+8), 3, accent_color, 6)
     else:
         # Damaged - flickering red
-        draw_glow_circle(draw, (cx+tilt_x, cy+8), 3, COLORS['red'], 4)
+        draw_glow_circle(canvas, (cx+tilt_x, cy+8), 3, COLORS['red'], 4)
     
     # Landing skids (seen as lines underneath)
     skid_y1, skid_y2 = cy + 15, cy + 18
     # Left skid
-    draw.line([(cx-12+tilt_x, skid_y1), (cx-8+tilt_x//2, skid_y2)], fill=COLORS['metal'], width=2)
-    draw.line([(cx-8+tilt_x//2, skid_y2), (cx+2+tilt_x//2, skid_y2)], fill=COLORS['metal'], width=2)
+    canvas.line([(cx-12+tilt_x, skid_y1), (cx-8+tilt_x//2, skid_y2)], fill=COLORS['metal'], width=2)
+    canvas.line([(cx-8+tilt_x//2, skid_y2), (cx+2+tilt_x//2, skid_y2)], fill=COLORS['metal'], width=2)
     # Right skid
-    draw.line([(cx+12+tilt_x, skid_y1), (cx+8+tilt_x//2, skid_y2)], fill=COLORS['metal'], width=2)
-    draw.line([(cx+8+tilt_x//2, skid_y2), (cx-2+tilt_x//2, skid_y2)], fill=COLORS['metal'], width=2)
+    canvas.line([(cx+12+tilt_x, skid_y1), (cx+8+tilt_x//2, skid_y2)], fill=COLORS['metal'], width=2)
+    canvas.line([(cx+8+tilt_x//2, skid_y2), (cx-2+tilt_x//2, skid_y2)], fill=COLORS['metal'], width=2)
     
     # Weapon mounts
-    draw.rectangle([cx-16+tilt_x, cy-2, cx-12+tilt_x, cy+6], fill=COLORS['metal_dark'])
-    draw.rectangle([cx+12+tilt_x, cy-2, cx+16+tilt_x, cy+6], fill=COLORS['metal_dark'])
+    canvas.rectangle([cx-16+tilt_x, cy-2, cx-12+tilt_x, cy+6], fill=COLORS['metal_dark'])
+    canvas.rectangle([cx+12+tilt_x, cy-2, cx+16+tilt_x, cy+6], fill=COLORS['metal_dark'])
     
     # Detail lines
-    draw.line([(cx+tilt_x, cy-10), (cx+tilt_x, cy+15)], fill=accent_color, width=1)
+    canvas.line([(cx+tilt_x, cy-10), (cx+tilt_x, cy+15)], fill=accent_color, width=1)
     
     # Damage marks if damaged
     if state == 'damaged':
-        draw.line([(cx-8+tilt_x, cy-5), (cx-2+tilt_x, cy+5)], fill=COLORS['red'], width=2)
-        draw.line([(cx+5+tilt_x, cy-8), (cx+10+tilt_x, cy-2)], fill=COLORS['red'], width=2)
-        draw.ellipse([cx-3+tilt_x, cy+10, cx+3+tilt_x, cy+16], fill=COLORS['orange'])
+        canvas.line([(cx-8+tilt_x, cy-5), (cx-2+tilt_x, cy+5)], fill=COLORS['red'], width=2)
+        canvas.line([(cx+5+tilt_x, cy-8), (cx+10+tilt_x, cy-2)], fill=COLORS['red'], width=2)
+        canvas.ellipse([cx-3+tilt_x, cy+10, cx+3+tilt_x, cy+16], fill=COLORS['orange'])
     
-    return img
+    return canvas.image
 
-def draw_tank_topdown(size, tank_type='basic'):
-    """Draw a tank from TRUE top-down view"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+def draw_tank_topdown(size, tank_type='basic', heading=None, body_color=None, turret_color=None, accent_color=None,
+                      scale=1):
+    """
+    Draw a tank from TRUE top-down view, turned heading degrees clockwise from gun-up
+    Body, turret and accent colours default to the tank type's
+    """
+    canvas = Canvas(size, scale, heading=heading)
     cx, cy = size[0] // 2, size[1] // 2
     
     if tank_type == 'basic':
-        body_color = COLORS['gray_dark']
-        turret_color = COLORS['gray']
-        accent = COLORS['red']
+        defaults = (COLORS['gray_dark'], COLORS['gray'], COLORS['red'])
     else:  # heavy
-        body_color = COLORS['building_dark']
-        turret_color = COLORS['metal_dark']
-        accent = COLORS['orange']
-    
+        defaults = (COLORS['building_dark'], COLORS['metal_dark'], COLORS['orange'])
+    body_color, turret_color, accent = (color or default for color, default
+                                        in zip((body_color, turret_color, accent_color), defaults))
+                                        
     # Tank body (rectangle from above)
     body_w, body_h = 28, 36
-    draw.rectangle([cx-body_w//2, cy-body_h//2, cx+body_w//2, cy+body_h//2], 
+    canvas.rectangle([cx-body_w//2, cy-body_h//2, cx+body_w//2, cy+body_h//2], 
                    fill=body_color, outline=COLORS['gray'])
     
     # Treads (visible as tracks on sides)
     tread_w = 4
     # Left tread
-    draw.rectangle([cx-body_w//2-2, cy-body_h//2, cx-body_w//2+tread_w, cy+body_h//2],
+    canvas.rectangle([cx-body_w//2-2, cy-body_h//2, cx-body_w//2+tread_w, cy+body_h//2],
                    fill=COLORS['metal_dark'], outline=COLORS['gray'])
     # Right tread
-    draw.rectangle([cx+body_w//2-tread_w, cy-body_h//2, cx+body_w//2+2, cy+body_h//2],
+    canvas.rectangle([cx+body_w//2-tread_w, cy-body_h//2, cx+body_w//2+2, cy+body_h//2],
                    fill=COLORS['metal_dark'], outline=COLORS['gray'])
     
     # Tread details (lines)
     for i in range(-14, 15, 4):
-        draw.line([(cx-body_w//2-2, cy+i), (cx-body_w//2+tread_w, cy+i)], fill=COLORS['gray'], width=1)
-        draw.line([(cx+body_w//2-tread_w, cy+i), (cx+body_w//2+2, cy+i)], fill=COLORS['gray'], width=1)
+        canvas.line([(cx-body_w//2-2, cy+i), (cx-body_w//2+tread_w, cy+i)], fill=COLORS['gray'], width=1)
+        canvas.line([(cx+body_w//2-tread_w, cy+i), (cx+body_w//2+2, cy+i)], fill=COLORS['gray'], width=1)
     
     # Turret (seen as rectangle/circle from above)
     turret_size = 14 if tank_type == 'basic' else 18
-    draw.ellipse([cx-turret_size, cy-turret_size, cx+turret_size, cy+turret_size],
+    canvas.ellipse([cx-turret_size, cy-turret_size, cx+turret_size, cy+turret_size],
                  fill=turret_color, outline=accent)
     
     # Gun barrel (pointing up/north in default orientation)
     barrel_w = 4 if tank_type == 'basic' else 6
     barrel_l = 16 if tank_type == 'basic' else 22
-    draw.rectangle([cx-barrel_w//2, cy-turret_size-barrel_l, cx+barrel_w//2, cy-turret_size],
+    canvas.rectangle([cx-barrel_w//2, cy-turret_size-barrel_l, cx+barrel_w//2, cy-turret_size],
                    fill=COLORS['metal'], outline=COLORS['gray_dark'])
     
     # Barrel tip glow
-    draw.rectangle([cx-2, cy-turret_size-barrel_l-3, cx+2, cy-turret_size-barrel_l],
+    canvas.rectangle([cx-2, cy-turret_size-barrel_l-3, cx+2, cy-turret_size-barrel_l],
                    fill=accent)
     
     # Turret details
-    draw.ellipse([cx-6, cy-6, cx+6, cy+6], fill=COLORS['metal_dark'])
-    draw.ellipse([cx-3, cy-3, cx+3, cy+3], fill=accent)
+    canvas.ellipse([cx-6, cy-6, cx+6, cy+6], fill=COLORS['metal_dark'])
+    canvas.ellipse([cx-3, cy-3, cx+3, cy+3], fill=accent)
     
     # Heavy tank extra details
     if tank_type == 'heavy':
         # Extra armor plates
-        draw.rectangle([cx-10, cy+5, cx+10, cy+12], fill=COLORS['metal_dark'], outline=COLORS['gray'])
+        canvas.rectangle([cx-10, cy+5, cx+10, cy+12], fill=COLORS['metal_dark'], outline=COLORS['gray'])
         # Second smaller gun
-        draw.rectangle([cx+8, cy-5, cx+14, cy-2], fill=COLORS['metal'], outline=COLORS['gray_dark'])
+        canvas.rectangle([cx+8, cy-5, cx+14, cy-2], fill=COLORS['metal'], outline=COLORS['gray_dark'])
     
-    return img
+    return canvas.image
 
-def draw_turret_topdown(size):
-    """Draw anti-air turret from top-down view"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+def draw_turret_topdown(size, heading=None, scale=1):
+    """Draw anti-air turret from top-down view, turned heading degrees clockwise"""
+    canvas = Canvas(size, scale, heading=heading)
     cx, cy = size[0] // 2, size[1] // 2
     
     # Base (circular platform)
     base_r = 22
-    draw.ellipse([cx-base_r, cy-base_r, cx+base_r, cy+base_r],
+    canvas.ellipse([cx-base_r, cy-base_r, cx+base_r, cy+base_r],
                  fill=COLORS['metal_dark'], outline=COLORS['gray'])
     
     # Inner base detail
-    draw.ellipse([cx-base_r+4, cy-base_r+4, cx+base_r-4, cy+base_r-4],
+    canvas.ellipse([cx-base_r+4, cy-base_r+4, cx+base_r-4, cy+base_r-4],
                  fill=COLORS['building_dark'], outline=COLORS['gray_dark'])
     
     # Rotating mount (cross shape from above)
     mount_w = 8
     mount_l = 18
     # Horizontal bar
-    draw.rectangle([cx-mount_l, cy-mount_w//2, cx+mount_l, cy+mount_w//2],
+    canvas.rectangle([cx-mount_l, cy-mount_w//2, cx+mount_l, cy+mount_w//2],
                    fill=COLORS['metal'], outline=COLORS['cyan'])
     # Vertical bar
-    draw.rectangle([cx-mount_w//2, cy-mount_l, cx+mount_w//2, cy+mount_l],
+    canvas.rectangle([cx-mount_w//2, cy-mount_l, cx+mount_w//2, cy+mount_l],
                    fill=COLORS['metal'], outline=COLORS['cyan'])
     
     # Center hub
-    draw.ellipse([cx-8, cy-8, cx+8, cy+8], fill=COLORS['gray_dark'], outline=COLORS['cyan'])
-    draw.ellipse([cx-4, cy-4, cx+4, cy+4], fill=COLORS['cyan'])
+    canvas.ellipse([cx-8, cy-8, cx+8, cy+8], fill=COLORS['gray_dark'], outline=COLORS['cyan'])
+    canvas.ellipse([cx-4, cy-4, cx+4, cy+4], fill=COLORS['cyan'])
     
     # Gun barrels (4 directions)
     barrel_l = 14
@@ -251,25 +234,24 @@ def draw_turret_topdown(size):
         # Draw barrel
         bx = (x1 + x2) / 2
         by = (y1 + y2) / 2
-        draw.line([(x1, y1), (x2, y2)], fill=COLORS['metal'], width=barrel_w)
+        canvas.line([(x1, y1), (x2, y2)], fill=COLORS['metal'], width=barrel_w)
         # Barrel tip
-        draw.ellipse([x2-3, y2-3, x2+3, y2+3], fill=COLORS['red'])
+        canvas.ellipse([x2-3, y2-3, x2+3, y2+3], fill=COLORS['red'])
     
-    return img
+    return canvas.image
 
-def draw_drone_topdown(size):
+def draw_drone_topdown(size, scale=1):
     """Draw small quadcopter drone from top-down"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     # Drone body (small circle)
     body_r = 6
-    draw.ellipse([cx-body_r, cy-body_r, cx+body_r, cy+body_r],
+    canvas.ellipse([cx-body_r, cy-body_r, cx+body_r, cy+body_r],
                  fill=COLORS['gray_dark'], outline=COLORS['pink'])
     
     # Center glow
-    draw.ellipse([cx-3, cy-3, cx+3, cy+3], fill=COLORS['pink'])
+    canvas.ellipse([cx-3, cy-3, cx+3, cy+3], fill=COLORS['pink'])
     
     # Four arms extending to rotors
     arm_l = 12
@@ -282,28 +264,27 @@ def draw_drone_topdown(size):
     
     # Draw arms
     for rx, ry in rotor_positions:
-        draw.line([(cx, cy), (rx, ry)], fill=COLORS['gray'], width=2)
+        canvas.line([(cx, cy), (rx, ry)], fill=COLORS['gray'], width=2)
     
     # Rotors (small circles)
     for rx, ry in rotor_positions:
         # Rotor disc
-        draw.ellipse([rx-5, ry-5, rx+5, ry+5], fill=(*COLORS['pink'][:3], 80))
+        canvas.ellipse([rx-5, ry-5, rx+5, ry+5], fill=(*COLORS['pink'][:3], 80))
         # Rotor center
-        draw.ellipse([rx-2, ry-2, rx+2, ry+2], fill=COLORS['pink'])
+        canvas.ellipse([rx-2, ry-2, rx+2, ry+2], fill=COLORS['pink'])
     
-    return img
+    return canvas.image
 
-def draw_boss_gunship_topdown(size):
-    """Draw large boss gunship from top-down"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+def draw_boss_gunship_topdown(size, heading=None, scale=1):
+    """Draw large boss gunship from top-down, turned heading degrees clockwise from nose-up"""
+    canvas = Canvas(size, scale, heading=heading)
     cx, cy = size[0] // 2, size[1] // 2
     
     # Dual rotor system - two large rotor discs
     # Left rotor
-    draw_rotor_disc(draw, (cx-25, cy-10), 22, COLORS['red'])
+    draw_rotor_disc(canvas, (cx-25, cy-10), 22, COLORS['red'])
     # Right rotor
-    draw_rotor_disc(draw, (cx+25, cy-10), 22, COLORS['red'])
+    draw_rotor_disc(canvas, (cx+25, cy-10), 22, COLORS['red'])
     
     # Main body (large, bulky)
     body_points = [
@@ -314,23 +295,23 @@ def draw_boss_gunship_topdown(size):
         (cx - 30, cy + 40),
         (cx - 40, cy + 10),
     ]
-    draw.polygon(body_points, fill=COLORS['building_dark'], outline=COLORS['red'])
+    canvas.polygon(body_points, fill=COLORS['building_dark'], outline=COLORS['red'])
     
     # Central fuselage
-    draw.ellipse([cx-15, cy-15, cx+15, cy+25], fill=COLORS['metal_dark'], outline=COLORS['red'])
+    canvas.ellipse([cx-15, cy-15, cx+15, cy+25], fill=COLORS['metal_dark'], outline=COLORS['red'])
     
     # Cockpit
-    draw.ellipse([cx-10, cy-10, cx+10, cy+8], fill=COLORS['red_dark'])
-    draw.ellipse([cx-6, cy-6, cx+6, cy+4], fill=COLORS['red'])
+    canvas.ellipse([cx-10, cy-10, cx+10, cy+8], fill=COLORS['red_dark'])
+    canvas.ellipse([cx-6, cy-6, cx+6, cy+4], fill=COLORS['red'])
     
     # Weapon pods (left and right)
     for offset in [-28, 28]:
-        draw.rectangle([cx+offset-8, cy+5, cx+offset+8, cy+25],
+        canvas.rectangle([cx+offset-8, cy+5, cx+offset+8, cy+25],
                        fill=COLORS['metal_dark'], outline=COLORS['orange'])
         # Missile tubes
         for i in range(3):
             tube_y = cy + 8 + i * 5
-            draw.ellipse([cx+offset-4, tube_y-2, cx+offset+4, tube_y+2],
+            canvas.ellipse([cx+offset-4, tube_y-2, cx+offset+4, tube_y+2],
                         fill=COLORS['orange'])
     
     # Tail section
@@ -340,22 +321,21 @@ def draw_boss_gunship_topdown(size):
         (cx + 15, cy + 55),
         (cx - 15, cy + 55),
     ]
-    draw.polygon(tail_points, fill=COLORS['metal_dark'], outline=COLORS['red'])
+    canvas.polygon(tail_points, fill=COLORS['metal_dark'], outline=COLORS['red'])
     
     # Tail rotors
-    draw.ellipse([cx-20, cy+50, cx-10, cy+60], fill=COLORS['gray'])
-    draw.ellipse([cx+10, cy+50, cx+20, cy+60], fill=COLORS['gray'])
+    canvas.ellipse([cx-20, cy+50, cx-10, cy+60], fill=COLORS['gray'])
+    canvas.ellipse([cx+10, cy+50, cx+20, cy+60], fill=COLORS['gray'])
     
     # Engine exhausts (multiple)
     for offset in [-15, 0, 15]:
-        draw_glow_circle(draw, (cx+offset, cy+30), 4, COLORS['orange'], 8)
+        draw_glow_circle(canvas, (cx+offset, cy+30), 4, COLORS['orange'], 8)
     
-    return img
+    return canvas.image
 
-def draw_building_topdown(size, building_type='small'):
+def draw_building_topdown(size, building_type='small', scale=1):
     """Draw building roof from top-down view"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     if building_type == 'small':
@@ -384,66 +364,65 @@ def draw_building_topdown(size, building_type='small'):
             (cx + w//2, cy + h//2 - 5),
             (cx - w//2 + 8, cy + h//2),
         ]
-        draw.polygon(points, fill=roof_color, outline=COLORS['gray'])
+        canvas.polygon(points, fill=roof_color, outline=COLORS['gray'])
     else:
-        draw.rectangle([cx-w//2, cy-h//2, cx+w//2, cy+h//2],
+        canvas.rectangle([cx-w//2, cy-h//2, cx+w//2, cy+h//2],
                        fill=roof_color, outline=COLORS['gray'])
     
     # Roof details based on type
     if building_type == 'small':
         # AC unit
-        draw.rectangle([cx-8, cy-8, cx+8, cy+8], fill=COLORS['metal_dark'])
-        draw.rectangle([cx-6, cy-10, cx+6, cy-8], fill=COLORS['gray'])
+        canvas.rectangle([cx-8, cy-8, cx+8, cy+8], fill=COLORS['metal_dark'])
+        canvas.rectangle([cx-6, cy-10, cx+6, cy-8], fill=COLORS['gray'])
         # Vent
-        draw.rectangle([cx-15, cy+10, cx-5, cy+18], fill=COLORS['gray_dark'])
+        canvas.rectangle([cx-15, cy+10, cx-5, cy+18], fill=COLORS['gray_dark'])
         
     elif building_type == 'tall':
         # Multiple AC units
-        draw.rectangle([cx-20, cy-20, cx-5, cy-5], fill=COLORS['metal_dark'])
-        draw.rectangle([cx+5, cy-20, cx+20, cy-5], fill=COLORS['metal_dark'])
+        canvas.rectangle([cx-20, cy-20, cx-5, cy-5], fill=COLORS['metal_dark'])
+        canvas.rectangle([cx+5, cy-20, cx+20, cy-5], fill=COLORS['metal_dark'])
         # Antenna
-        draw.line([(cx, cy-30), (cx, cy-h//2)], fill=COLORS['gray'], width=2)
-        draw.ellipse([cx-3, cy-33, cx+3, cy-27], fill=COLORS['red'])
+        canvas.line([(cx, cy-30), (cx, cy-h//2)], fill=COLORS['gray'], width=2)
+        canvas.ellipse([cx-3, cy-33, cx+3, cy-27], fill=COLORS['red'])
         # Helipad marking (H)
-        draw.line([(cx-8, cy+10), (cx-8, cy+25)], fill=COLORS['yellow'], width=3)
-        draw.line([(cx+8, cy+10), (cx+8, cy+25)], fill=COLORS['yellow'], width=3)
-        draw.line([(cx-8, cy+17), (cx+8, cy+17)], fill=COLORS['yellow'], width=3)
+        canvas.line([(cx-8, cy+10), (cx-8, cy+25)], fill=COLORS['yellow'], width=3)
+        canvas.line([(cx+8, cy+10), (cx+8, cy+25)], fill=COLORS['yellow'], width=3)
+        canvas.line([(cx-8, cy+17), (cx+8, cy+17)], fill=COLORS['yellow'], width=3)
         
     elif building_type == 'corp':
         # Helipad circle
-        draw.ellipse([cx-15, cy-15, cx+15, cy+15], outline=COLORS['yellow'], width=2)
-        draw.line([(cx-8, cy), (cx+8, cy)], fill=COLORS['yellow'], width=2)
-        draw.line([(cx, cy-8), (cx, cy+8)], fill=COLORS['yellow'], width=2)
+        canvas.ellipse([cx-15, cy-15, cx+15, cy+15], outline=COLORS['yellow'], width=2)
+        canvas.line([(cx-8, cy), (cx+8, cy)], fill=COLORS['yellow'], width=2)
+        canvas.line([(cx, cy-8), (cx, cy+8)], fill=COLORS['yellow'], width=2)
         # Communication array
         for angle in [0, 72, 144, 216, 288]:
             rad = math.radians(angle)
             x = cx + math.cos(rad) * 20
             y = cy + math.sin(rad) * 20
-            draw.line([(cx, cy), (x, y)], fill=COLORS['gray'], width=1)
-            draw.ellipse([x-2, y-2, x+2, y+2], fill=COLORS['red'])
+            canvas.line([(cx, cy), (x, y)], fill=COLORS['gray'], width=1)
+            canvas.ellipse([x-2, y-2, x+2, y+2], fill=COLORS['red'])
         # Satellite dish
-        draw.ellipse([cx+15, cy-25, cx+25, cy-15], fill=COLORS['metal'])
-        draw.line([(cx+20, cy-20), (cx+20, cy-30)], fill=COLORS['gray'], width=2)
+        canvas.ellipse([cx+15, cy-25, cx+25, cy-15], fill=COLORS['metal'])
+        canvas.line([(cx+20, cy-20), (cx+20, cy-30)], fill=COLORS['gray'], width=2)
         
     else:  # slum
         # Random junk on roof
-        draw.rectangle([cx-10, cy-5, cx-2, cy+5], fill=COLORS['gray'])
-        draw.rectangle([cx+5, cy-10, cx+15, cy-2], fill=COLORS['metal_dark'])
+        canvas.rectangle([cx-10, cy-5, cx-2, cy+5], fill=COLORS['gray'])
+        canvas.rectangle([cx+5, cy-10, cx+15, cy-2], fill=COLORS['metal_dark'])
         # Pipes
-        draw.line([(cx-w//2+5, cy-h//2+10), (cx+w//2-10, cy+h//2-5)], 
+        canvas.line([(cx-w//2+5, cy-h//2+10), (cx+w//2-10, cy+h//2-5)], 
                   fill=COLORS['gray_dark'], width=3)
     
     # Edge glow for cyberpunk feel
     if building_type in ['tall', 'corp']:
-        draw.rectangle([cx-w//2, cy-h//2, cx-w//2+2, cy+h//2], fill=window_color)
-        draw.rectangle([cx+w//2-2, cy-h//2, cx+w//2, cy+h//2], fill=window_color)
+        canvas.rectangle([cx-w//2, cy-h//2, cx-w//2+2, cy+h//2], fill=window_color)
+        canvas.rectangle([cx+w//2-2, cy-h//2, cx+w//2, cy+h//2], fill=window_color)
     
-    return img
+    return canvas.image
 
-def draw_road_topdown(size, road_type='straight'):
+def draw_road_topdown(size, road_type='straight', scale=1):
     """Draw road from top-down view"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     # Road base
@@ -452,76 +431,77 @@ def draw_road_topdown(size, road_type='straight'):
     
     if road_type == 'straight':
         # Road surface
-        draw.rectangle([cx-20, 0, cx+20, size[1]], fill=road_color)
+        canvas.rectangle([cx-20, 0, cx+20, size[1]], fill=road_color)
         # Center line
         for y in range(0, size[1], 20):
-            draw.rectangle([cx-2, y, cx+2, y+10], fill=line_color)
+            canvas.rectangle([cx-2, y, cx+2, y+10], fill=line_color)
         # Edge lines
-        draw.line([(cx-20, 0), (cx-20, size[1])], fill=COLORS['white'], width=1)
-        draw.line([(cx+20, 0), (cx+20, size[1])], fill=COLORS['white'], width=1)
+        canvas.line([(cx-20, 0), (cx-20, size[1])], fill=COLORS['white'], width=1)
+        canvas.line([(cx+20, 0), (cx+20, size[1])], fill=COLORS['white'], width=1)
         
     elif road_type == 'intersection':
         # Cross roads
-        draw.rectangle([cx-20, 0, cx+20, size[1]], fill=road_color)
-        draw.rectangle([0, cy-20, size[0], cy+20], fill=road_color)
+        canvas.rectangle([cx-20, 0, cx+20, size[1]], fill=road_color)
+        canvas.rectangle([0, cy-20, size[0], cy+20], fill=road_color)
         # Center
-        draw.ellipse([cx-5, cy-5, cx+5, cy+5], fill=COLORS['yellow'])
+        canvas.ellipse([cx-5, cy-5, cx+5, cy+5], fill=COLORS['yellow'])
     
-    return img
+    return canvas.image
 
-def draw_bridge_topdown(size):
+def draw_bridge_topdown(size, scale=1):
     """Draw bridge from top-down view"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     # Bridge deck (narrower than road)
-    draw.rectangle([cx-12, 0, cx+12, size[1]], fill=COLORS['metal_dark'])
+    canvas.rectangle([cx-12, 0, cx+12, size[1]], fill=COLORS['metal_dark'])
     
     # Support beams visible from above
     for y in range(20, size[1], 40):
-        draw.line([(cx-15, y), (cx-12, y)], fill=COLORS['gray'], width=2)
-        draw.line([(cx+12, y), (cx+15, y)], fill=COLORS['gray'], width=2)
+        canvas.line([(cx-15, y), (cx-12, y)], fill=COLORS['gray'], width=2)
+        canvas.line([(cx+12, y), (cx+15, y)], fill=COLORS['gray'], width=2)
     
     # Center line
     for y in range(0, size[1], 15):
-        draw.rectangle([cx-1, y, cx+1, y+7], fill=COLORS['yellow'])
+        canvas.rectangle([cx-1, y, cx+1, y+7], fill=COLORS['yellow'])
     
-    return img
+    return canvas.image
 
-def draw_rooftop_detail(size, detail_type='ac_unit'):
+def draw_rooftop_detail(size, detail_type='ac_unit', scale=1):
     """Draw rooftop details from top-down"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     if detail_type == 'ac_unit':
         # AC unit box
-        draw.rectangle([cx-10, cy-8, cx+10, cy+8], fill=COLORS['metal_dark'], outline=COLORS['gray'])
+        canvas.rectangle([cx-10, cy-8, cx+10, cy+8], fill=COLORS['metal_dark'], outline=COLORS['gray'])
         # Fan visible from above
-        draw.ellipse([cx-6, cy-4, cx+6, cy+4], fill=COLORS['gray'])
-        draw.line([(cx-6, cy), (cx+6, cy)], fill=COLORS['metal'], width=1)
-        draw.line([(cx, cy-4), (cx, cy+4)], fill=COLORS['metal'], width=1)
+        canvas.ellipse([cx-6, cy-4, cx+6, cy+4], fill=COLORS['gray'])
+        canvas.line([(cx-6, cy), (cx+6, cy)], fill=COLORS['metal'], width=1)
+        canvas.line([(cx, cy-4), (cx, cy+4)], fill=COLORS['metal'], width=1)
         # Vent pipe
-        draw.rectangle([cx-3, cy-12, cx+3, cy-8], fill=COLORS['gray'])
+        canvas.rectangle([cx-3, cy-12, cx+3, cy-8], fill=COLORS['gray'])
         
     elif detail_type == 'antenna':
         # Base
-        draw.rectangle([cx-4, cy-4, cx+4, cy+4], fill=COLORS['metal_dark'])
+        canvas.rectangle([cx-4, cy-4, cx+4, cy+4], fill=COLORS['metal_dark'])
         # Mast
-        draw.line([(cx, cy), (cx, cy-25)], fill=COLORS['gray'], width=2)
+        canvas.line([(cx, cy), (cx, cy-25)], fill=COLORS['gray'], width=2)
         # Antenna elements
         for y in [cy-8, cy-15, cy-22]:
-            draw.line([(cx-6, y), (cx+6, y)], fill=COLORS['gray'], width=1)
+            canvas.line([(cx-6, y), (cx+6, y)], fill=COLORS['gray'], width=1)
         # Tip light
-        draw.ellipse([cx-2, cy-27, cx+2, cy-23], fill=COLORS['red'])
+        canvas.ellipse([cx-2, cy-27, cx+2, cy-23], fill=COLORS['red'])
     
-    return img
+    return canvas.image
 
-def draw_explosion_topdown(size, explosion_type='small'):
-    """Draw explosion from top-down (circular burst)"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+def draw_explosion_topdown(size, explosion_type='small', t=0.0, scale=1):
+    """
+    Draw explosion from top-down (circular burst)
+    t is the normalised animation time: 0 is the initial flash, 1 the
+    moment the burst has fully expanded and faded
+    """
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     if explosion_type == 'small':
@@ -533,84 +513,93 @@ def draw_explosion_topdown(size, explosion_type='small'):
     else:  # large
         max_r = 40
         colors = [COLORS['white'], COLORS['yellow'], COLORS['orange'], COLORS['red'], COLORS['red_dark'], COLORS['purple']]
+        
+    # Rings expand fast then settle (ease-out) while fading
+    burst_r = int(max_r * (0.4 + 0.6 * (1 - (1 - t) ** 2)))
+    fade = 1 - t * t
     
-    # Concentric burst circles
+    # Concentric burst circles, blended with transparency
     for i, color in enumerate(colors):
-        r = max_r - i * (max_r // len(colors))
-        alpha = 200 - i * 30
+        r = burst_r - i * (burst_r // len(colors))
+        alpha = int((200 - i * 30) * fade)
+        if r <= 0 or alpha <= 0:
+            continue
         rgba = (*color[:3], alpha)
-        # Create overlay for transparency
-        overlay = Image.new('RGBA', size, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        overlay_draw.ellipse([cx-r, cy-r, cx+r, cy+r], fill=rgba)
-        img = Image.alpha_composite(img, overlay)
-        draw = ImageDraw.Draw(img)
-    
-    # Sparks/debris
-    for angle in range(0, 360, 30):
-        rad = math.radians(angle)
-        x1 = cx + math.cos(rad) * (max_r // 3)
-        y1 = cy + math.sin(rad) * (max_r // 3)
-        x2 = cx + math.cos(rad) * max_r
-        y2 = cy + math.sin(rad) * max_r
-        draw.line([(x1, y1), (x2, y2)], fill=COLORS['yellow'], width=2)
-    
-    return img
-
-def draw_muzzle_flash_topdown(size, weapon_type='machinegun'):
-    """Draw muzzle flash from top-down"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+        canvas.blend_ellipse([cx-r, cy-r, cx+r, cy+r], fill=rgba)
+        
+    # Sparks/debris fly outward and shorten as they burn out
+    spark_len = max_r * 2 / 3 * (1 - t)
+    if spark_len >= 1:
+        spark_out = max_r * (1 + 0.25 * t)
+        for angle in range(0, 360, 30):
+            rad = math.radians(angle)
+            x1 = cx + math.cos(rad) * (spark_out - spark_len)
+            y1 = cy + math.sin(rad) * (spark_out - spark_len)
+            x2 = cx + math.cos(rad) * spark_out
+            y2 = cy + math.sin(rad) * spark_out
+            canvas.line([(x1, y1), (x2, y2)], fill=COLORS['yellow'], width=2)
+            
+    return canvas.image
+
+def draw_muzzle_flash_topdown(size, weapon_type='machinegun', t=0.0, scale=1):
+    """
+    Draw muzzle flash from top-down
+    t is the normalised animation time: the flash is longest at 0 and
+    collapses back towards the barrel by 1
+    """
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
+    flash = 1 - 0.6 * t
     
     if weapon_type == 'machinegun':
         # Small burst
         for angle in [-20, 0, 20]:
             rad = math.radians(angle - 90)  # Point up
-            x2 = cx + math.cos(rad) * 12
-            y2 = cy + math.sin(rad) * 12
-            draw.line([(cx, cy-5), (x2, y2)], fill=COLORS['yellow'], width=2)
-        draw.ellipse([cx-4, cy-6, cx+4, cy+2], fill=COLORS['orange'])
+            x2 = cx + math.cos(rad) * 12 * flash
+            y2 = cy + math.sin(rad) * 12 * flash - 5 * (1 - flash)
+            canvas.line([(cx, cy-5), (x2, y2)], fill=COLORS['yellow'], width=2)
+        r = max(1, round(4 * flash))
+        canvas.ellipse([cx-r, cy-2-r, cx+r, cy-2+r], fill=COLORS['orange'])
         
     elif weapon_type == 'missile':
         # Larger burst with smoke
         for angle in range(-30, 31, 10):
             rad = math.radians(angle - 90)
-            x2 = cx + math.cos(rad) * 18
-            y2 = cy + math.sin(rad) * 18
-            draw.line([(cx, cy-5), (x2, y2)], fill=COLORS['orange'], width=3)
-        draw.ellipse([cx-6, cy-8, cx+6, cy+4], fill=COLORS['red'])
-        draw.ellipse([cx-3, cy-5, cx+3, cy+1], fill=COLORS['yellow'])
-    
-    return img
+            x2 = cx + math.cos(rad) * 18 * flash
+            y2 = cy + math.sin(rad) * 18 * flash - 5 * (1 - flash)
+            canvas.line([(cx, cy-5), (x2, y2)], fill=COLORS['orange'], width=3)
+        r = max(1, round(6 * flash))
+        canvas.ellipse([cx-r, cy-2-r, cx+r, cy-2+r], fill=COLORS['red'])
+        r = max(1, round(3 * flash))
+        canvas.ellipse([cx-r, cy-2-r, cx+r, cy-2+r], fill=COLORS['yellow'])
+    
+    return canvas.image
 
-def draw_bullet_topdown(size, bullet_type='player'):
+def draw_bullet_topdown(size, bullet_type='player', scale=1):
     """Draw bullet/projectile from top-down"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     if bullet_type == 'player':
         color = COLORS['cyan']
         # Small dot with trail
-        draw.ellipse([cx-2, cy-2, cx+2, cy+2], fill=color)
-        draw.line([(cx, cy), (cx, cy+6)], fill=(*color[:3], 150), width=2)
+        canvas.ellipse([cx-2, cy-2, cx+2, cy+2], fill=color)
+        canvas.line([(cx, cy), (cx, cy+6)], fill=(*color[:3], 150), width=2)
     elif bullet_type == 'enemy':
         color = COLORS['red']
-        draw.ellipse([cx-2, cy-2, cx+2, cy+2], fill=color)
-        draw.line([(cx, cy), (cx, cy+6)], fill=(*color[:3], 150), width=2)
+        canvas.ellipse([cx-2, cy-2, cx+2, cy+2], fill=color)
+        canvas.line([(cx, cy), (cx, cy+6)], fill=(*color[:3], 150), width=2)
     elif bullet_type == 'missile':
         color = COLORS['orange']
         # Elongated shape
-        draw.ellipse([cx-3, cy-6, cx+3, cy+6], fill=color)
-        draw.line([(cx, cy+4), (cx, cy+10)], fill=COLORS['red'], width=2)
+        canvas.ellipse([cx-3, cy-6, cx+3, cy+6], fill=color)
+        canvas.line([(cx, cy+4), (cx, cy+10)], fill=COLORS['red'], width=2)
     
-    return img
+    return canvas.image
 
-def draw_engine_exhaust_topdown(size, frame=0):
+def draw_engine_exhaust_topdown(size, frame=0, scale=1):
     """Draw engine exhaust smoke from top-down"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     # Smoke puffs
@@ -626,17 +615,13 @@ def draw_engine_exhaust_topdown(size, frame=0):
         alpha = 150 - i * 30 - frame * 20
         if alpha > 0:
             rgba = (180, 180, 190, alpha)
-            overlay = Image.new('RGBA', size, (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            overlay_draw.ellipse([cx+ox-r, cy+oy-r, cx+ox+r, cy+oy+r], fill=rgba)
-            img = Image.alpha_composite(img, overlay)
-    
-    return img
+            canvas.blend_ellipse([cx+ox-r, cy+oy-r, cx+ox+r, cy+oy+r], fill=rgba)
+            
+    return canvas.image
 
-def draw_trail_topdown(size, frame=0):
+def draw_trail_topdown(size, frame=0, scale=1):
     """Draw engine trail from top-down"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     colors = [COLORS['cyan'], COLORS['pink'], COLORS['purple'], COLORS['green']]
@@ -647,155 +632,138 @@ def draw_trail_topdown(size, frame=0):
         alpha = 150 - i * 30
         r = 3 - i // 2
         rgba = (*color[:3], alpha)
-        overlay = Image.new('RGBA', size, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        overlay_draw.ellipse([cx-r, cy+i*4, cx+r, cy+i*4+r*2], fill=rgba)
-        img = Image.alpha_composite(img, overlay)
-    
-    return img
+        canvas.blend_ellipse([cx-r, cy+i*4, cx+r, cy+i*4+r*2], fill=rgba)
+        
+    return canvas.image
 
-def draw_ui_element(size, element_type='button'):
+def draw_ui_element(size, element_type='button', scale=1):
     """Draw UI elements"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     if element_type == 'button':
         # Rounded rectangle button
-        draw.rounded_rectangle([4, 4, size[0]-4, size[1]-4], radius=8,
+        canvas.rounded_rectangle([4, 4, size[0]-4, size[1]-4], radius=8,
                               fill=COLORS['metal_dark'], outline=COLORS['cyan'], width=2)
         # Inner glow
-        draw.rounded_rectangle([8, 8, size[0]-8, size[1]-8], radius=6,
+        canvas.rounded_rectangle([8, 8, size[0]-8, size[1]-8], radius=6,
                               outline=(*COLORS['cyan'][:3], 100), width=1)
     
     elif element_type == 'button_hover':
-        draw.rounded_rectangle([4, 4, size[0]-4, size[1]-4], radius=8,
+        canvas.rounded_rectangle([4, 4, size[0]-4, size[1]-4], radius=8,
                               fill=COLORS['cyan_dark'], outline=COLORS['cyan'], width=3)
-        draw.rounded_rectangle([6, 6, size[0]-6, size[1]-6], radius=6,
+        canvas.rounded_rectangle([6, 6, size[0]-6, size[1]-6], radius=6,
                               outline=COLORS['white'], width=1)
     
     elif element_type == 'healthbar_bg':
-        draw.rectangle([0, 0, size[0], size[1]], fill=COLORS['building_dark'])
-        draw.rectangle([0, 0, size[0], size[1]], outline=COLORS['gray'], width=1)
+        canvas.rectangle([0, 0, size[0], size[1]], fill=COLORS['building_dark'])
+        canvas.rectangle([0, 0, size[0], size[1]], outline=COLORS['gray'], width=1)
     
     elif element_type == 'healthbar_fill':
-        draw.rectangle([0, 0, size[0], size[1]], fill=COLORS['green'])
+        canvas.rectangle([0, 0, size[0], size[1]], fill=COLORS['green'])
         # Gradient effect
         for i in range(0, size[1], 2):
-            draw.line([(0, i), (size[0], i)], fill=(*COLORS['green'][:3], 150), width=1)
+            canvas.line([(0, i), (size[0], i)], fill=(*COLORS['green'][:3], 150), width=1)
     
     elif element_type == 'hud_corner':
         # Cyberpunk corner piece
-        draw.line([(0, size[1]-1), (15, size[1]-1)], fill=COLORS['cyan'], width=2)
-        draw.line([(0, size[1]-1), (0, size[1]-15)], fill=COLORS['cyan'], width=2)
-        draw.line([(size[0]-15, 0), (size[0]-1, 0)], fill=COLORS['cyan'], width=2)
-        draw.line([(size[0]-1, 0), (size[0]-1, 15)], fill=COLORS['cyan'], width=2)
+        canvas.line([(0, size[1]-1), (15, size[1]-1)], fill=COLORS['cyan'], width=2)
+        canvas.line([(0, size[1]-1), (0, size[1]-15)], fill=COLORS['cyan'], width=2)
+        canvas.line([(size[0]-15, 0), (size[0]-1, 0)], fill=COLORS['cyan'], width=2)
+        canvas.line([(size[0]-1, 0), (size[0]-1, 15)], fill=COLORS['cyan'], width=2)
     
     elif element_type == 'minimap_frame':
-        draw.rectangle([0, 0, size[0]-1, size[1]-1], outline=COLORS['cyan'], width=2)
-        draw.rectangle([2, 2, size[0]-3, size[1]-3], outline=COLORS['cyan_dark'], width=1)
+        canvas.rectangle([0, 0, size[0]-1, size[1]-1], outline=COLORS['cyan'], width=2)
+        canvas.rectangle([2, 2, size[0]-3, size[1]-3], outline=COLORS['cyan_dark'], width=1)
     
     elif element_type == 'minimap_player':
         # Triangle pointing up
-        draw.polygon([(cx, cy-6), (cx-5, cy+4), (cx+5, cy+4)], fill=COLORS['cyan'])
-        draw.polygon([(cx, cy-4), (cx-3, cy+2), (cx+3, cy+2)], fill=COLORS['white'])
+        canvas.polygon([(cx, cy-6), (cx-5, cy+4), (cx+5, cy+4)], fill=COLORS['cyan'])
+        canvas.polygon([(cx, cy-4), (cx-3, cy+2), (cx+3, cy+2)], fill=COLORS['white'])
     
     elif element_type == 'minimap_enemy':
-        draw.ellipse([cx-4, cy-4, cx+4, cy+4], fill=COLORS['red'])
-        draw.ellipse([cx-2, cy-2, cx+2, cy+2], fill=COLORS['white'])
+        canvas.ellipse([cx-4, cy-4, cx+4, cy+4], fill=COLORS['red'])
+        canvas.ellipse([cx-2, cy-2, cx+2, cy+2], fill=COLORS['white'])
     
     elif element_type == 'icon_health':
-        draw.ellipse([cx-8, cy-2, cx+8, cy+14], fill=COLORS['red'])
-        draw.polygon([(cx, cy-10), (cx-6, cy-2), (cx+6, cy-2)], fill=COLORS['red'])
+        canvas.ellipse([cx-8, cy-2, cx+8, cy+14], fill=COLORS['red'])
+        canvas.polygon([(cx, cy-10), (cx-6, cy-2), (cx+6, cy-2)], fill=COLORS['red'])
     
     elif element_type == 'icon_missile':
-        draw.rectangle([cx-3, cy-8, cx+3, cy+8], fill=COLORS['orange'])
-        draw.polygon([(cx, cy-12), (cx-4, cy-6), (cx+4, cy-6)], fill=COLORS['orange'])
-        draw.line([(cx, cy+8), (cx, cy+12)], fill=COLORS['red'], width=2)
+        canvas.rectangle([cx-3, cy-8, cx+3, cy+8], fill=COLORS['orange'])
+        canvas.polygon([(cx, cy-12), (cx-4, cy-6), (cx+4, cy-6)], fill=COLORS['orange'])
+        canvas.line([(cx, cy+8), (cx, cy+12)], fill=COLORS['red'], width=2)
     
     elif element_type == 'icon_machinegun':
         # Bullet shape
-        draw.rectangle([cx-2, cy-8, cx+2, cy+8], fill=COLORS['yellow'])
-        draw.ellipse([cx-2, cy-10, cx+2, cy-6], fill=COLORS['yellow'])
+        canvas.rectangle([cx-2, cy-8, cx+2, cy+8], fill=COLORS['yellow'])
+        canvas.ellipse([cx-2, cy-10, cx+2, cy-6], fill=COLORS['yellow'])
     
-    return img
+    return canvas.image
 
-def draw_shield_topdown(size):
+def draw_shield_topdown(size, scale=1):
     """Draw energy shield effect"""
-    img = create_image(size)
+    canvas = Canvas(size, scale)
+    cx, cy = size[0] // 2, size[1] // 2
     
     # Concentric circles with glow
     for i in range(3):
         r = 20 - i * 5
         alpha = 100 - i * 30
-        overlay = Image.new('RGBA', size, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        cx, cy = size[0] // 2, size[1] // 2
-        overlay_draw.ellipse([cx-r, cy-r, cx+r, cy+r], 
-                            fill=(*COLORS['cyan'][:3], alpha),
-                            outline=COLORS['cyan'], width=1)
-        img = Image.alpha_composite(img, overlay)
-    
-    return img
+        canvas.blend_ellipse([cx-r, cy-r, cx+r, cy+r], 
+                             fill=(*COLORS['cyan'][:3], alpha),
+                             outline=COLORS['cyan'], width=1)
+                             
+    return canvas.image
 
-def draw_parallax_layer(size, layer='far'):
+def draw_parallax_layer(size, layer='far', scale=1):
     """Draw parallax background layer"""
-    img = create_image(size, COLORS['bg'])
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale, COLORS['bg'])
     
     if layer == 'far':
         # Distant city silhouette
         for i in range(0, size[0], 40):
             h = 30 + (i % 60)
-            draw.rectangle([i, size[1]-h, i+35, size[1]], fill=(20, 20, 35))
+            canvas.rectangle([i, size[1]-h, i+35, size[1]], fill=(20, 20, 35))
     elif layer == 'mid':
         # Mid buildings
         for i in range(0, size[0], 60):
             h = 50 + (i % 80)
-            draw.rectangle([i, size[1]-h, i+50, size[1]], fill=(25, 25, 40))
+            canvas.rectangle([i, size[1]-h, i+50, size[1]], fill=(25, 25, 40))
             # Windows
             for wy in range(size[1]-h+10, size[1]-10, 15):
                 if (i + wy) % 3 == 0:
-                    draw.rectangle([i+5, wy, i+15, wy+8], fill=COLORS['window_dark'])
+                    canvas.rectangle([i+5, wy, i+15, wy+8], fill=COLORS['window_dark'])
     else:  # near
         # Close buildings with neon
         for i in range(0, size[0], 80):
             h = 80 + (i % 100)
-            draw.rectangle([i, size[1]-h, i+70, size[1]], fill=(30, 30, 50))
+            canvas.rectangle([i, size[1]-h, i+70, size[1]], fill=(30, 30, 50))
             # Neon edge
-            draw.line([(i, size[1]-h), (i, size[1])], fill=COLORS['purple'], width=2)
+            canvas.line([(i, size[1]-h), (i, size[1])], fill=COLORS['purple'], width=2)
     
-    return img
+    return canvas.image
 
-def draw_sky(size, sky_type='night'):
+def draw_sky(size, sky_type='night', scale=1):
     """Draw sky background"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
-    
     if sky_type == 'night':
-        color_top = (5, 5, 20)
-        color_bot = (20, 20, 45)
+        color_top = COLORS['sky_night_top']
+        color_bot = COLORS['sky_night_bottom']
     elif sky_type == 'dusk':
-        color_top = (40, 20, 60)
-        color_bot = (120, 60, 80)
+        color_top = COLORS['sky_dusk_top']
+        color_bot = COLORS['sky_dusk_bottom']
     else:  # storm
-        color_top = (15, 20, 25)
-        color_bot = (40, 45, 55)
-    
-    # Gradient
-    for y in range(size[1]):
-        ratio = y / size[1]
-        r = int(color_top[0] + (color_bot[0] - color_top[0]) * ratio)
-        g = int(color_top[1] + (color_bot[1] - color_top[1]) * ratio)
-        b = int(color_top[2] + (color_bot[2] - color_top[2]) * ratio)
-        draw.line([(0, y), (size[0], y)], fill=(r, g, b))
+        color_top = COLORS['sky_storm_top']
+        color_bot = COLORS['sky_storm_bottom']
     
-    return img
+    # Vertical gradient, top edge to bottom edge
+    canvas = Canvas(size, scale)
+    canvas.linear_gradient([(0, color_top), (1, color_bot)])
+    return canvas.image
 
-def draw_weather_effect(size, effect_type='smoke'):
+def draw_weather_effect(size, effect_type='smoke', scale=1):
     """Draw weather/environmental effects"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     if effect_type == 'smoke':
@@ -805,217 +773,432 @@ def draw_weather_effect(size, effect_type='smoke'):
             oy = (i % 3) * 5
             r = 12 + i * 3
             alpha = 100 - i * 15
-            overlay = Image.new('RGBA', size, (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            overlay_draw.ellipse([cx+ox-r, cy+oy-r, cx+ox+r, cy+oy+r], 
-                                fill=(100, 100, 110, alpha))
-            img = Image.alpha_composite(img, overlay)
-    
+            canvas.blend_ellipse([cx+ox-r, cy+oy-r, cx+ox+r, cy+oy+r], 
+                                 fill=(100, 100, 110, alpha))
+                                 
     elif effect_type == 'fire':
         # Fire animation frames
         for i in range(3):
             oy = i * 6
             r = 8 - i * 2
             color = COLORS['yellow'] if i == 0 else (COLORS['orange'] if i == 1 else COLORS['red'])
-            draw.ellipse([cx-r, cy-oy-r, cx+r, cy-oy+r], fill=color)
+            canvas.ellipse([cx-r, cy-oy-r, cx+r, cy-oy+r], fill=color)
     
     elif effect_type == 'rain':
         # Rain overlay
         for i in range(0, size[0], 10):
             for j in range(0, size[1], 15):
-                draw.line([(i, j), (i-3, j+8)], fill=(*COLORS['cyan'][:3], 80), width=1)
+                canvas.line([(i, j), (i-3, j+8)], fill=(*COLORS['cyan'][:3], 80), width=1)
     
-    return img
+    return canvas.image
 
-def draw_flying_car(size, car_type=1):
+def draw_flying_car(size, car_type=1, scale=1):
     """Draw flying car for background decoration"""
-    img = create_image(size)
-    draw = ImageDraw.Draw(img)
+    canvas = Canvas(size, scale)
     cx, cy = size[0] // 2, size[1] // 2
     
     if car_type == 1:
         # Sleek car
-        draw.ellipse([cx-20, cy-6, cx+20, cy+6], fill=COLORS['metal_dark'])
-        draw.ellipse([cx-15, cy-4, cx+15, cy+4], fill=COLORS['cyan_dark'])
+        canvas.ellipse([cx-20, cy-6, cx+20, cy+6], fill=COLORS['metal_dark'])
+        canvas.ellipse([cx-15, cy-4, cx+15, cy+4], fill=COLORS['cyan_dark'])
         # Lights
-        draw.ellipse([cx-18, cy-3, cx-12, cy+3], fill=COLORS['red'])
-        draw.ellipse([cx+12, cy-3, cx+18, cy+3], fill=COLORS['cyan'])
+        canvas.ellipse([cx-18, cy-3, cx-12, cy+3], fill=COLORS['red'])
+        canvas.ellipse([cx+12, cy-3, cx+18, cy+3], fill=COLORS['cyan'])
     else:
         # Boxy car
-        draw.rectangle([cx-18, cy-8, cx+18, cy+8], fill=COLORS['metal_dark'])
-        draw.rectangle([cx-12, cy-5, cx+12, cy+5], fill=COLORS['purple_dark'])
-        draw.ellipse([cx-16, cy-2, cx-10, cy+2], fill=COLORS['yellow'])
-        draw.ellipse([cx+10, cy-2, cx+16, cy+2], fill=COLORS['green'])
-    
-    return img
-
-def save_scaled(img, base_path, sizes={'': 1, '@2x': 2, '@3x': 3}):
-    """Save image at multiple scales"""
-    base_w, base_h = img.size
-    for suffix, scale in sizes.items():
-        new_size = (base_w * scale, base_h * scale)
-        scaled = img.resize(new_size, Image.Resampling.NEAREST)
-        scaled.save(f"{base_path}{suffix}.png")
-
-def main():
-    """Generate all Cyber Strike top-down assets"""
-    base_dir = "/root/.openclaw/workspace/Cyber_Strike/Assets_TopDown"
-    
-    # Create directory structure
-    dirs = [
-        "Player/Helicopter", "Player/Effects",
-        "Enemies/Helicopters", "Enemies/Tanks", "Enemies/Turrets", 
-        "Enemies/Drones", "Enemies/Boss",
-        "Environment/Buildings", "Environment/Roads", "Environment/Bridges",
-        "Environment/Rooftops", "Environment/Slums",
-        "Effects/Explosions", "Effects/MuzzleFlashes", "Effects/Bullets",
-        "Effects/Trails", "Effects/Shields", "Effects/Weather",
-        "Backgrounds/Parallax", "Backgrounds/Skies", "Backgrounds/Decorations",
-        "UI/Buttons", "UI/HUD", "UI/Icons",
-    ]
-    
-    for d in dirs:
-        os.makedirs(f"{base_dir}/{d}", exist_ok=True)
-    
-    print("Generating Player Helicopter assets...")
-    # Player helicopter states
-    for state in ['idle', 'bank_left', 'bank_right', 'damaged']:
-        img = draw_helicopter_topdown((64, 64), COLORS['metal'], COLORS['cyan'], state)
-        save_scaled(img, f"{base_dir}/Player/Helicopter/helicopter_{state}")
-    
-    print("Generating Engine Exhaust...")
-    for frame in range(4):
-        img = draw_engine_exhaust_topdown((32, 32), frame)
-        save_scaled(img, f"{base_dir}/Player/Effects/engine_exhaust_{frame}")
-    
-    print("Generating Enemy Helicopters...")
-    # Scout chopper
-    img = draw_helicopter_topdown((48, 48), COLORS['gray_dark'], COLORS['pink'], 'idle')
-    save_scaled(img, f"{base_dir}/Enemies/Helicopters/enemy_scout")
-    # Gunship
-    img = draw_helicopter_topdown((56, 56), COLORS['building_dark'], COLORS['red'], 'idle')
-    save_scaled(img, f"{base_dir}/Enemies/Helicopters/enemy_gunship")
-    
-    print("Generating Tanks...")
-    img = draw_tank_topdown((48, 48), 'basic')
-    save_scaled(img, f"{base_dir}/Enemies/Tanks/tank_basic")
-    img = draw_tank_topdown((56, 56), 'heavy')
-    save_scaled(img, f"{base_dir}/Enemies/Tanks/tank_heavy")
-    
-    print("Generating Turrets...")
-    img = draw_turret_topdown((48, 48))
-    save_scaled(img, f"{base_dir}/Enemies/Turrets/turret_aa")
-    
-    print("Generating Drones...")
-    img = draw_drone_topdown((32, 32))
-    save_scaled(img, f"{base_dir}/Enemies/Drones/drone_small")
-    
-    print("Generating Boss...")
-    img = draw_boss_gunship_topdown((96, 96))
-    save_scaled(img, f"{base_dir}/Enemies/Boss/boss_gunship")
-    
-    print("Generating Buildings...")
-    for btype in ['small', 'tall', 'corp', 'slum']:
-        img = draw_building_topdown((80, 80), btype)
-        save_scaled(img, f"{base_dir}/Environment/Buildings/building_{btype}")
-    
-    print("Generating Environment...")
-    img = draw_road_topdown((64, 64), 'straight')
-    save_scaled(img, f"{base_dir}/Environment/Roads/road_straight")
-    img = draw_road_topdown((64, 64), 'intersection')
-    save_scaled(img, f"{base_dir}/Environment/Roads/road_intersection")
-    img = draw_bridge_topdown((64, 64))
-    save_scaled(img, f"{base_dir}/Environment/Bridges/bridge_section")
-    
-    print("Generating Rooftop Details...")
-    img = draw_rooftop_detail((32, 32), 'ac_unit')
-    save_scaled(img, f"{base_dir}/Environment/Rooftops/ac_unit")
-    img = draw_rooftop_detail((32, 32), 'antenna')
-    save_scaled(img, f"{base_dir}/Environment/Rooftops/antenna")
-    
-    print("Generating Effects...")
-    # Explosions
-    for etype in ['small', 'medium', 'large']:
-        for frame in range(4):
-            img = draw_explosion_topdown((48 if etype=='small' else 64 if etype=='medium' else 96, 
-                                         48 if etype=='small' else 64 if etype=='medium' else 96), etype)
-            save_scaled(img, f"{base_dir}/Effects/Explosions/explosion_{etype}_{frame}")
-    
-    # Muzzle flashes
-    for wtype in ['machinegun', 'missile']:
-        for frame in range(3):
-            img = draw_muzzle_flash_topdown((32, 32), wtype)
-            save_scaled(img, f"{base_dir}/Effects/MuzzleFlashes/muzzle_{wtype}_{frame}")
-    
-    # Bullets
-    for btype in ['player', 'enemy', 'missile']:
-        img = draw_bullet_topdown((16, 16), btype)
-        save_scaled(img, f"{base_dir}/Effects/Bullets/bullet_{btype}")
-    
-    # Trails
-    for frame in range(4):
-        img = draw_trail_topdown((32, 32), frame)
-        save_scaled(img, f"{base_dir}/Effects/Trails/trail_{frame}")
-    
-    # Shield
-    img = draw_shield_topdown((64, 64))
-    save_scaled(img, f"{base_dir}/Effects/Shields/shield_energy")
-    
-    # Weather
-    for wtype in ['smoke', 'fire', 'rain']:
-        img = draw_weather_effect((64, 64), wtype)
-        save_scaled(img, f"{base_dir}/Effects/Weather/{wtype}")
-    
-    print("Generating Backgrounds...")
-    # Parallax layers
-    for layer in ['far', 'mid', 'near']:
-        img = draw_parallax_layer((256, 256), layer)
-        save_scaled(img, f"{base_dir}/Backgrounds/Parallax/parallax_{layer}")
-    
-    # Skies
-    for stype in ['night', 'dusk', 'storm']:
-        img = draw_sky((256, 256), stype)
-        save_scaled(img, f"{base_dir}/Backgrounds/Skies/sky_{stype}")
-    
-    # Flying cars
-    for i in [1, 2]:
-        img = draw_flying_car((64, 32), i)
-        save_scaled(img, f"{base_dir}/Backgrounds/Decorations/flying_car_{i}")
-    
-    # Smog cloud
-    img = draw_weather_effect((64, 64), 'smoke')
-    save_scaled(img, f"{base_dir}/Backgrounds/Decorations/smog_cloud")
-    
-    print("Generating UI...")
-    # Buttons
-    img = draw_ui_element((96, 48), 'button')
-    save_scaled(img, f"{base_dir}/UI/Buttons/button_normal")
-    img = draw_ui_element((96, 48), 'button_hover')
-    save_scaled(img, f"{base_dir}/UI/Buttons/button_hover")
-    
-    # HUD
-    img = draw_ui_element((128, 16), 'healthbar_bg')
-    save_scaled(img, f"{base_dir}/UI/HUD/healthbar_bg")
-    img = draw_ui_element((128, 16), 'healthbar_fill')
-    save_scaled(img, f"{base_dir}/UI/HUD/healthbar_fill")
-    img = draw_ui_element((32, 32), 'hud_corner')
-    save_scaled(img, f"{base_dir}/UI/HUD/hud_corner")
-    
-    # Minimap
-    img = draw_ui_element((64, 64), 'minimap_frame')
-    save_scaled(img, f"{base_dir}/UI/minimap_frame")
-    img = draw_ui_element((16, 16), 'minimap_player')
-    save_scaled(img, f"{base_dir}/UI/minimap_player")
-    img = draw_ui_element((16, 16), 'minimap_enemy')
-    save_scaled(img, f"{base_dir}/UI/minimap_enemy")
-    
-    # Icons
-    for icon in ['health', 'missile', 'machinegun']:
-        img = draw_ui_element((32, 32), f'icon_{icon}')
-        save_scaled(img, f"{base_dir}/UI/Icons/icon_{icon}")
+        canvas.rectangle([cx-18, cy-8, cx+18, cy+8], fill=COLORS['metal_dark'])
+        canvas.rectangle([cx-12, cy-5, cx+12, cy+5], fill=COLORS['purple_dark'])
+        canvas.ellipse([cx-16, cy-2, cx-10, cy+2], fill=COLORS['yellow'])
+        canvas.ellipse([cx+10, cy-2, cx+16, cy+2], fill=COLORS['green'])
     
+    return canvas.image
+
+def scaled_paths(base_path, sizes=SCALES):
+    """Output file paths written for a sprite, one per scale"""
+    return [f"{base_path}{suffix}.png" for suffix in sizes]
+
+def build_animations(manifest, aliases=None):
+    """
+    Frame sprite names for each animation strip in the manifest, in playback
+    order; aliased frames are replaced by the sprite that holds their pixels
+    Each frame is drawn at t = frame / frame count, so the last frame stops short of fully faded
+    """
+    aliases = aliases or {}
+    return {name: [aliases.get(frame, frame) for frame in anim['frame_names']]
+            for name, anim in manifest['animations'].items()}
+
+def sprite_call(entry):
+    """(draw function, positional args) for one manifest sprite entry"""
+    draw_fn = resolve_generator(globals(), entry['generator'], 'draw_')
+    return draw_fn, bind_args(draw_fn, entry['size'], resolve_params(entry['params'], COLORS))
+
+def build_jobs(base_dir, sprites=None):
+    """
+    Build the sprite job list from manifest sprite entries (default: every
+    sprite in MANIFEST, animation frames included)
+    Each job is an independent (output path, draw function, args) tuple, so jobs
+    can be drawn and saved in any order or on any worker
+    """
+    if sprites is None:
+        sprites = load_manifest(MANIFEST)['sprites']
+    return [(f"{base_dir}/{entry['name']}", *sprite_call(entry)) for entry in sprites]
+
+def iter_assets(manifest=None, scales=None, patterns=None, categories=None, raw=False):
+    """
+    Draw manifest sprites in memory, one at a time, without touching disk
+    Yields (name, scale, image) for each selected sprite and scale in
+    manifest order. manifest is a loaded manifest or a path (default:
+    MANIFEST); scales is a {suffix: scale} dict or a list of scale factors
+    (default: the manifest's); patterns and categories filter as with --only
+    and --category. With raw, image is a (height, width, 4) uint8 RGBA array
+    """
+    if not isinstance(manifest, dict):
+        manifest = load_manifest(manifest or MANIFEST)
+    factors = list(scale_map(scales or manifest['scales']).values())
+    for entry in select(manifest['sprites'], patterns, categories):
+        draw_fn, args = sprite_call(entry)
+        for scale in factors:
+            img = draw_fn(*args, scale=scale)
+            yield entry['name'], scale, np.asarray(img) if raw else img
+
+def indexed_sprites(manifest, scales=SCALES):
+    """
+    Index images and palette variants for every 'indexed' manifest entry
+    The sprite's geometry is drawn once per colour slot and quantised to
+    one index image per scale; each variant is a row of slot colours. Also
+    returns, per sprite, the largest channel error of any variant against
+    drawing it directly
+    """
+    by_name = {entry['name']: entry for entry in manifest['sprites']}
+    sprites = {}
+    for name, spec in manifest['indexed'].items():
+        entry = by_name[spec['sprite']]
+        draw_fn = resolve_generator(globals(), entry['generator'], 'draw_')
+        params = resolve_params(entry['params'], COLORS)
+        
+        def render(colors):
+            args = bind_args(draw_fn, entry['size'], {**params, **colors})
+            return {suffix: draw_fn(*args, scale=scale) for suffix, scale in scales.items()}
+            
+        index, entries = build_index(slot_weights(render, spec['slots']))
+        variants = {}
+        error = 0
+        for variant, overrides in spec['variants'].items():
+            colors = {**params, **resolve_params(overrides, COLORS)}
+            missing = [slot for slot in spec['slots'] if slot not in colors]
+            if missing:
+                raise ValueError(f"Indexed sprite {name} variant {variant} sets no colour for {', '.join(missing)}")
+            variants[variant] = [colors[slot] for slot in spec['slots']]
+            row = palette_row(entries, variants[variant])
+            for suffix, img in render({slot: colors[slot] for slot in spec['slots']}).items():
+                diff = np.abs(np.asarray(apply_palette(index[suffix], row), dtype=np.int16) - np.asarray(img))
+                error = max(error, int(diff.max()))
+        sprites[name] = {'index': index, 'entries': entries, 'slots': spec['slots'],
+                         'variants': variants, 'error': error}
+    return sprites
+
+def dedupe_jobs(jobs):
+    """
+    Drop jobs that repeat an earlier job's draw function and arguments
+    Returns (unique jobs, {alias path: canonical path}); drawing is
+    deterministic, so an alias would be byte-identical to its canonical sprite
+    """
+    unique = []
+    canonical = {}
+    aliases = {}
+    for job in jobs:
+        path, draw_fn, args = job
+        identity = (draw_fn.__name__, repr(args))
+        if identity in canonical:
+            aliases[path] = canonical[identity]
+        else:
+            canonical[identity] = path
+            unique.append(job)
+    return unique, aliases
+
+def record_jobs(jobs, cache=None):
+    """
+    Record every sprite job as a DisplayList: {output path: display list}
+    With a BuildCache, a job whose draw code, arguments and palette entries
+    are unchanged reuses its cached list instead of running Python again
+    """
+    lists = {}
+    for path, draw_fn, args in jobs:
+        key = sprite_key((draw_fn,), args, COLORS) if cache is not None else None
+        display_list = cache.load_list(path, key) if cache is not None else None
+        if display_list is None:
+            display_list = record(draw_fn, *args)
+            if cache is not None:
+                cache.store_list(path, key, display_list)
+        lists[path] = display_list
+    return lists
+
+def scale_tasks(jobs, sizes=SCALES):
+    """
+    Split (path, display list) jobs into one (path, display list, suffix, scale) task per
+    output scale, so every scale is rasterised natively and can run on its own worker
+    Largest outputs come first, so a pool is not left waiting on one big
+    sprite picked up at the end
+    """
+    tasks = [(base_path, display_list, suffix, scale)
+             for base_path, display_list in jobs
+             for suffix, scale in sizes.items()]
+    return sorted(tasks, key=lambda task: -task[1].size[0] * task[1].size[1] * task[3] ** 2)
+
+def run_job(task):
+    """Rasterise a single recorded sprite at one scale and save it; returns any profiler samples"""
+    base_path, display_list, suffix, scale = task
+    with profiling.sprite(f"{base_path}{suffix}"):
+        img = display_list.render(scale)
+        img.save(f"{base_path}{suffix}.png")
+    return profiling.collect()
+
+def run_jobs(jobs, workers=None, profile=False, sizes=SCALES):
+    """
+    Rasterise (path, display list) jobs across a process pool, one task per sprite and scale
+    Tasks are independent, so the output is byte-identical to a serial run;
+    workers=1 draws everything in-process. With profile, every task runs
+    under asset_tools.profiling and the merged Profiler is returned
+    """
+    tasks = scale_tasks(jobs, sizes)
+    if workers == 1:
+        if profile:
+            profiling.enable()
+        samples = [run_job(task) for task in tasks]
+        profiling.disable()
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=profiling.enable if profile else None) as pool:
+            samples = list(pool.map(run_job, tasks))
+    if not profile:
+        return None
+    profiler = profiling.Profiler()
+    for task_samples in samples:
+        profiler.merge(task_samples)
+    return profiler
+
+def existing_sheets(atlas_dir, anim_dir, rotation_dir, scales, lods=False):
+    """
+    Paths of every sheet PNG the atlas, animation and rotation indexes on disk
+    list (and the LOD indexes, with lods), whichever run wrote them
+    """
+    indexes = [f"{atlas_dir}/atlas{suffix}.json" for suffix in scales]
+    if lods and os.path.exists(f"{atlas_dir}/lod.json"):
+        with open(f"{atlas_dir}/lod.json") as f:
+            indexes += [f"{atlas_dir}/{index}" for level in json.load(f)['levels'][1:] for index in level['atlases'].values()]
+    paths = []
+    for index in indexes:
+        if os.path.exists(index):
+            with open(index) as f:
+                paths += [os.path.join(os.path.dirname(index), sheet['image']) for sheet in json.load(f)['meta']['sheets']]
+    for index, key in ((f"{anim_dir}/animations.json", 'animations'), (f"{rotation_dir}/rotations.json", 'rotations')):
+        if os.path.exists(index):
+            with open(index) as f:
+                paths += [os.path.join(os.path.dirname(index), image)
+                          for entry in json.load(f)[key].values() for image in entry['images'].values()]
+    return paths
+
+def main(argv=None):
+    """Generate the Cyber Strike top-down assets listed in the manifest"""
+    parser = argparse.ArgumentParser(description="Generate Cyber Strike top-down assets")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: CPU count, 1 = serial)")
+    parser.add_argument('--manifest', default=MANIFEST,
+                        help="sprite manifest (default: manifests/topdown.json)")
+    parser.add_argument('--only', action='append', metavar='GLOB',
+                        help="build only sprites whose name matches GLOB, e.g. 'Enemies/*' (repeatable)")
+    parser.add_argument('--category', action='append',
+                        help="build only sprites in this category, e.g. Effects (repeatable)")
+    parser.add_argument('--output-dir', help="asset output folder (default: the manifest's output_dir)")
+    parser.add_argument('--indexed', action='store_true',
+                        help="also write the manifest's indexed sprites: 8-bit index images plus palette variants")
+    parser.add_argument('--headings', type=int, metavar='N',
+                        help="render every rotation sheet at N headings, e.g. 16/32/64 (default: the manifest's)")
+    parser.add_argument('--lods', type=int, default=0, metavar='N',
+                        help="also write N pre-filtered LOD atlas levels (1/2, 1/4, ...) for zoomed-out cameras")
+    parser.add_argument('--lod-filter', choices=sorted(FILTERS), default='lanczos',
+                        help="LOD downsampling filter, applied in premultiplied alpha (default: %(default)s)")
+    parser.add_argument('--etc2', choices=sorted(etc2.PRESETS), metavar='PRESET',
+                        help="also write ETC2 .pkm textures next to the sheets (and --loose sprites) "
+                             "at this speed/quality preset: fast, normal or high")
+    parser.add_argument('--ktx2', choices=sorted(ktx2.FORMATS),
+                        help="also write KTX2 textures with full mip chains next to the same files, as raw rgba8 "
+                             "or etc2 blocks (at the --etc2 preset, default normal)")
+    parser.add_argument('--premultiply', action='store_true', help="store premultiplied alpha in KTX2 textures")
+    parser.add_argument('--list', action='store_true', help="print the selected sprites and exit")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="redraw every sprite instead of skipping unchanged ones")
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f"build cache directory (default: {CACHE_DIR})")
+    parser.add_argument('--loose', action='store_true',
+                        help="also write every sprite as loose PNGs in the asset folders")
+    parser.add_argument('--optimize', action='store_true',
+                        help="losslessly shrink the written PNGs (exact palettes, zlib strategy search)")
+    parser.add_argument('--strict-palette', action='store_true',
+                        help="fail the build if a drawn sprite uses near-duplicates of palette colours")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="time each drawing primitive per sprite and write collapsed stacks to FILE "
+                             "(combine with --no-cache to profile every sprite)")
+    parser.add_argument('--profile-top', type=int, default=5,
+                        help="primitives listed per sprite in the profile table (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    manifest = load_manifest(args.manifest, args.headings)
+    scales = manifest['scales']
+    base_dir = args.output_dir or manifest['output_dir']
+    atlas_dir = f"{base_dir}/Atlases"
+    anim_dir = f"{base_dir}/Animations"
+    rotation_dir = f"{base_dir}/Rotations"
+    indexed_dir = f"{base_dir}/Indexed"
+    # Sprites are staged in the build cache unless loose PNGs were asked for
+    sprite_dir = base_dir if args.loose else os.path.join(args.cache_dir, "sprites")
+    
+    # Identical jobs are drawn once and referenced by alias; aliases always
+    # cover the whole manifest so a filtered run keeps the full atlas index
+    all_jobs = build_jobs(sprite_dir, manifest['sprites'])
+    unique_jobs, job_aliases = dedupe_jobs(all_jobs)
+    aliases = {os.path.relpath(alias, sprite_dir): os.path.relpath(path, sprite_dir)
+               for alias, path in job_aliases.items()}
+               
+    selected = {f"{sprite_dir}/{entry['name']}" for entry in select(manifest['sprites'], args.only, args.category)}
+    selected = {job_aliases.get(path, path) for path in selected}
+    jobs = [job for job in unique_jobs if job[0] in selected]
+    if args.list:
+        for path, draw_fn, draw_args in jobs:
+            print(f"{os.path.relpath(path, sprite_dir)}: {draw_fn.__name__}{draw_args}")
+        print(f"{len(jobs)} of {len(unique_jobs)} unique sprites selected, {len(scales)} scales each")
+        return
+        
+    for path, _, _ in jobs:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_aliases(aliases, f"{sprite_dir}/aliases.json")
+    workers = max(1, args.workers)
+    
+    # Sprites are recorded as display lists (reused while their draw code is
+    # unchanged) and their pixels keyed by the list's content, so edits that
+    # draw the same shapes re-rasterise nothing and a stale sprite is only a replay
+    cache = None if args.no_cache else BuildCache(args.cache_dir)
+    lists = record_jobs(jobs, cache)
+    pending = list(lists.items())
+    if cache is not None:
+        keys = {path: sprite_key((DisplayList.render, run_job), (display_list.digest(), scales), COLORS)
+                for path, display_list in lists.items()}
+        pending = [job for job in pending if not cache.lookup(job[0], keys[job[0]])]
+    
+    print(f"Generating {len(pending)} of {len(jobs)} selected unique sprites ({len(aliases)} aliases) "
+          f"with {workers} worker(s)...")
+    profiler = None
+    if pending:
+        profiler = run_jobs(pending, min(workers, len(pending) * len(scales)),
+                            profile=bool(args.profile), sizes=scales)
+                            
+    # Flag colours that drifted off the shared palette before anything is cached
+    drawn = [p for path, _ in pending for p in scaled_paths(path, scales)]
+    if drawn:
+        drift = palette.check_files(drawn)
+        palette.print_report(drift, len(drawn), sprite_dir)
+        if drift and args.strict_palette:
+            parser.exit(1, "Palette drift: use asset_tools.palette colours or add new ones there\n")
+            
+    # Optimise before caching so restored sprites are the optimised files; every
+    # selected sprite is covered, so a warm run still optimises earlier unoptimised output
+    optimized = []
+    sprite_files = [p for path in lists for p in scaled_paths(path, scales)]
+    if args.optimize:
+        print("Optimising sprite PNGs...")
+        optimized += optimize_stale(sprite_files, cache, workers)
+        
+    if cache is not None:
+        for path, _ in pending:
+            cache.store(path, keys[path], scaled_paths(path, scales))
+        cache.save()
+    
+    # Pack every sprite built so far into one atlas per scale; heading
+    # frames only go into their rotation sheets
+    exclude = [os.path.abspath(d) for d in (f"{sprite_dir}/Rotations", anim_dir, rotation_dir, indexed_dir)]
+    if pending or not os.path.exists(f"{atlas_dir}/atlas.json"):
+        print("Packing texture atlases...")
+        sheets = build_atlases(sprite_dir, atlas_dir, scales, aliases=aliases, exclude=exclude)
+    else:
+        sheets = []
+    
+    # Pre-filtered half, quarter, ... size atlases, picked by camera zoom through Atlases/lod.json;
+    # a different level count or filter from the last build's rebuilds them too
+    lod_sheets = []
+    if args.lods and (pending or not lod_index_matches(atlas_dir, args.lods, args.lod_filter)):
+        print(f"Writing {args.lods} LOD atlas levels...")
+        lod_sheets = build_lod_atlases(sprite_dir, atlas_dir, scales, args.lods, args.lod_filter,
+                                       aliases=aliases, exclude=exclude)
+            
+    # Lay animation frames out as strips for cheap playback on device; a
+    # filtered run may not have drawn every animation yet
+    animations = {name: frames for name, frames in build_animations(manifest, aliases).items()
+                  if all(os.path.exists(f"{sprite_dir}/{frame}.png") for frame in frames)}
+    if animations and (pending or not os.path.exists(f"{anim_dir}/animations.json")):
+        print("Writing animation strips...")
+        strips = write_strips(sprite_dir, anim_dir, animations, scales,
+                              {name: anim['fps'] for name, anim in manifest['animations'].items()})
+    else:
+        strips = []
+        
+    # Heading frames become one sheet per rotating sprite, so the device picks a frame instead of resampling
+    rotations = {name: rot['frame_names'] for name, rot in manifest['rotations'].items()
+                 if all(os.path.exists(f"{sprite_dir}/{frame}.png") for frame in rot['frame_names'])}
+    if rotations and (pending or not os.path.exists(f"{rotation_dir}/rotations.json")):
+        print("Writing rotation sheets...")
+        rotation_sheets = write_rotation_sheets(sprite_dir, rotation_dir, rotations, scales)
+    else:
+        rotation_sheets = []
+        
+    # One index image per geometry; colour variants are palette rows
+    indexed = []
+    if args.indexed and manifest['indexed']:
+        print("Writing indexed sprites...")
+        sprites = indexed_sprites(manifest, scales)
+        indexed = write_indexed(indexed_dir, sprites, scales)
+        for name, sprite in sorted(sprites.items()):
+            print(f"  {name}: {len(sprite['entries'])} colours, {len(sprite['variants'])} palette variants, "
+                  f"max channel error {sprite['error']}")
+                  
+    # Sheets are optimised from what the indexes on disk list, so sheets an
+    # earlier run wrote unoptimised are picked up even when nothing was redrawn
+    sheet_files = existing_sheets(atlas_dir, anim_dir, rotation_dir, scales, lods=bool(args.lods))
+    if args.optimize:
+        print("Optimising sheets...")
+        # Index images stay greyscale: a palette re-encode would renumber the indices
+        palettes = [os.path.join(indexed_dir, "palettes.png")] if indexed else []
+        optimized += optimize_stale(sheet_files + palettes, cache, workers)
+    if optimized:
+        print_report(optimized, base_dir)
+        
+    # GPU-ready copies that load without a PNG decode, of every sheet on disk so a
+    # warm build still exports; only missing or stale copies are encoded. Index
+    # images stay PNG since their values are not colours
+    textures = sheet_files + (sprite_files if args.loose else [])
+    if args.etc2:
+        print(f"Encoding ETC2 textures ({args.etc2})...")
+        etc2.print_report(etc2.encode_stale(textures, args.etc2, cache, workers), base_dir)
+    if args.ktx2:
+        print(f"Writing KTX2 textures ({args.ktx2})...")
+        ktx2.print_report(ktx2.write_stale(textures, args.ktx2, args.premultiply, args.etc2 or 'normal', cache, workers),
+                          base_dir)
+                          
+    if cache is not None:
+        cache.save()
+        
+    if profiler is not None:
+        profiling.write_profile(profiler, args.profile, args.profile_top, root=sprite_dir)
+    elif args.profile:
+        print(f"⚠️ Nothing was drawn, so no profile was written to {args.profile} "
+              "(add --no-cache to profile every sprite)")
+        
     print(f"\n✅ All assets generated successfully in {base_dir}")
-    print(f"Total files created: ~{len(dirs) * 10}")
+    print(f"Sprites: {len(jobs)} of {len(all_jobs)} selected ({len(aliases)} aliased), "
+          f"atlas sheets written: {len(sheets)}, animation strips written: {len(strips)}, "
+          f"rotation sheets written: {len(rotation_sheets)}"
+          + (f", LOD sheets written: {len(lod_sheets)}" if args.lods else "")
+          + (f", indexed files: {len(indexed)}" if args.indexed else "")
+          + (f", loose files: {len(jobs) * len(scales)}" if args.loose else ""))
 
 if __name__ == "__main__":
     main()